@@ -1,62 +1,71 @@
-from dataclasses import dataclass
-from typing import Literal, Mapping, Optional, List
-import re
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Literal, Mapping, Optional, List, Dict, Tuple
+import threading
 
-@dataclass(frozen=True)
+from .prompt_template import BLANK_PATTERN, render_prompt
+
+# ─── Region interning ───────────────────────────────────────────
+# Cards only ever use a handful of distinct region settings, so every card
+# with the same settings shares one read-only mapping, and each region name
+# gets a fixed bit in `Card.region_mask`.
+
+_region_lock = threading.Lock()
+_region_bits: Dict[str, int] = {}
+_region_maps: Dict[Tuple[Tuple[str, bool], ...], Mapping[str, bool]] = {}
+
+def region_bit(region: str) -> int:
+    bit = _region_bits.get(region)
+    if bit is None:
+        with _region_lock:
+            bit = _region_bits.setdefault(region, len(_region_bits))
+    return bit
+
+def intern_regions(regions: Mapping[str, bool]) -> Mapping[str, bool]:
+    key = tuple((r, bool(on)) for r, on in regions.items())
+    shared = _region_maps.get(key)
+    if shared is None:
+        with _region_lock:
+            shared = _region_maps.setdefault(key, MappingProxyType(dict(key)))
+    return shared
+
+def region_mask(regions: Mapping[str, bool]) -> int:
+    mask = 0
+    for region, allowed in regions.items():
+        if allowed:
+            mask |= 1 << region_bit(region)
+    return mask
+
+@dataclass(frozen=True, slots=True)
 class Card:
     text: str
     card_type: Literal["prompt", "response"]
     pick: int
-    regions: Mapping[str, bool]
+    regions: Mapping[str, bool] = field(compare=False)
     expansion: Optional[str] = None
+    # position in the repository that loaded this card, -1 if none
+    card_id: int = field(default=-1, compare=False, repr=False)
+    region_mask: int = field(init=False, repr=False)
+    blank_spans: Tuple[Tuple[int, int], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        regions = intern_regions(self.regions)
+        object.__setattr__(self, "regions", regions)
+        object.__setattr__(self, "region_mask", region_mask(regions))
+        object.__setattr__(self, "blank_spans",
+                           tuple(m.span() for m in BLANK_PATTERN.finditer(self.text)))
 
     @property
     def num_blanks(self) -> int:
         """Returns the number of blank slots (underscores) in the text."""
-        return len(re.findall(r'_{3,}', self.text))  # matches ___, ____, etc.
+        return len(self.blank_spans)
 
     @property
     def has_blanks(self) -> bool:
         """True if the card text has at least one blank."""
-        return self.num_blanks > 0
-
-    import re
+        return bool(self.blank_spans)
 
     def format_prompt(self, responses: List[str]) -> str:
-        def _strip_single_terminal_punct(text):
-            if not text:
-                return text
-            if len(text) > 2 and text[-3:] == "...":
-                return text
-            if len(text) > 1 and text[-2:] in ("?!", "!?"):
-                return text
-            if text[-1] in ".!?":
-                if len(text) == 1 or text[-2] not in ".!?":
-                    return text[:-1]
-            return text
-
-        n = self.num_blanks
-        out = self.text
-
-        if n > 0:
-            def replacer(match):
-                idx = replacer.idx
-                replacer.idx += 1
-                if idx < len(responses):
-                    resp = _strip_single_terminal_punct(responses[idx])
-                    # If the previous char is not a terminal punctuation,
-                    # and resp starts with "The"/"A"/"An", lowercase it
-                    start = match.start()
-                    prev_char = self.text[start-1] if start > 0 else ""
-                    if prev_char not in ".!?" and re.match(r"^(The|A|An)\b", resp):
-                        resp = resp[0].lower() + resp[1:]
-                    return f"**{resp}**"
-                return match.group(0)
-            replacer.idx = 0
-            out = re.sub(r'_{3,}', replacer, out)
-            return out
-        else:
-            resp_text = " ".join(f"**{resp}**" for resp in responses)
-            if resp_text:
-                out = f"{out} {resp_text}"
-            return out
\ No newline at end of file
+        """Fills the blanks with bolded responses, or appends them when the
+        prompt has none.  See `prompt_template.PromptTemplate`."""
+        return render_prompt(self.text, tuple(responses))
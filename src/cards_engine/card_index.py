@@ -0,0 +1,116 @@
+# card_index.py
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+from collections import defaultdict
+
+from .card import Card
+from .card_pack import card_index_rows
+
+_ID_CACHE_SIZE = 256
+
+class CardIndex:
+    """Immutable bitset index over a fixed sequence of cards.
+
+    Every card is identified by its position in ``cards``.  Each bucket
+    (card type, region, expansion, pick) is a Python int used as a bitset,
+    so a filter is a handful of ``&``/``|`` operations and only the matching
+    cards are ever visited.
+    """
+
+    def __init__(self, cards: Sequence[Card]):
+        self.cards: Sequence[Card] = cards
+        self.all_mask = (1 << len(cards)) - 1
+
+        by_type:      Dict[str, int] = defaultdict(int)
+        by_region:    Dict[str, int] = defaultdict(int)
+        by_expansion: Dict[str, int] = defaultdict(int)
+        by_pick:      Dict[int, int] = defaultdict(int)
+        for card_id, (card_type, pick, regions, expansion) in enumerate(card_index_rows(cards)):
+            bit = 1 << card_id
+            by_type[card_type]      |= bit
+            by_expansion[expansion] |= bit
+            by_pick[pick]           |= bit
+            for region in regions:
+                by_region[region] |= bit
+
+        self.by_type      = dict(by_type)
+        self.by_region    = dict(by_region)
+        self.by_expansion = dict(by_expansion)
+        self.by_pick      = dict(by_pick)
+        self._id_cache: Dict[tuple, Sequence[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def select(
+        self,
+        card_type:  Optional[str]            = None,
+        regions:    Optional[Dict[str,bool]] = None,
+        expansions: Optional[Iterable[str]]  = None,
+        min_pick:   Optional[int]            = None,
+        max_pick:   Optional[int]            = None
+    ) -> int:
+        """Returns the bitset of card ids matching every given criterion."""
+        mask = self.all_mask
+        if card_type:
+            mask &= self.by_type.get(card_type, 0)
+        if regions:
+            mask &= self._union(self.by_region, (r for r, on in regions.items() if on))
+        if expansions:
+            mask &= self._union(self.by_expansion, expansions)
+        if min_pick is not None or max_pick is not None:
+            lo = min_pick if min_pick is not None else 0
+            hi = max_pick if max_pick is not None else max(self.by_pick, default=0)
+            mask &= self._union(self.by_pick, (p for p in self.by_pick if lo <= p <= hi))
+        return mask
+
+    def ids(self, mask: int) -> List[int]:
+        """Decodes a bitset into ascending card ids."""
+        # bin() and find() both run in C, so the Python-level loop only
+        # iterates once per matching card.
+        bits = bin(mask)[:1:-1]
+        out: List[int] = []
+        i = bits.find("1")
+        while i != -1:
+            out.append(i)
+            i = bits.find("1", i + 1)
+        return out
+
+    def select_ids(
+        self,
+        card_type:  Optional[str]            = None,
+        regions:    Optional[Dict[str,bool]] = None,
+        expansions: Optional[Iterable[str]]  = None,
+        min_pick:   Optional[int]            = None,
+        max_pick:   Optional[int]            = None
+    ) -> Sequence[int]:
+        """Read-only array of matching card ids, shared by every caller
+        asking for the same filter (e.g. all games with the same setup)."""
+        key = (
+            card_type or None,
+            frozenset(r for r, on in regions.items() if on) if regions else None,
+            frozenset(expansions) if expansions else None,
+            min_pick,
+            max_pick,
+        )
+        ids = self._id_cache.get(key)
+        if ids is None:
+            if len(self._id_cache) >= _ID_CACHE_SIZE:
+                self._id_cache.clear()
+            mask = self.select(card_type, regions, expansions, min_pick, max_pick)
+            ids = self._id_cache[key] = memoryview(array("I", self.ids(mask))).toreadonly()
+        return ids
+
+    def cards_for(self, mask: int) -> List[Card]:
+        cards = self.cards
+        return [cards[i] for i in self.ids(mask)]
+
+    # ─── Helpers ────────────────────────────────────────────────
+
+    @staticmethod
+    def _union(buckets: Dict, keys: Iterable) -> int:
+        mask = 0
+        for k in keys:
+            mask |= buckets.get(k, 0)
+        return mask
@@ -0,0 +1,218 @@
+# card_pack.py
+"""Precompiled, memory-mappable card pack format.
+
+Layout (all integers little-endian, every section 4-byte aligned):
+
+    header      MAGIC, then u32 card_count, region_count, expansion_count
+    names       region names, then expansion names; each a u16 length + UTF-8
+    offsets     u32[card_count + 1]  start of each text in the string table
+    regions     u32[card_count]      bitmask over the region names
+    expansion   u16[card_count]      index into the expansion names
+    type        u8[card_count]       index into CARD_TYPES
+    pick        u8[card_count]
+    strings     concatenated UTF-8 card texts
+
+Readers only touch the columns until a card is actually requested, so
+opening a pack costs a header parse no matter how many cards it holds.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .card import Card, intern_regions
+
+MAGIC      = b"CABPACK1"
+CARD_TYPES = ("prompt", "response")
+_HEADER    = struct.Struct("<8sIII")
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+def write_pack(path: str, packs: Iterable[Tuple[str, List[Dict]]]) -> int:
+    """Writes every (expansion, raw_cards) pair into one pack file.
+
+    `raw_cards` use the same dicts as the JSON data files.  Returns the
+    number of cards written."""
+    regions:    Dict[str, int] = {}
+    expansions: Dict[str, int] = {}
+    offsets  = array("I", [0])
+    masks    = array("I")
+    exp_ids  = array("H")
+    types    = array("B")
+    picks    = array("B")
+    strings  = bytearray()
+
+    for expansion, raw_cards in packs:
+        exp_id = expansions.setdefault(expansion, len(expansions))
+        for raw in raw_cards:
+            mask = 0
+            for region, allowed in raw["regions"].items():
+                bit = regions.setdefault(region, len(regions))
+                if allowed:
+                    mask |= 1 << bit
+            strings += raw["text"].encode("utf-8")
+            offsets.append(len(strings))
+            masks.append(mask)
+            exp_ids.append(exp_id)
+            types.append(CARD_TYPES.index(raw["type"]))
+            picks.append(raw.get("pick", 1))
+
+    if len(regions) > 32:
+        raise ValueError(f"Card packs support at most 32 regions, got {len(regions)}")
+
+    columns = [offsets, masks, exp_ids, types, picks]
+    if sys.byteorder != "little":
+        for col in columns:
+            col.byteswap()
+
+    out = bytearray(_HEADER.pack(MAGIC, len(masks), len(regions), len(expansions)))
+    for name in list(regions) + list(expansions):
+        encoded = name.encode("utf-8")
+        out += struct.pack("<H", len(encoded)) + encoded
+    for col in columns:
+        out += b"\0" * (_pad4(len(out)) - len(out))
+        out += col.tobytes()
+    out += strings
+
+    with open(path, "wb") as f:
+        f.write(out)
+    return len(masks)
+
+
+class PackedCards(Sequence[Card]):
+    """Read-only view of a pack file.  `Card` objects are built on first
+    access and then cached, so unused cards never cost more than their
+    fixed-width columns."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+
+        magic, n, region_count, expansion_count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path!r} is not a card pack")
+        pos = _HEADER.size
+
+        names: List[str] = []
+        for _ in range(region_count + expansion_count):
+            (length,) = struct.unpack_from("<H", view, pos)
+            names.append(bytes(view[pos + 2:pos + 2 + length]).decode("utf-8"))
+            pos += 2 + length
+        self.region_names    = tuple(names[:region_count])
+        self.expansion_names = tuple(names[region_count:])
+
+        def column(fmt: str, count: int):
+            nonlocal pos
+            pos = _pad4(pos)
+            size = array(fmt).itemsize * count
+            col = view[pos:pos + size].cast(fmt)
+            pos += size
+            if sys.byteorder != "little" and col.itemsize > 1:
+                col = array(fmt, col)
+                col.byteswap()
+            return col
+
+        self._offsets    = column("I", n + 1)
+        self.region_masks = column("I", n)
+        self.expansion_ids = column("H", n)
+        self.types       = column("B", n)
+        self.picks       = column("B", n)
+        self._strings    = pos
+        self._cache: List[Optional[Card]] = [None] * n
+        self._region_maps: Dict[int, Mapping[str, bool]] = {}
+        # id of this pack's first card within the repository
+        self.first_id = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __getitem__(self, i: int) -> Card:
+        card = self._cache[i]
+        if card is None:
+            if i < 0:
+                i += len(self._cache)
+            card = self._cache[i] = self._build(i)
+        return card
+
+    def __iter__(self) -> Iterator[Card]:
+        for i in range(len(self._cache)):
+            yield self[i]
+
+    def _build(self, i: int) -> Card:
+        start = self._strings + self._offsets[i]
+        end   = self._strings + self._offsets[i + 1]
+        mask  = self.region_masks[i]
+        regions = self._region_maps.get(mask)
+        if regions is None:
+            regions = self._region_maps[mask] = intern_regions(
+                {r: bool(mask >> bit & 1) for bit, r in enumerate(self.region_names)})
+        return Card(
+            text      = self._mm[start:end].decode("utf-8"),
+            card_type = CARD_TYPES[self.types[i]],
+            pick      = self.picks[i],
+            regions   = regions,
+            expansion = self.expansion_names[self.expansion_ids[i]],
+            card_id   = self.first_id + i
+        )
+
+    def index_rows(self) -> Iterator[Tuple[str, int, Iterable[str], str]]:
+        """(card_type, pick, enabled regions, expansion) for every card,
+        read straight from the columns without building any `Card`."""
+        regions = self.region_names
+        # the set of enabled regions only depends on the mask, and real
+        # packs use a handful of distinct masks
+        enabled: Dict[int, Tuple[str, ...]] = {}
+        for i in range(len(self._cache)):
+            mask = self.region_masks[i]
+            names = enabled.get(mask)
+            if names is None:
+                names = enabled[mask] = tuple(r for bit, r in enumerate(regions) if mask >> bit & 1)
+            yield (CARD_TYPES[self.types[i]], self.picks[i], names,
+                   self.expansion_names[self.expansion_ids[i]])
+
+
+class ChainedCards(Sequence[Card]):
+    """Concatenation of several card sequences under one id space."""
+
+    def __init__(self, parts: List[Sequence[Card]]):
+        self._parts  = parts
+        self._starts: List[int] = []
+        total = 0
+        for part in parts:
+            self._starts.append(total)
+            total += len(part)
+        self._len = total
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i: int) -> Card:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        k = bisect_right(self._starts, i) - 1
+        return self._parts[k][i - self._starts[k]]
+
+    def __iter__(self) -> Iterator[Card]:
+        for part in self._parts:
+            yield from part
+
+    def index_rows(self) -> Iterator[Tuple[str, int, Iterable[str], str]]:
+        for part in self._parts:
+            yield from card_index_rows(part)
+
+
+def card_index_rows(cards: Sequence[Card]) -> Iterable[Tuple[str, int, Iterable[str], str]]:
+    """Index rows for any card sequence, using the columnar fast path
+    when the sequence provides one."""
+    if hasattr(cards, "index_rows"):
+        return cards.index_rows()
+    return ((c.card_type, c.pick, [r for r, on in c.regions.items() if on], c.expansion)
+            for c in cards)
@@ -1,68 +1,230 @@
 # card_repository.py
 
+import io
 import os
+import random
 import json
+import time
+import hashlib
+import logging
+import threading
 from glob import glob
-from typing import List, Optional, Dict
+from itertools import groupby
+from typing import List, Optional, Dict, Sequence, Iterator, Tuple, TextIO
 from collections import defaultdict
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
 
 import zstandard as zstd
 
 from .card import Card
+from .card_index import CardIndex
+from .deck import Deck
+from .card_pack import PackedCards, ChainedCards, write_pack
+
+log = logging.getLogger(__name__)
+
+PACK_SUFFIX  = ".cardpack"
+_MAX_WORKERS = 8
+_CHUNK_SIZE  = 1 << 16
+
+def expansion_name(fn: str) -> str:
+    """Expansion name for a data file, e.g. ``data/base_pack.json.zst`` → ``base``."""
+    basename = os.path.basename(fn)
+    if basename.endswith('.json.zst'):
+        expansion = basename[:-len('.json.zst')]
+    else:
+        expansion = os.path.splitext(basename)[0]
+    return expansion.removesuffix("_pack")
+
+@dataclass(frozen=True)
+class FileLoadStats:
+    path:      str
+    expansion: Optional[str]
+    cards:     int
+    bytes:     int
+    seconds:   float
+
+# ─── Streaming helpers ──────────────────────────────────────────
+
+_local = threading.local()
+
+def _decompressor() -> zstd.ZstdDecompressor:
+    """One reusable decompression context per loader thread."""
+    dctx = getattr(_local, "dctx", None)
+    if dctx is None:
+        dctx = _local.dctx = zstd.ZstdDecompressor()
+    return dctx
+
+def _iter_json_array(text: TextIO) -> Iterator[Dict]:
+    """Yields the elements of a top-level JSON array one at a time, only
+    ever holding the current chunk of text in memory."""
+    decoder = json.JSONDecoder()
+    # leading whitespace may fill whole chunks before the opening bracket
+    buf = ""
+    while not buf:
+        chunk = text.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf = chunk.lstrip()
+    if not buf.startswith("["):
+        raise ValueError("Card data must be a JSON array")
+    pos = 1
+    while True:
+        # skip separators, refilling when they run to the end of the chunk
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                break
+            buf, pos = text.read(_CHUNK_SIZE), 0
+            if not buf:
+                raise ValueError("Unterminated JSON array")
+        if buf[pos] == "]":
+            return
+        try:
+            item, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            chunk = text.read(_CHUNK_SIZE)
+            if not chunk:
+                raise
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield item
 
 class CardRepository:
-    def __init__(self, path_pattern: Optional[str] = None):
+    def __init__(self, path_pattern: Optional[str] = None, workers: int = 0):
+        """`workers` is the number of threads used to load data files;
+        0 picks one per file (capped), 1 loads them sequentially."""
         self._path_pattern = path_pattern or self._default_path_pattern()
-        self._cards: List[Card] = self._load_all(self._path_pattern)
+        self._workers = workers
+        self.load_seconds = 0.0
+        self.load_stats: List[FileLoadStats] = []
+        self.fingerprint = ""
+        # cards and their index are swapped together as one object, so a
+        # concurrent reader never sees a new card list with a stale index
+        self._index = self._build_index()
+
+    @property
+    def _cards(self) -> Sequence[Card]:
+        return self._index.cards
 
     def _default_path_pattern(self) -> str:
         here = os.path.dirname(__file__)
         project_root = os.path.abspath(os.path.join(here, "..", ".."))
         data_dir = os.path.join(project_root, "data")
+        # precompiled packs (see scripts/compress.py --pack) win when present
+        packs = os.path.join(data_dir, "*" + PACK_SUFFIX)
+        if glob(packs):
+            return packs
         # include both .json and .json.zst
         return os.path.join(data_dir, "*.json*")
 
-    def _load_all(self, path_pattern: str) -> List[Card]:
-        cards: List[Card] = []
+    def _load_all(self, path_pattern: str) -> Sequence[Card]:
         files = sorted(glob(path_pattern))
-        print(f"[CardRepo] Found {len(files)} data files matching {path_pattern}:")
-        for fn in files:
-            basename = os.path.basename(fn)
-            # derive expansion name
-            if basename.endswith('.json.zst'):
-                expansion = basename[:-len('.json.zst')]
-                print(f"  → Detected compressed file: {fn!r}")
-            else:
-                expansion = os.path.splitext(basename)[0]
-                print(f"  → Detected uncompressed file: {fn!r}")
-            expansion = expansion.removesuffix("_pack")
+        log.info("Found %d data files matching %s", len(files), path_pattern)
+        workers = self._workers or min(_MAX_WORKERS, len(files)) or 1
+        if workers > 1:
+            # zstd and file reads release the GIL, so threads overlap the
+            # I/O and decompression of one file with parsing of another
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="card-load") as pool:
+                loaded = list(pool.map(self._load_source, files))
+        else:
+            loaded = [self._load_source(fn) for fn in files]
 
-            print(f"  → Loading file: {fn!r} as expansion '{expansion}'")
+        parts: List[Sequence[Card]] = []
+        cards: List[Card] = []
+        next_id = 0
+        for part, _ in loaded:
+            if isinstance(part, PackedCards):
+                if cards:
+                    parts.append(cards)
+                    cards = []
+                part.first_id = next_id
+                parts.append(part)
+            else:
+                # ids are only known once every file is in order, so they
+                # are stamped on afterwards
+                for offset, card in enumerate(part):
+                    object.__setattr__(card, "card_id", next_id + offset)
+                cards.extend(part)
+            next_id += len(part)
+        if cards or not parts:
+            parts.append(cards)
+        self.load_stats = [stats for _, stats in loaded]
 
-            raw_cards = self._load_file(fn)
-            print(f"     contains {len(raw_cards)} raw cards")
+        result = parts[0] if len(parts) == 1 else ChainedCards(parts)
+        log.info("Total cards loaded: %d", len(result))
+        return result
 
-            for raw in raw_cards:
-                cards.append(Card(
+    def _load_source(self, fn: str) -> Tuple[Sequence[Card], FileLoadStats]:
+        """Loads one data file; runs on a pool thread in parallel mode."""
+        started = time.perf_counter()
+        if fn.endswith(PACK_SUFFIX):
+            cards: Sequence[Card] = PackedCards(fn)
+            expansion = None
+        else:
+            expansion = expansion_name(fn)
+            cards = [
+                Card(
                     text      = raw["text"],
                     card_type = raw["type"],
                     pick      = raw.get("pick", 1),
                     regions   = raw["regions"],
                     expansion = expansion
-                ))
-        print(f"[CardRepo] Total cards loaded: {len(cards)}\n")
-        return cards
-
-    def _load_file(self, fn: str) -> List[Dict]:
-        if fn.lower().endswith('.json.zst'):
-            data = Path(fn).read_bytes()
-            dctx = zstd.ZstdDecompressor()
-            txt = dctx.decompress(data).decode('utf-8')
-            return json.loads(txt)
-        else:
-            with open(fn, encoding='utf-8') as f:
-                return json.load(f)
+                )
+                for raw in self._iter_file(fn)
+            ]
+        stats = FileLoadStats(
+            path      = fn,
+            expansion = expansion,
+            cards     = len(cards),
+            bytes     = os.path.getsize(fn),
+            seconds   = time.perf_counter() - started
+        )
+        log.info("Loaded %s: %d cards in %.1f ms", fn, stats.cards, stats.seconds * 1000,
+                 extra={"card_file": asdict(stats)})
+        return cards, stats
+
+    @staticmethod
+    def _iter_file(fn: str) -> Iterator[Dict]:
+        """Streams the raw card dicts of a JSON or .json.zst data file."""
+        with open(fn, 'rb') as raw:
+            if fn.lower().endswith('.json.zst'):
+                source = _decompressor().stream_reader(raw, read_size=_CHUNK_SIZE)
+            else:
+                source = raw
+            text = io.TextIOWrapper(source, encoding='utf-8')
+            yield from _iter_json_array(text)
+
+    @staticmethod
+    def _load_file(fn: str) -> List[Dict]:
+        return list(CardRepository._iter_file(fn))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def path_pattern(self) -> str:
+        return self._path_pattern
+
+    @property
+    def packed(self) -> bool:
+        """Whether the cards come from memory-mapped `.cardpack` files."""
+        return self._path_pattern.endswith(PACK_SUFFIX)
+
+    def save_pack(self, path: str) -> int:
+        """Compiles the loaded cards into one pack at `path`, in id order,
+        so a repository opened on it hands out the same card ids.
+        Returns the number of cards written."""
+        return write_pack(path, [
+            (expansion, [{"text": c.text, "type": c.card_type, "pick": c.pick, "regions": dict(c.regions)}
+                         for c in cards])
+            for expansion, cards in groupby(self._cards, key=lambda c: c.expansion)
+        ])
+
+    def card(self, card_id: int) -> Card:
+        return self._cards[card_id]
 
     def load(self) -> List[Card]:
         return list(self._cards)
@@ -71,20 +233,55 @@ class CardRepository:
         self,
         card_type:  Optional[str]          = None,
         regions:    Optional[Dict[str,bool]] = None,
-        expansions: Optional[List[str]]     = None
+        expansions: Optional[List[str]]     = None,
+        min_pick:   Optional[int]           = None,
+        max_pick:   Optional[int]           = None
     ) -> List[Card]:
-        cards = self._cards
-        if card_type:
-            cards = [c for c in cards if c.card_type == card_type]
-        if regions:
-            cards = [
-                c for c in cards
-                if any(regions.get(r, False) and c.regions.get(r, False)
-                       for r in regions)
-            ]
-        if expansions:
-            cards = [c for c in cards if c.expansion in expansions]
-        return cards.copy()
+        index = self._index
+        return index.cards_for(index.select(card_type, regions, expansions, min_pick, max_pick))
+
+    def filter_ids(
+        self,
+        card_type:  Optional[str]          = None,
+        regions:    Optional[Dict[str,bool]] = None,
+        expansions: Optional[List[str]]     = None,
+        min_pick:   Optional[int]           = None,
+        max_pick:   Optional[int]           = None
+    ) -> Sequence[int]:
+        """Same as `filter`, but returns card ids (positions in `load()`).
+
+        The result is a read-only array shared between callers using the
+        same filter, so it costs nothing per game."""
+        return self._index.select_ids(card_type, regions, expansions, min_pick, max_pick)
+
+    def deck(
+        self,
+        card_type:  Optional[str]          = None,
+        regions:    Optional[Dict[str,bool]] = None,
+        expansions: Optional[List[str]]     = None,
+        min_pick:   Optional[int]           = None,
+        max_pick:   Optional[int]           = None,
+        rng:        Optional[random.Random] = None
+    ) -> Deck:
+        """A freshly shuffled `Deck` over the matching cards."""
+        index = self._index
+        return Deck(index.cards, index.select_ids(card_type, regions, expansions, min_pick, max_pick), rng)
+
+    def restore_deck(
+        self,
+        data:       Dict,
+        card_type:  Optional[str]          = None,
+        regions:    Optional[Dict[str,bool]] = None,
+        expansions: Optional[List[str]]     = None,
+        min_pick:   Optional[int]           = None,
+        max_pick:   Optional[int]           = None,
+        rng:        Optional[random.Random] = None
+    ) -> Deck:
+        """A deck from `Deck.snapshot()` data, over the same filter the
+        original deck was built with."""
+        index = self._index
+        ids = index.select_ids(card_type, regions, expansions, min_pick, max_pick)
+        return Deck.restore(index.cards, ids, data, rng)
 
     def print_stats(self) -> None:
         per_file = defaultdict(int)
@@ -105,12 +302,49 @@ class CardRepository:
     def reload(self, path_pattern: Optional[str] = None) -> None:
         if path_pattern:
             self._path_pattern = path_pattern
-        self._cards = self._load_all(self._path_pattern)
+        self._index = self._build_index()
+
+    def _build_index(self) -> CardIndex:
+        started = time.perf_counter()
+        index = CardIndex(self._load_all(self._path_pattern))
+        self.load_seconds = time.perf_counter() - started
+        self.fingerprint = self._fingerprint(len(index))
+        return index
+
+    def _fingerprint(self, total: int) -> str:
+        """Identifies this card data, so saved card ids are only ever read
+        back against the same files in the same order."""
+        h = hashlib.sha1(str(total).encode())
+        for stats in self.load_stats:
+            h.update(f"|{os.path.basename(stats.path)}:{stats.cards}:{stats.bytes}".encode())
+        return h.hexdigest()[:16]
 
     def available_expansions(self) -> List[str]:
-        return sorted({c.expansion for c in self._cards})
+        return sorted(self._index.by_expansion)
 
     def available_regions(self) -> List[str]:
-        if not self._cards:
+        cards = self._cards
+        if not cards:
             return []
-        return list(self._cards[0].regions.keys())
+        return list(cards[0].regions.keys())
+
+
+# ─── Process-wide repository ────────────────────────────────────
+
+_shared_repo: Optional[CardRepository] = None
+_shared_lock = threading.Lock()
+
+def get_shared_repository() -> CardRepository:
+    """Returns the single repository shared by the whole process, loading
+    it on first use.  Safe to call from several threads at once."""
+    global _shared_repo
+    repo = _shared_repo
+    if repo is None:
+        with _shared_lock:
+            if _shared_repo is None:
+                _shared_repo = CardRepository()
+            repo = _shared_repo
+    return repo
+
+def shared_repository_loaded() -> bool:
+    return _shared_repo is not None
@@ -0,0 +1,121 @@
+# deck.py
+
+import random
+from array import array
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from .card import Card
+
+class Deck:
+    """The cards left to draw, held as ids into a shared card sequence.
+
+    `ids` is never modified, so every game built from the same filter can
+    share one array.  Drawing is a lazy Fisher–Yates shuffle: each draw
+    picks a random remaining slot and records the swap in a small dict,
+    so a game only pays for the cards it actually draws, not for the size
+    of the pool.
+
+    Played cards go onto a discard pile; once the draw pile runs out the
+    discards become the new draw pile, so small decks never run dry while
+    cards are still in circulation.
+    """
+
+    __slots__ = ("_cards", "_ids", "_remaining", "_swaps", "_rng", "_discards", "_shared")
+
+    def __init__(self,
+                 cards: Sequence[Card] = (),
+                 ids:   Sequence[int]  = (),
+                 rng:   Optional[random.Random] = None) -> None:
+        self._cards = cards
+        self._ids   = ids
+        self._remaining = len(ids)
+        self._swaps: Dict[int, int] = {}
+        self._rng = rng or random
+        self._discards = array("I")
+        self._shared = True   # `_ids` is still the array we were built from
+
+    def __len__(self) -> int:
+        """Cards still drawable, counting the discard pile."""
+        return self._remaining + len(self._discards)
+
+    def __bool__(self) -> bool:
+        return self._remaining > 0 or len(self._discards) > 0
+
+    @property
+    def discard_count(self) -> int:
+        return len(self._discards)
+
+    def discard(self, card: Card) -> None:
+        if card.card_id >= 0:
+            self._discards.append(card.card_id)
+
+    def discard_all(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.discard(card)
+
+    def draw_id(self) -> int:
+        if not self._remaining:
+            if not self._discards:
+                raise IndexError("draw from an empty deck")
+            self._reshuffle_discards()
+        last = self._remaining - 1
+        slot = self._rng.randrange(self._remaining)
+        swaps = self._swaps
+        picked = swaps.get(slot, self._ids[slot]) if swaps else self._ids[slot]
+        # the slot now holds whatever sat in the last position
+        if slot != last:
+            swaps[slot] = swaps.pop(last, self._ids[last])
+        else:
+            swaps.pop(last, None)
+        self._remaining = last
+        return picked
+
+    def pop(self) -> Card:
+        """Draws a random card; named like `list.pop` for the engine."""
+        return self._cards[self.draw_id()]
+
+    def clear(self) -> None:
+        self._remaining = 0
+        self._swaps.clear()
+        del self._discards[:]
+
+    def _reshuffle_discards(self) -> None:
+        # the discard pile becomes this deck's own draw pile; draws keep
+        # picking random slots, so no explicit shuffle is needed
+        self._ids, self._discards = self._discards, array("I")
+        self._remaining = len(self._ids)
+        self._swaps.clear()
+        self._shared = False
+
+    # ─── Snapshots ──────────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The draw state as plain JSON-ready data.  The id pool is left out
+        while it is still the shared one, so a snapshot only grows with the
+        cards actually drawn or discarded."""
+        data = {
+            "remaining": self._remaining,
+            "swaps":     [[slot, card_id] for slot, card_id in self._swaps.items()],
+            "discards":  self._discards.tolist(),
+        }
+        if not self._shared:
+            data["ids"] = list(self._ids)
+        return data
+
+    @classmethod
+    def restore(cls,
+                cards: Sequence[Card],
+                ids:   Sequence[int],
+                data:  Dict[str, Any],
+                rng:   Optional[random.Random] = None) -> "Deck":
+        """Rebuilds a deck from `snapshot()`; `ids` is the shared pool the
+        original deck was built from."""
+        shared = "ids" not in data
+        deck = cls(cards, ids if shared else array("I", data["ids"]), rng)
+        if data["remaining"] > len(deck._ids):
+            raise ValueError("Deck snapshot does not fit its card pool")
+        deck._shared = shared
+        deck._remaining = data["remaining"]
+        deck._swaps = {slot: card_id for slot, card_id in data["swaps"]}
+        deck._discards = array("I", data["discards"])
+        return deck
@@ -0,0 +1,79 @@
+# event_log.py
+"""Append-only log of the actions taken in one game.
+
+Every successful engine action is appended as one compact JSON array:
+
+    ["start",  {"seed": ..., "config": {...}, "players": [[id, name], ...], ...}]
+    ["submit", player_id, [hand indices]]
+    ["judge",  winner_id]
+    ["draft",  player_id, pick_index]
+    ["skip",   player_id]
+    ["leave",  player_id]
+    ["end"]
+    ["restore", {"events": n}]
+
+Decks draw from the game's seeded RNG, so the start event plus the actions
+after it are enough for `replay` to rebuild the exact same game.
+
+A game picked up from a snapshot after a restart carries on in the same
+file.  Its `restore` event says the game resumed from the state after the
+first `n` lines; anything logged between the snapshot and the restart was
+lost with the process and is skipped on replay.
+"""
+
+import os
+import json
+from typing import Any, Iterator, List, Optional, TextIO
+
+Event = List[Any]
+
+class EventLog:
+    """Keeps the events in memory; the base for the file-backed log."""
+
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def append(self, event: Event) -> None:
+        self.events.append(event)
+
+    def close(self) -> None:
+        pass
+
+class FileEventLog(EventLog):
+    """Appends each event to a JSON-lines file as it happens.  Only the
+    open handle is kept, not the events themselves."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._count = 0
+        if os.path.exists(path):
+            # reopened to carry on a restored game
+            with open(path, encoding="utf-8") as f:
+                self._count = sum(1 for line in f if line.strip())
+        self._file: Optional[TextIO] = open(path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, event: Event) -> None:
+        if self._file is None:
+            raise ValueError(f"Event log {self.path} is closed")
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        # one write per event: a crash loses at most the action in flight
+        self._file.flush()
+        self._count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def read_events(path: str) -> Iterator[Event]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
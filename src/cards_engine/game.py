@@ -1,60 +1,126 @@
 # src/cards_engine/game.py
 
-import inspect
-from typing    import Callable, List, Union, Awaitable
+import random
+import secrets
+from typing    import Callable, Dict, List, Optional, Tuple, Union, Awaitable
 from .game_state    import GameState
 from .game_phases   import Phase
 from .card_repository import CardRepository
 from .game_config   import GameConfig
 from .player        import Player
 from .game_engine   import GameEngine
+from .phase_dispatch import PhaseDispatcher, ListenerMode, ListenerStats
+from .event_log     import EventLog, Event
 
 PhaseListener = Union[
     Callable[['Game', Phase, Phase], None],
     Callable[['Game', Phase, Phase], Awaitable[None]]
 ]
 
+class CountingRandom(random.Random):
+    """`random.Random` that counts the 32-bit words it has drawn, so where
+    it stands can be saved as one number and rebuilt from the seed."""
+
+    def seed(self, a=None, version=2) -> None:
+        super().seed(a, version)
+        self._seed = a
+        self.words = 0
+
+    def getrandbits(self, k: int) -> int:
+        self.words += (k + 31) // 32
+        return super().getrandbits(k)
+
+    def random(self) -> float:
+        self.words += 2
+        return super().random()
+
+    def seek(self, words: int) -> None:
+        """Reseeds and skips ahead to where the generator stood after
+        drawing `words` words."""
+        self.seed(self._seed)
+        while words > self.words:
+            step = min(words - self.words, 1 << 16)
+            self.getrandbits(32 * step)
+
 class Game:
     def __init__(self,
                  players:    List[Player],
                  config:     GameConfig,
                  repository: CardRepository,
                  host_id: str = "",
-                 channel_id: int = None) -> None:
+                 channel_id: int = None,
+                 seed: Optional[int] = None,
+                 event_log: Optional[EventLog] = None) -> None:
         self.players = players
         self.config = config
         self.repo   = repository
         self.channel_id = channel_id
         self.host_id = host_id
+        if seed is None:
+            seed = config.seed if config.seed is not None else secrets.randbits(32)
+        self.seed = seed
+        # every draw comes from this RNG, so the seed plus the event log
+        # replays the game exactly
+        self.rng = CountingRandom(seed)
+        # seating, reveal order and flavour text: seeded too, but a separate
+        # stream so presentation never shifts what the decks deal
+        self.presentation_rng = random.Random(f"{seed}/presentation")
+        self.event_log = event_log
         self.engine = GameEngine()
-        self._phase_listeners: List[PhaseListener] = []
+        self.phase_events = PhaseDispatcher()
         self.state = None
 
-    def add_phase_listener(self, fn: PhaseListener) -> None:
-        self._phase_listeners.append(fn)
+    def add_phase_listener(self,
+                           fn:      PhaseListener,
+                           mode:    ListenerMode    = ListenerMode.INLINE,
+                           timeout: Optional[float] = None) -> None:
+        """Calls `fn(game, old_phase, new_phase)` on every phase change.
+        See `phase_dispatch` for the modes; `timeout` is in seconds."""
+        self.phase_events.add(fn, mode=mode, timeout=timeout)
+
+    def listener_stats(self) -> Dict[str, ListenerStats]:
+        return self.phase_events.stats()
+
+    def _record(self, event: Event) -> None:
+        if self.event_log is not None:
+            self.event_log.append(event)
+
+    def log_position(self) -> Optional[Tuple[str, int]]:
+        """The event log's file and how many events it holds, for
+        snapshots; None when the game is not logged to a file."""
+        path = getattr(self.event_log, "path", None)
+        return (path, len(self.event_log)) if path else None
+
+    def close(self) -> None:
+        """Releases what the game holds open once it is over."""
+        if self.event_log is not None:
+            self.event_log.close()
 
     async def _set_phase(self, new_phase: Phase) -> None:
         old = self.state.phase
         if old is new_phase:
             return
         self.state.phase = new_phase
-        for fn in self._phase_listeners:
-            result = fn(self, old, new_phase)
-            if inspect.isawaitable(result):
-                await result
-
-    async def start(self) -> None:
-        black = self.repo.filter(
-            card_type   = "prompt",
-            regions     = self.config.regions,
-            expansions  = self.config.expansions)
-        black = [c for c in black if self.config.min_blanks <= c.pick <= self.config.max_blanks]
+        await self.phase_events.dispatch(self, old, new_phase)
 
-        white = self.repo.filter(
+    def deck_filter(self, card_type: str) -> Dict:
+        """Repository filter for this game's prompt or response deck."""
+        if card_type == "prompt":
+            return dict(
+                card_type   = "prompt",
+                regions     = self.config.regions,
+                expansions  = self.config.expansions,
+                min_pick    = self.config.min_blanks,
+                max_pick    = self.config.max_blanks)
+        return dict(
             card_type   = "response",
             regions     = self.config.regions,
             expansions  = self.config.expansions)
 
+    async def start(self) -> None:
+        black = self.repo.deck(rng=self.rng, **self.deck_filter("prompt"))
+        white = self.repo.deck(rng=self.rng, **self.deck_filter("response"))
+
         self.state = GameState(
             players= self.players,
             score_limit= self.config.score_limit,
@@ -67,14 +133,20 @@ class Game:
             next_phase = self.engine.draft_deal(self.state, self.state.hand_size)
         else:
             next_phase = self.engine.start_game(self.state)
+        self._record(["start", {
+            "seed":       self.seed,
+            "config":     self.config.to_dict(),
+            "players":    [[p.id, p.name] for p in self.players],
+            "host_id":    self.host_id,
+            "channel_id": self.channel_id,
+        }])
         await self._set_phase(next_phase)
 
     async def submit(self, player_id: str, card_indices: List[int]) -> None:
         if not self.state:
             raise RuntimeError("Game not started yet.")
-        player = self.state.player_by_id(player_id)
-        cards  = [player.hand[i] for i in card_indices]
-        all_in = self.engine.submit_cards(self.state, player_id, cards)
+        all_in = self.engine.submit_hand(self.state, player_id, card_indices)
+        self._record(["submit", player_id, list(card_indices)])
         if all_in:
             await self._set_phase(Phase.JUDGING)
 
@@ -83,6 +155,7 @@ class Game:
             raise RuntimeError("Game not started yet.")
 
         next_phase = self.engine.judge_pick(self.state, winner_id)
+        self._record(["judge", winner_id])
         await self._set_phase(next_phase)
 
     async def draft_pick(self, player_id: str, pick_index: int) -> None:
@@ -91,6 +164,7 @@ class Game:
         if self.state.phase is not Phase.DRAFT_PICKING:
             raise RuntimeError(f"Not in draft phase: {self.state.phase}")
         next_phase = self.engine.draft_pick(self.state, player_id, pick_index)
+        self._record(["draft", player_id, pick_index])
         await self._set_phase(next_phase)
 
     async def skip(self, player_id: str) -> None:
@@ -98,5 +172,21 @@ class Game:
             raise RuntimeError("Game not started yet.")
         if self.state.phase is not Phase.SUBMISSIONS:
             raise RuntimeError(f"Not in submission phase: {self.state.phase}")
-        next_phase = self.engine.skip(self.state, player_id)
-        await self._set_phase(next_phase)
\ No newline at end of file
+        next_phase = self.engine.skip_prompt(self.state, player_id)
+        self._record(["skip", player_id])
+        await self._set_phase(next_phase)
+
+    async def leave(self, player_id: str) -> None:
+        if not self.state:
+            raise RuntimeError("Game not started yet.")
+        next_phase = self.engine.remove_player(self.state, player_id)
+        self._record(["leave", player_id])
+        await self._set_phase(next_phase)
+
+    async def end(self) -> None:
+        """Finishes the game early, e.g. when a tournament closes its table."""
+        if not self.state:
+            raise RuntimeError("Game not started yet.")
+        next_phase = self.engine.end_game(self.state)
+        self._record(["end"])
+        await self._set_phase(next_phase)
@@ -1,6 +1,6 @@
 # game_config.py
-from dataclasses import dataclass, field
-from typing import List, Dict
+from dataclasses import dataclass, field, fields
+from typing import Any, List, Dict, Optional
 
 hand_size_min = 3
 hand_size_max = 14
@@ -22,4 +22,11 @@ class GameConfig:
     score_limit: int                    = 6
     min_blanks: int                     = 1
     max_blanks: int                     = 3
-    max_players: int                    = 10
\ No newline at end of file
+    max_players: int                    = 10
+    # fixes every random choice in the game; None draws a fresh seed per game
+    seed: Optional[int]                 = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain field values for JSON; shallow, unlike `asdict`, which
+        deep-copies and costs more than the rest of a snapshot."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
\ No newline at end of file
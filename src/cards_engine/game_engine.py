@@ -1,5 +1,4 @@
-import random
-from typing import List
+from typing import List, Sequence
 from .game_state    import GameState
 from .player        import Player
 from .card          import Card
@@ -7,18 +6,15 @@ from .game_phases   import Phase
 
 class GameEngine:
     def start_game(self, state: GameState) -> Phase:
-        """Standard deal & first prompt."""
-        random.shuffle(state.black_deck)
-        random.shuffle(state.white_deck)
-
+        """Standard deal & first prompt.  Decks draw in random order, so
+        there is nothing to shuffle up front."""
         total_needed = len(state.players) * state.hand_size
         if len(state.white_deck) < total_needed:
             raise ValueError(
                 f"Not enough white cards for classic deal: need {total_needed}, got {len(state.white_deck)}"
             )
 
-        state.submissions.clear()
-        state.submissions_shuffled = []
+        state.clear_submissions()
         for p in state.players:
             p.hand = [state.white_deck.pop() for _ in range(state.hand_size)]
             p.score = 0
@@ -28,15 +24,23 @@ class GameEngine:
 
 
     def draw_prompt(self, state: GameState) -> None:
-        state.submissions.clear()
-        state.submissions_shuffled = []
+        state.clear_submissions()
+        # discard first, so a deck of one prompt can still cycle
+        if state.current_prompt is not None:
+            state.black_deck.discard(state.current_prompt)
         state.current_prompt = state.black_deck.pop()
+        state.round_number += 1
+
+    def submit_hand(self, state: GameState, player_id: str, card_indices: Sequence[int]) -> bool:
+        """`submit_cards` with the cards given by their place in the hand."""
+        hand = self.find_player(state, player_id).hand
+        return self.submit_cards(state, player_id, [hand[i] for i in card_indices])
 
     def submit_cards(self, state: GameState, player_id: str, cards: List[Card]) -> bool:
         state.phase_check(Phase.SUBMISSIONS)
 
         # find the player
-        player = next(p for p in state.players if p.id == player_id)
+        player = self.find_player(state, player_id)
         # judge guard
         if state.players[state.judge_index] is player:
             raise RuntimeError("Judge cannot submit cards.")
@@ -51,30 +55,26 @@ class GameEngine:
             player.hand.remove(c)
 
         # record submission
-        state.submissions[player_id] = cards
+        state.record_submission(player_id, cards)
 
-        all_in = self._all_non_judges_submitted(state)
-        return all_in
+        return self._all_non_judges_submitted(state)
             
 
     def judge_pick(self, state: GameState, winner_id: str) -> Phase:
+        state.phase_check(Phase.JUDGING)
         state.last_round_selected_id = winner_id
         state.last_round_selected_cards = state.submissions.get(winner_id, [])
-        state.phase_check(Phase.JUDGING)
         winner = self.find_player(state, winner_id)
         winner.score += 1
 
         if winner.score >= state.score_limit:
             return Phase.FINISHED
 
-        self._replenish_hands(state)
-        state.judge_index = (state.judge_index + 1) % len(state.players)
-        self.draw_prompt(state)
+        self._next_round(state)
         return Phase.SUBMISSIONS
     
     def draft_deal(self, state: GameState, pack_size: int) -> Phase:
         """Deal each player a pack of `pack_size` from white_deck, init kept‐piles, and enter draft."""
-        random.shuffle(state.white_deck)
         total_needed = len(state.players) * pack_size
         if len(state.white_deck) < total_needed:
             raise ValueError(
@@ -138,28 +138,65 @@ class GameEngine:
         self.draw_prompt(state)
         return Phase.SUBMISSIONS
 
+    def remove_player(self, state: GameState, player_id: str) -> Phase:
+        """Takes a player out of a running game and returns the phase it
+        goes on in.  If the judge leaves, or anyone leaves while answers are
+        being judged, the round is void: submissions go back to hands and a
+        fresh prompt is drawn.  With fewer than two players left the game
+        is over."""
+        if state.phase not in (Phase.SUBMISSIONS, Phase.JUDGING):
+            raise RuntimeError(f"Players cannot leave in phase {state.phase}")
+        player = self.find_player(state, player_id)
+        was_judge = self._is_judge(state, player)
+        state.remove_player(player_id)
+
+        if len(state.players) < 2:
+            return self.end_game(state)
+        if was_judge or state.phase is Phase.JUDGING:
+            # the judge seat already moved on to the next player if needed
+            self.rollback_submitted_cards(state)
+            self.draw_prompt(state)
+            return Phase.SUBMISSIONS
+        if state.all_submitted:
+            return Phase.JUDGING
+        return Phase.SUBMISSIONS
+
+    def end_game(self, state: GameState) -> Phase:
+        """Ends the game where it stands, with no round winner."""
+        state.last_round_selected_id = None
+        state.last_round_selected_cards = []
+        return Phase.FINISHED
+
     # ─── Helpers ────────────────────────────────────────────────
 
+    def _next_round(self, state: GameState) -> None:
+        """Discards the round's submissions, refills hands, passes the
+        judge seat on and draws the next prompt."""
+        for cards in state.submissions.values():
+            state.white_deck.discard_all(cards)
+        self._replenish_hands(state)
+        state.judge_index = (state.judge_index + 1) % len(state.players)
+        self.draw_prompt(state)
+
     def find_player(self, state: GameState, player_id: str) -> Player:
-        return next(p for p in state.players if p.id == player_id)
+        player = state.player_by_id(player_id)
+        if player is None:
+            raise ValueError(f"Player {player_id} is not in this game.")
+        return player
 
     def _all_non_judges_submitted(self, state: GameState) -> bool:
-        judge = state.players[state.judge_index]
-        for p in state.players:
-            name = p.name if p.name else p.id
-            if p is judge:
-                continue
-            if p.id not in state.submissions:
-                return False
-        return True
+        return state.all_submitted
 
     def _is_judge(self, state: GameState, player: Player) -> bool:
         return state.players[state.judge_index] is player
 
     def _replenish_hands(self, state: GameState) -> None:
+        deck = state.white_deck
         for p in state.players:
-            while len(p.hand) < state.hand_size:
-                p.hand.append(state.white_deck.pop())
+            # with every card in someone's hand there is nothing to deal;
+            # hands stay short until cards come back through the discards
+            while len(p.hand) < state.hand_size and deck:
+                p.hand.append(deck.pop())
 
     def rollback_submitted_cards(self, state: GameState) -> None:
         """Rollback the submitted cards for all players."""
@@ -169,5 +206,4 @@ class GameEngine:
             if player:
                 player.hand.extend(cards)
         # Clear submissions
-        state.submissions.clear()
-        state.submissions_shuffled = []
\ No newline at end of file
+        state.clear_submissions()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
-from enum import Enum
 from typing import List, Optional, Dict, Tuple
 from .card import Card
+from .deck import Deck
 from .player import Player
 from .game_phases import Phase
 
@@ -15,8 +15,8 @@ class GameState:
     draft_pass_index:       int = 0
     draft_direction:        int = +1
     draft_round_picks:      int = 0
-    black_deck:             List[Card] = field(default_factory=list)
-    white_deck:             List[Card] = field(default_factory=list)
+    black_deck:             Deck = field(default_factory=Deck)
+    white_deck:             Deck = field(default_factory=Deck)
     current_prompt:         Optional[Card] = None
     judge_index:            int = 0
     phase:                  Phase = Phase.WAITING
@@ -24,23 +24,83 @@ class GameState:
     last_round_selected_cards: List[Card] = field(default_factory=list)
     submissions:            Dict[str, List[Card]] = field(default_factory=dict)
     submissions_shuffled:   List[Tuple[str, List[Card]]] = field(default_factory=list)
+    # bumped with every prompt drawn, skips included
+    round_number:           int = 0
+    # non-judges who still owe a submission for the current prompt
+    outstanding_submitters: int = field(default=0, init=False)
+    _players_by_id:         Dict[str, Player] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.reindex_players()
 
     @property
     def current_judge(self) -> Player:
         return self.players[self.judge_index]
 
+    @property
+    def all_submitted(self) -> bool:
+        return self.outstanding_submitters <= 0
+
+    # ─── Players ────────────────────────────────────────────────
+
+    def reindex_players(self) -> None:
+        """Rebuilds the id lookup; call after reordering `players` directly."""
+        self._players_by_id = {str(p.id): p for p in self.players}
+        self._count_outstanding()
+
+    def add_player(self, player: Player) -> None:
+        self.players.append(player)
+        self._players_by_id[str(player.id)] = player
+        self._count_outstanding()
+
+    def remove_player(self, player_id: str) -> Optional[Player]:
+        player = self._players_by_id.pop(str(player_id), None)
+        if player is None:
+            return None
+        idx = next(i for i, p in enumerate(self.players) if p is player)
+        del self.players[idx]
+        if idx < self.judge_index:
+            self.judge_index -= 1
+        if self.players:
+            self.judge_index %= len(self.players)
+        else:
+            self.judge_index = 0
+        self.white_deck.discard_all(player.hand)
+        self.white_deck.discard_all(self.submissions.pop(player.id, ()))
+        self._count_outstanding()
+        return player
+
+    # ─── Submissions ────────────────────────────────────────────
+
+    def clear_submissions(self) -> None:
+        self.submissions.clear()
+        self.submissions_shuffled = []
+        self.outstanding_submitters = max(len(self.players) - 1, 0)
+
+    def record_submission(self, player_id: str, cards: List[Card]) -> None:
+        if player_id not in self.submissions:
+            self.outstanding_submitters -= 1
+        self.submissions[player_id] = cards
+
+    def _count_outstanding(self) -> None:
+        judge = self.players[self.judge_index] if self.players else None
+        self.outstanding_submitters = sum(
+            1 for p in self.players if p is not judge and p.id not in self.submissions
+        )
+
     def phase_check(self, expected_phase: Phase):
         if self.phase != expected_phase:
             raise ValueError(f"Invalid phase: expected {expected_phase}, got {self.phase}")
         
     def player_by_id(self, player_id: str) -> Optional[Player]:
-        for player in self.players:
-            if str(player.id) == str(player_id):
-                return player
-        return None
+        player = self._players_by_id.get(player_id)
+        if player is None and not isinstance(player_id, str):
+            player = self._players_by_id.get(str(player_id))
+        return player
 
     def reset(self):
         self.current_prompt = None
+        self.round_number = 0
         self.judge_index = 0
         self.phase = Phase.WAITING
         for player in self.players:
@@ -48,5 +108,4 @@ class GameState:
             player.score = 0
         self.black_deck.clear()
         self.white_deck.clear()
-        self.submissions.clear()
-        self.submissions_shuffled.clear()
\ No newline at end of file
+        self.clear_submissions()
\ No newline at end of file
@@ -0,0 +1,325 @@
+# game_worker.py
+"""Run games in worker processes.
+
+`GameWorkerPool` starts a fixed set of processes, each holding its own
+`Game` objects.  The workers open the cards as a memory-mapped `.cardpack`,
+so the pages are shared between processes by the OS: the bot's own pack
+if it loaded one, otherwise a temporary pack compiled from the bot's
+repository when the pool starts.  Games are routed to a worker by channel
+id, so one game's actions always land in the same process and are applied
+in order.
+
+`RemoteGame` is the stand-in the bot holds instead of a `Game`.  Actions
+are forwarded to the owning worker.  A reply carries only the parts of the
+game's `state_view` its action can change (a submit: the submitter's hand
+and the submissions), patched into the local `state` mirror used for
+rendering, and the phase changes the action caused, which are dispatched
+to the local phase listeners exactly as `Game` would.  Replies with phase
+changes, when the snapshot store saves the game, carry the whole view
+plus the RNG, decks and log position.
+
+A worker that dies takes its games with it: requests routed to it raise
+RuntimeError naming the worker, and the games can be picked up again from
+their last snapshots.
+"""
+
+import os
+import shutil
+import asyncio
+import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .card_repository import CardRepository, get_shared_repository, PACK_SUFFIX
+from .event_log       import FileEventLog
+from .game            import Game
+from .game_config     import GameConfig
+from .game_phases     import Phase
+from .game_state      import GameState
+from .player          import Player
+from .snapshot        import (state_view, player_view, resume_state, apply_view,
+                              apply_resume_state, restore_game, SnapshotError)
+
+log = logging.getLogger(__name__)
+
+# exceptions re-raised on the gateway with their original type
+_ERRORS = {e.__name__: e for e in (ValueError, RuntimeError, KeyError, IndexError, SnapshotError)}
+
+# ─── Worker process ─────────────────────────────────────────────
+
+class _WorkerGames:
+    """The games owned by one worker process."""
+
+    def __init__(self, repo: CardRepository) -> None:
+        self.repo = repo
+        self.games: Dict[int, Game] = {}
+        # phase changes since the last reply, per game
+        self.changes: Dict[int, List[Tuple[str, str]]] = {}
+        # the action behind the next reply, per game
+        self.actions: Dict[int, Tuple[str, list]] = {}
+
+    def _track(self, game: Game) -> None:
+        changes = self.changes[game.channel_id] = []
+        game.add_phase_listener(lambda g, old, new: changes.append((old.name, new.name)))
+        self.games[game.channel_id] = game
+
+    async def create(self, channel_id: int, spec: Dict[str, Any]) -> None:
+        players = [Player(id=pid, name=name) for pid, name in spec["players"]]
+        log_path = spec["event_log"]
+        game = Game(players, GameConfig(**spec["config"]), self.repo,
+                    host_id=spec["host_id"], channel_id=channel_id, seed=spec["seed"],
+                    event_log=FileEventLog(log_path) if log_path else None)
+        self._track(game)
+        await game.start()
+
+    async def restore(self, channel_id: int, data: Dict[str, Any]) -> None:
+        self._track(restore_game(data, self.repo, resume_log=True))
+
+    async def act(self, channel_id: int, request: Tuple[str, list]) -> None:
+        action, args = request
+        if action not in _ACTIONS:
+            raise ValueError(f"Unknown game action {action!r}")
+        game = self.games.get(channel_id)
+        if game is None:
+            raise RuntimeError("Game not started yet.")
+        await getattr(game, action)(*args)
+        self.actions[channel_id] = request
+
+    async def remove(self, channel_id: int, _payload: Any = None) -> None:
+        self.changes.pop(channel_id, None)
+        self.actions.pop(channel_id, None)
+        game = self.games.pop(channel_id, None)
+        if game is not None:
+            game.close()
+
+    def reply(self, channel_id: int) -> Dict[str, Any]:
+        game = self.games.get(channel_id)
+        if game is None:
+            return {}
+        changes = self.changes[channel_id]
+        phases = list(changes)
+        changes.clear()
+        action, args = self.actions.pop(channel_id, (None, None))
+        keys = None if phases else _ACTION_VIEWS.get(action)
+        if keys is None:
+            view = state_view(game.state)
+            view["seats"] = [p.id for p in game.state.players]
+            return {"view": view, "resume": resume_state(game), "phases": phases}
+        view = state_view(game.state, keys)
+        if action == "submit":
+            view["players"] = [player_view(game.state.player_by_id(args[0]))]
+        return {"view": view, "phases": phases}
+
+_ACTIONS = ("submit", "judge", "draft_pick", "skip", "leave", "end")
+
+# the view keys an action can change while the phase stays the same; any
+# phase change, and any other op, sends the whole view
+_ACTION_VIEWS = {
+    "submit":     ("submissions",),         # plus the submitter's hand
+    "draft_pick": ("draft",),
+    "skip":       ("players", "prompt", "round", "submissions", "reveal_order"),
+}
+
+def worker_main(conn, data_pattern: str, fingerprint: Optional[str] = None) -> None:
+    """Entry point of a worker process: serves `(op, channel_id, payload)`
+    requests until it receives None or the pipe closes.  `fingerprint`
+    stands in for the pack's own when it was compiled from the bot's
+    cards, which it holds under the same ids."""
+    repo = CardRepository(data_pattern)
+    if fingerprint:
+        repo.fingerprint = fingerprint
+    games = _WorkerGames(repo)
+    ops = {"create": games.create, "restore": games.restore,
+           "act": games.act, "remove": games.remove}
+    loop = asyncio.new_event_loop()
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        op, channel_id, payload = request
+        try:
+            loop.run_until_complete(ops[op](channel_id, payload))
+            conn.send(("ok", games.reply(channel_id)))
+        except Exception as e:
+            conn.send(("error", type(e).__name__, str(e)))
+    for channel_id in list(games.games):
+        loop.run_until_complete(games.remove(channel_id))
+    loop.close()
+
+# ─── Gateway side ───────────────────────────────────────────────
+
+class _Worker:
+    __slots__ = ("process", "conn", "executor")
+
+    def __init__(self, process, conn, executor: ThreadPoolExecutor) -> None:
+        self.process  = process
+        self.conn     = conn
+        self.executor = executor
+
+    def call(self, request: tuple) -> tuple:
+        # only ever run on this worker's single executor thread, so
+        # requests and replies on the pipe cannot interleave
+        try:
+            self.conn.send(request)
+            return self.conn.recv()
+        except (EOFError, OSError) as e:
+            # BrokenPipeError is an OSError; EOFError is the pipe closing mid-reply
+            log.error("Game worker %s is gone (exit code %s), dropping %s request for channel %s",
+                      self.process.name, self.process.exitcode, request[0], request[1])
+            raise RuntimeError(f"Game worker {self.process.name} has stopped") from e
+
+class GameWorkerPool:
+    """A fixed set of game worker processes.  A game lives on worker
+    `channel_id % workers` for its whole life.  The workers deal from the
+    same cards as `repository`, the shared one by default."""
+
+    def __init__(self, workers: int, repository: Optional[CardRepository] = None) -> None:
+        if workers < 1:
+            raise ValueError("A worker pool needs at least one worker")
+        repository = repository or get_shared_repository()
+        self._pack_dir: Optional[str] = None
+        if repository.packed:
+            data_pattern, fingerprint = repository.path_pattern, None
+        else:
+            # one mapped copy for every worker instead of a parsed one each
+            self._pack_dir = tempfile.mkdtemp(prefix="cab-cards-")
+            data_pattern = os.path.join(self._pack_dir, "cards" + PACK_SUFFIX)
+            repository.save_pack(data_pattern)
+            fingerprint = repository.fingerprint
+        ctx = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        for i in range(workers):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=worker_main, args=(child, data_pattern, fingerprint),
+                                  name=f"game-worker-{i}", daemon=True)
+            process.start()
+            child.close()
+            self._workers.append(_Worker(process, parent,
+                                         ThreadPoolExecutor(1, thread_name_prefix=f"game-worker-{i}")))
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    def worker_for(self, channel_id: int) -> int:
+        return channel_id % len(self._workers)
+
+    async def request(self, channel_id: int, op: str, payload: Any = None) -> Dict[str, Any]:
+        if self._closed:
+            raise RuntimeError("Game worker pool is closed")
+        worker = self._workers[self.worker_for(channel_id)]
+        reply = await asyncio.get_running_loop().run_in_executor(
+            worker.executor, worker.call, (op, channel_id, payload))
+        if reply[0] == "error":
+            _, name, message = reply
+            raise _ERRORS.get(name, RuntimeError)(message)
+        return reply[1]
+
+    def discard(self, channel_id: int) -> None:
+        """Drops a game from its worker without waiting for the reply."""
+        if not self._closed:
+            worker = self._workers[self.worker_for(channel_id)]
+            worker.executor.submit(worker.call, ("remove", channel_id, None))
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.executor.submit(worker.conn.send, None)
+            worker.executor.shutdown(wait=True)
+        for worker in self._workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                log.warning("Game worker %s did not stop, terminating it", worker.process.name)
+                worker.process.terminate()
+            worker.conn.close()
+        if self._pack_dir:
+            shutil.rmtree(self._pack_dir, ignore_errors=True)
+
+class RemoteGame(Game):
+    """A `Game` whose engine state lives in a worker process.
+
+    `state` is a read-only mirror patched from the worker's reply to every
+    action; phase listeners, `presentation_rng` and everything else the
+    bot renders from stay local.  Its decks, `rng` and `log_position()`
+    are only brought up to date on phase changes, which is when the game
+    is snapshotted.
+    """
+
+    def __init__(self,
+                 pool:       GameWorkerPool,
+                 players:    List[Player],
+                 config:     GameConfig,
+                 repository: CardRepository,
+                 host_id: str = "",
+                 channel_id: int = None,
+                 seed: Optional[int] = None,
+                 event_log_path: Optional[str] = None) -> None:
+        super().__init__(players, config, repository,
+                         host_id=host_id, channel_id=channel_id, seed=seed)
+        self.pool = pool
+        self.event_log_path = event_log_path
+        self._log_position: Optional[Tuple[str, int]] = None
+
+    @classmethod
+    async def restore(cls, pool: GameWorkerPool, data: Dict[str, Any],
+                      repository: CardRepository) -> "RemoteGame":
+        """Hands a `snapshot_game` snapshot to its worker and returns the
+        local stand-in for it.  The worker checks the snapshot, and its
+        reply fills in the mirror."""
+        log_path = data["log"][0] if data.get("log") else None
+        game = cls(pool, [], GameConfig(**data["config"]), repository, host_id=data["host_id"],
+                   channel_id=data["channel_id"], seed=data["seed"], event_log_path=log_path)
+        await game._call("restore", data)
+        return game
+
+    def log_position(self) -> Optional[Tuple[str, int]]:
+        return self._log_position
+
+    async def _call(self, op: str, payload: Any) -> None:
+        reply = await self.pool.request(self.channel_id, op, payload)
+        if self.state is None:
+            self.state = GameState(players=self.players, score_limit=self.config.score_limit)
+        apply_view(self.state, reply["view"], self.repo)
+        if "resume" in reply:
+            # kept so snapshots taken from the mirror resume like the worker's
+            apply_resume_state(self, reply["resume"])
+            self._log_position = reply["resume"]["log"]
+        for old, new in reply["phases"]:
+            await self.phase_events.dispatch(self, Phase[old], Phase[new])
+
+    async def start(self) -> None:
+        await self._call("create", {
+            "players":   [[p.id, p.name] for p in self.players],
+            "config":    self.config.to_dict(),
+            "host_id":   self.host_id,
+            "seed":      self.seed,
+            "event_log": self.event_log_path,
+        })
+
+    async def submit(self, player_id: str, card_indices: List[int]) -> None:
+        await self._call("act", ("submit", [player_id, list(card_indices)]))
+
+    async def judge(self, winner_id: str) -> None:
+        await self._call("act", ("judge", [winner_id]))
+
+    async def draft_pick(self, player_id: str, pick_index: int) -> None:
+        await self._call("act", ("draft_pick", [player_id, pick_index]))
+
+    async def skip(self, player_id: str) -> None:
+        await self._call("act", ("skip", [player_id]))
+
+    async def leave(self, player_id: str) -> None:
+        await self._call("act", ("leave", [player_id]))
+
+    async def end(self) -> None:
+        await self._call("act", ("end", []))
+
+    def close(self) -> None:
+        self.pool.discard(self.channel_id)
@@ -0,0 +1,132 @@
+# phase_dispatch.py
+"""Fan-out of phase changes to a game's listeners.
+
+Each listener is registered with a mode:
+
+- INLINE:      awaited in registration order before the phase change
+               returns (the original behaviour).
+- CONCURRENT:  started alongside the inline listeners and awaited with them,
+               so a slow one only costs its own time, not the sum.
+- BACKGROUND:  run as a task the phase change does not wait for.  Calls to
+               the same background listener still run one after another,
+               in phase order.
+
+A listener that raises or exceeds its timeout is logged and counted; it
+never fails the phase change or the other listeners.
+"""
+
+import time
+import bisect
+import asyncio
+import inspect
+import logging
+from enum        import Enum
+from dataclasses import dataclass, field
+from typing      import Any, Callable, Dict, List, Optional, Set
+
+log = logging.getLogger(__name__)
+
+# upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, float("inf"))
+
+class ListenerMode(Enum):
+    INLINE     = "inline"
+    CONCURRENT = "concurrent"
+    BACKGROUND = "background"
+
+@dataclass
+class ListenerStats:
+    calls:    int = 0
+    errors:   int = 0
+    timeouts: int = 0
+    histogram: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_MS))
+
+    def observe(self, seconds: float) -> None:
+        self.calls += 1
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1e3)] += 1
+
+    def buckets(self) -> Dict[str, int]:
+        """Histogram keyed by bucket label, e.g. {"<=10ms": 3, ...}."""
+        return {
+            (f"<={int(b)}ms" if b != float("inf") else "slower"): n
+            for b, n in zip(LATENCY_BUCKETS_MS, self.histogram)
+        }
+
+@dataclass
+class _Registration:
+    fn:      Callable[..., Any]
+    mode:    ListenerMode
+    timeout: Optional[float]
+    name:    str
+    stats:   ListenerStats = field(default_factory=ListenerStats)
+    lane:    Optional[asyncio.Task] = None   # last background call
+
+class PhaseDispatcher:
+    def __init__(self) -> None:
+        self._listeners: List[_Registration] = []
+        self._background: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._listeners)
+
+    def add(self, fn: Callable[..., Any], mode: ListenerMode = ListenerMode.INLINE,
+            timeout: Optional[float] = None, name: Optional[str] = None) -> None:
+        name = name or getattr(fn, "__qualname__", repr(fn))
+        self._listeners.append(_Registration(fn, mode, timeout, name))
+
+    async def dispatch(self, *args) -> None:
+        waited = []
+        inline = []
+        for reg in self._listeners:
+            if reg.mode is ListenerMode.BACKGROUND:
+                self._start_background(reg, args)
+            elif reg.mode is ListenerMode.CONCURRENT:
+                waited.append(self._call(reg, args))
+            else:
+                inline.append(reg)
+        if inline:
+            waited.append(self._call_in_order(inline, args))
+        if len(waited) == 1:
+            await waited[0]
+        elif waited:
+            await asyncio.gather(*waited)
+
+    async def drain(self) -> None:
+        """Waits for every background call started so far."""
+        while self._background:
+            await asyncio.gather(*list(self._background))
+
+    def stats(self) -> Dict[str, ListenerStats]:
+        return {reg.name: reg.stats for reg in self._listeners}
+
+    # ─── Internals ─────────────────────────────────────────────
+
+    async def _call_in_order(self, regs: List[_Registration], args: tuple) -> None:
+        for reg in regs:
+            await self._call(reg, args)
+
+    async def _call(self, reg: _Registration, args: tuple) -> None:
+        started = time.perf_counter()
+        try:
+            result = reg.fn(*args)
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, reg.timeout)
+        except asyncio.TimeoutError:
+            reg.stats.timeouts += 1
+            log.warning("Phase listener %s timed out after %.1fs", reg.name, reg.timeout)
+        except Exception:
+            reg.stats.errors += 1
+            log.exception("Phase listener %s failed", reg.name)
+        finally:
+            reg.stats.observe(time.perf_counter() - started)
+
+    def _start_background(self, reg: _Registration, args: tuple) -> None:
+        previous = reg.lane
+        async def run() -> None:
+            if previous is not None and not previous.done():
+                await asyncio.wait([previous])
+            await self._call(reg, args)
+        task = asyncio.get_running_loop().create_task(run(), name=f"phase-{reg.name}")
+        reg.lane = task
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
@@ -0,0 +1,77 @@
+# prompt_template.py
+
+import re
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+BLANK_PATTERN = re.compile(r'_{3,}')  # matches ___, ____, etc.
+_ARTICLE = re.compile(r"(?:The|A|An)\b")
+
+def strip_single_terminal_punct(text: str) -> str:
+    """Drops one trailing '.', '!' or '?' so a response reads naturally
+    inside a sentence, but keeps '...', '?!', '!?' and doubled marks."""
+    if not text:
+        return text
+    if len(text) > 2 and text[-3:] == "...":
+        return text
+    if len(text) > 1 and text[-2:] in ("?!", "!?"):
+        return text
+    if text[-1] in ".!?":
+        if len(text) == 1 or text[-2] not in ".!?":
+            return text[:-1]
+    return text
+
+class PromptTemplate:
+    """A prompt split once into literal segments around its blanks.
+
+    `segments` always has one more entry than `blanks`; rendering
+    interleaves them with the (bolded) responses."""
+
+    __slots__ = ("text", "segments", "blanks", "lowercase_article")
+
+    def __init__(self, text: str):
+        self.text = text
+        segments = []
+        blanks = []
+        lowercase = []
+        pos = 0
+        for m in BLANK_PATTERN.finditer(text):
+            start = m.start()
+            segments.append(text[pos:start])
+            blanks.append(m.group(0))
+            # a leading "The"/"A"/"An" is lowercased unless the blank
+            # starts the text or follows terminal punctuation
+            lowercase.append(start > 0 and text[start - 1] not in ".!?")
+            pos = m.end()
+        segments.append(text[pos:])
+        self.segments: Tuple[str, ...] = tuple(segments)
+        self.blanks: Tuple[str, ...] = tuple(blanks)
+        self.lowercase_article: Tuple[bool, ...] = tuple(lowercase)
+
+    def render(self, responses: Sequence[str]) -> str:
+        if not self.blanks:
+            if not responses:
+                return self.text
+            return self.text + " " + " ".join(f"**{resp}**" for resp in responses)
+
+        segments = self.segments
+        parts = [segments[0]]
+        for i, blank in enumerate(self.blanks):
+            if i < len(responses):
+                resp = strip_single_terminal_punct(responses[i])
+                if self.lowercase_article[i] and _ARTICLE.match(resp):
+                    resp = resp[0].lower() + resp[1:]
+                parts.append(f"**{resp}**")
+            else:
+                parts.append(blank)
+            parts.append(segments[i + 1])
+        return "".join(parts)
+
+@lru_cache(maxsize=None)
+def compile_prompt(text: str) -> PromptTemplate:
+    """One template per distinct prompt text, shared by every card and game."""
+    return PromptTemplate(text)
+
+@lru_cache(maxsize=4096)
+def render_prompt(text: str, responses: Tuple[str, ...]) -> str:
+    return compile_prompt(text).render(responses)
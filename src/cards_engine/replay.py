@@ -0,0 +1,107 @@
+# replay.py
+"""Rebuild games from their event logs.
+
+`replay` feeds a logged game back through `Game`, so the result matches
+the original state exactly as long as the card data is unchanged.  Run as
+a script it replays one or more log files and reports per-action engine
+latency, which makes recorded production games usable as a benchmark:
+
+    python -m cards_engine.replay data/events/*.jsonl --repeat 20
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from typing import Callable, Iterable, List, Optional
+
+from .card_repository import CardRepository, get_shared_repository
+from .event_log       import Event, read_events
+from .game            import Game
+from .game_config     import GameConfig
+from .player          import Player
+from .simulator       import SimulationStats
+
+class ReplayError(ValueError):
+    """The events do not describe a game that can be replayed."""
+
+async def replay(events: Iterable[Event], repo: CardRepository,
+                 on_action: Optional[Callable[[str, float], None]] = None) -> Game:
+    """Plays `events` through a fresh `Game` with no listeners and returns
+    it.  `on_action(kind, seconds)` is called with each action's time."""
+    clock = time.perf_counter
+    events = iter(_resumed(list(events)))
+    first = next(events, None)
+    if not first or first[0] != "start":
+        raise ReplayError("Event log must begin with a start event")
+    start = first[1]
+    players = [Player(id=pid, name=name) for pid, name in start["players"]]
+    game = Game(players, GameConfig(**start["config"]), repo,
+                host_id=start["host_id"], channel_id=start["channel_id"], seed=start["seed"])
+
+    actions = {
+        "submit": game.submit,
+        "judge":  game.judge,
+        "draft":  game.draft_pick,
+        "skip":   game.skip,
+        "leave":  game.leave,
+        "end":    game.end,
+    }
+    started = clock()
+    await game.start()
+    if on_action:
+        on_action("start", clock() - started)
+    for kind, *args in events:
+        action = actions.get(kind)
+        if action is None:
+            raise ReplayError(f"Unknown event {kind!r}")
+        started = clock()
+        await action(*args)
+        if on_action:
+            on_action(kind, clock() - started)
+    return game
+
+def _resumed(events: List[Event]) -> List[Event]:
+    """The events a restored game actually built on: a `restore` event
+    drops whatever was logged after the snapshot it resumed from."""
+    live = [True] * len(events)
+    for i, event in enumerate(events):
+        if event[0] == "restore":
+            at = event[1]["events"]
+            if not 0 < at <= i:
+                raise ReplayError(f"Restore at line {i + 1} resumes from line {at}")
+            for j in range(at, i + 1):
+                live[j] = False
+    return [e for e, keep in zip(events, live) if keep]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Replay logged games through the engine and time each action.")
+    p.add_argument('logs', nargs='+', help="event log files (JSON lines)")
+    p.add_argument('--repeat', type=int, default=1, help="replay every log this many times")
+    p.add_argument('--data', default=None, help="card data glob, defaults to the bot's data/ directory")
+    args = p.parse_args(argv)
+
+    repo = CardRepository(args.data) if args.data else get_shared_repository()
+    logs = [list(read_events(path)) for path in args.logs]
+    stats = SimulationStats()
+
+    def record(kind: str, seconds: float) -> None:
+        stats.record(kind, seconds)
+        if kind == "skip":
+            stats.skips += 1
+
+    async def run() -> None:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for events in logs:
+                game = await replay(events, repo, on_action=record)
+                stats.games += 1
+                stats.rounds += sum(p.score for p in game.state.players)
+        stats.seconds = time.perf_counter() - started
+
+    asyncio.run(run())
+    print(stats.report())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
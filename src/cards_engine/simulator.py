@@ -0,0 +1,231 @@
+# simulator.py
+"""Headless game simulator and engine throughput benchmark.
+
+Plays full games with bot players straight through `Game`/`GameEngine`
+(no Discord involved) and reports throughput, per-action latency
+percentiles and peak memory:
+
+    python -m cards_engine.simulator --games 2000 --draft-ratio 0.3
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import resource
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .game            import Game
+from .game_config     import GameConfig, hand_size_min, hand_size_max, max_players_min, max_players_max
+from .game_phases     import Phase
+from .card_repository import CardRepository, get_shared_repository
+from .player          import Player
+
+PERCENTILES = (50, 90, 99)
+
+@dataclass
+class SimulationStats:
+    games:   int   = 0
+    rounds:  int   = 0
+    skips:   int   = 0
+    seconds: float = 0.0
+    peak_memory_kb: int = 0
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+
+    def record(self, action: str, seconds: float) -> None:
+        self.latencies[action].append(seconds)
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+    @property
+    def rounds_per_sec(self) -> float:
+        return self.rounds / self.seconds if self.seconds else 0.0
+
+    def percentiles(self, action: str) -> Dict[str, float]:
+        """Latency percentiles for one action, in microseconds."""
+        samples = sorted(self.latencies[action])
+        if not samples:
+            return {}
+        out = {f"p{p}": samples[min(len(samples) - 1, len(samples) * p // 100)] * 1e6
+               for p in PERCENTILES}
+        out["max"] = samples[-1] * 1e6
+        return out
+
+    def report(self) -> str:
+        lines = [
+            f"games: {self.games}  rounds: {self.rounds}  skips: {self.skips}  "
+            f"time: {self.seconds:.2f}s",
+            f"games/sec: {self.games_per_sec:.1f}  rounds/sec: {self.rounds_per_sec:.1f}  "
+            f"peak memory: {self.peak_memory_kb} KB",
+            "",
+            f"{'ACTION':12}  {'count':>8}" + "".join(f"  {'p' + str(p) + ' us':>9}" for p in PERCENTILES)
+            + f"  {'max us':>9}",
+        ]
+        for action in sorted(self.latencies):
+            pct = self.percentiles(action)
+            lines.append(
+                f"{action:12}  {len(self.latencies[action]):>8}"
+                + "".join(f"  {pct[f'p{p}']:>9.1f}" for p in PERCENTILES)
+                + f"  {pct['max']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+
+def random_config(repo: CardRepository, rng: random.Random, draft_mode: bool,
+                  num_players: int) -> Optional[GameConfig]:
+    """A random, playable setup for `num_players`, or None if the random
+    expansion pick does not have enough cards."""
+    expansions = repo.available_expansions()
+    picked = rng.sample(expansions, k=rng.randint(1, len(expansions)))
+    regions = {r: True for r in repo.available_regions()}
+    hand_size = rng.randint(hand_size_min, min(hand_size_max, 10))
+    min_blanks = rng.randint(1, 2)
+    max_blanks = rng.randint(min_blanks, 3)
+
+    whites = repo.filter_ids(card_type="response", regions=regions, expansions=picked)
+    blacks = repo.filter_ids(card_type="prompt", regions=regions, expansions=picked,
+                             min_pick=min_blanks, max_pick=max_blanks)
+    if not blacks or len(whites) < num_players * hand_size:
+        return None
+    return GameConfig(
+        expansions  = picked,
+        regions     = regions,
+        draft_mode  = draft_mode,
+        hand_size   = hand_size,
+        score_limit = rng.randint(3, 8),
+        min_blanks  = min_blanks,
+        max_blanks  = max_blanks,
+        max_players = max_players_max,
+        seed        = rng.randrange(2**32),
+    )
+
+async def play_game(repo: CardRepository, config: GameConfig, num_players: int,
+                    rng: random.Random, stats: SimulationStats,
+                    skip_chance: float = 0.02, max_rounds: int = 500,
+                    setup: Optional[Callable[[Game], None]] = None) -> None:
+    """Plays one game to its score limit with random bot decisions.
+    `setup` can attach listeners to the game before it starts."""
+    clock = time.perf_counter
+    players = [Player(id=str(1000 + i), name=f"Bot{i}") for i in range(num_players)]
+    game = Game(players, config, repo)
+    if setup:
+        setup(game)
+
+    started = clock()
+    await game.start()
+    stats.record("start", clock() - started)
+
+    state = game.state
+    while state.phase is Phase.DRAFT_PICKING:
+        for p in list(state.players):
+            queue = state.draft_queues[p.id]
+            started = clock()
+            await game.draft_pick(p.id, rng.randrange(len(queue)))
+            stats.record("draft_pick", clock() - started)
+            if state.phase is not Phase.DRAFT_PICKING:
+                break
+
+    rounds = 0
+    while state.phase is Phase.SUBMISSIONS and rounds < max_rounds:
+        judge = state.current_judge
+        if rng.random() < skip_chance:
+            started = clock()
+            await game.skip(judge.id)
+            stats.record("skip", clock() - started)
+            stats.skips += 1
+            continue
+
+        pick = state.current_prompt.pick
+        for p in state.players:
+            if p is judge:
+                continue
+            if len(p.hand) < pick:
+                # cards are all tied up in hands; let the judge move on
+                break
+            started = clock()
+            await game.submit(p.id, rng.sample(range(len(p.hand)), k=pick))
+            stats.record("submit", clock() - started)
+        if state.phase is not Phase.JUDGING:
+            started = clock()
+            await game.skip(judge.id)
+            stats.record("skip", clock() - started)
+            stats.skips += 1
+            continue
+
+        winner_id = rng.choice(list(state.submissions))
+        started = clock()
+        await game.judge(winner_id)
+        stats.record("judge", clock() - started)
+        rounds += 1
+
+    stats.rounds += rounds
+    stats.games += 1
+
+async def run_simulation(repo: CardRepository, games: int, rng: random.Random,
+                         draft_ratio: float = 0.25, min_players: int = max_players_min,
+                         max_players: int = max_players_max,
+                         trace_memory: bool = False) -> SimulationStats:
+    stats = SimulationStats()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    attempts = 0
+    while stats.games < games:
+        attempts += 1
+        if attempts > games * 20:
+            raise RuntimeError("Could not find playable setups; is the card data too small?")
+        num_players = rng.randint(min_players, max_players)
+        config = random_config(repo, rng, rng.random() < draft_ratio, num_players)
+        if config is None:
+            continue
+        await play_game(repo, config, num_players, rng, stats)
+    stats.seconds = time.perf_counter() - started
+    if trace_memory:
+        stats.peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    else:
+        stats.peak_memory_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Play many headless games and report engine throughput.")
+    p.add_argument('-n', '--games', type=int, default=1000)
+    p.add_argument('--draft-ratio', type=float, default=0.25,
+                   help="fraction of games played in draft mode")
+    p.add_argument('--min-players', type=int, default=max_players_min)
+    p.add_argument('--max-players', type=int, default=max_players_max)
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--data', default=None, help="card data glob, defaults to the bot's data/ directory")
+    p.add_argument('--tracemalloc', action='store_true',
+                   help="report Python heap peak instead of process RSS (slower)")
+    p.add_argument('--fail-below', type=float, default=None, metavar="GAMES_PER_SEC",
+                   help="exit with status 1 when throughput drops below this")
+    args = p.parse_args(argv)
+
+    repo = CardRepository(args.data) if args.data else get_shared_repository()
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    # each game's config gets its seed from this, so one seed fixes the run
+    rng = random.Random(seed)
+
+    stats = asyncio.run(run_simulation(
+        repo, args.games, rng,
+        draft_ratio  = args.draft_ratio,
+        min_players  = args.min_players,
+        max_players  = args.max_players,
+        trace_memory = args.tracemalloc,
+    ))
+    print(f"seed: {seed}")
+    print(stats.report())
+    if args.fail_below is not None and stats.games_per_sec < args.fail_below:
+        print(f"FAIL: {stats.games_per_sec:.1f} games/sec is below {args.fail_below}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
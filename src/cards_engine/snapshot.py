@@ -0,0 +1,175 @@
+# snapshot.py
+"""Compact, restorable snapshots of a running game.
+
+Cards are stored by id (their position in the repository) and decks by
+their draw state, so a snapshot is a few hundred bytes of JSON no matter
+how large the card pool is.  Ids are only meaningful against the same card
+data, so every snapshot carries the repository's fingerprint and refuses
+to restore against anything else.
+"""
+
+import os
+import json
+from typing      import Any, Dict, List, Optional, Sequence
+
+from .card            import Card
+from .card_repository import CardRepository
+from .event_log       import FileEventLog
+from .game            import Game
+from .game_config     import GameConfig
+from .game_phases     import Phase
+from .game_state      import GameState
+from .player          import Player
+
+SNAPSHOT_VERSION = 1
+
+class SnapshotError(ValueError):
+    """The snapshot cannot be restored against this repository."""
+
+def _ids(cards: List[Card]) -> List[int]:
+    return [c.card_id for c in cards]
+
+def player_view(player: Player) -> List[Any]:
+    return [player.id, player.name, player.score, _ids(player.hand)]
+
+def _draft_view(state: GameState) -> Dict[str, Any]:
+    return {
+        "queues":     {pid: _ids(cards) for pid, cards in state.draft_queues.items()},
+        "kept":       {pid: _ids(cards) for pid, cards in state.draft_kept.items()},
+        "pass_index": state.draft_pass_index,
+        "direction":  state.draft_direction,
+        "picks":      state.draft_round_picks,
+    }
+
+_VIEW_PARTS = {
+    "players":      lambda state: [player_view(p) for p in state.players],
+    "phase":        lambda state: state.phase.name,
+    "score_limit":  lambda state: state.score_limit,
+    "hand_size":    lambda state: state.hand_size,
+    "judge_index":  lambda state: state.judge_index,
+    "round":        lambda state: state.round_number,
+    "prompt":       lambda state: state.current_prompt.card_id if state.current_prompt else None,
+    "submissions":  lambda state: {pid: _ids(cards) for pid, cards in state.submissions.items()},
+    "reveal_order": lambda state: [pid for pid, _ in state.submissions_shuffled],
+    "last_round":   lambda state: [state.last_round_selected_id, _ids(state.last_round_selected_cards)],
+    "draft":        _draft_view,
+}
+
+def state_view(state: GameState, keys: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """The part of a snapshot the bot renders from: players, hands,
+    submissions and phase, without the decks.  `keys` builds only those
+    parts of it."""
+    return {key: _VIEW_PARTS[key](state) for key in (keys or _VIEW_PARTS)}
+
+def resume_state(game: Game) -> Dict[str, Any]:
+    """The rest of a snapshot: what only matters to carry the game on."""
+    return {
+        # how far the decks are into the seed's draw order, so play after
+        # a restore stays what the seed and the event log replay
+        "rng":         game.rng.words,
+        "log":         game.log_position(),
+        "black_deck":  game.state.black_deck.snapshot(),
+        "white_deck":  game.state.white_deck.snapshot(),
+    }
+
+def snapshot_game(game: Game) -> Dict[str, Any]:
+    return {
+        "v":           SNAPSHOT_VERSION,
+        "cards":       game.repo.fingerprint,
+        "channel_id":  game.channel_id,
+        "host_id":     game.host_id,
+        "seed":        game.seed,
+        "config":      game.config.to_dict(),
+        **state_view(game.state),
+        **resume_state(game),
+    }
+
+def apply_view(state: GameState, view: Dict[str, Any], repo: CardRepository) -> None:
+    """Patches `state` in place from a `state_view`, or from any subset of
+    its keys.  `players` may hold only the players that changed; `seats`,
+    if given, is every player id in seating order.  Players not seen
+    before are seated after the others."""
+    card = repo.card
+    def cards(ids: List[int]) -> List[Card]:
+        return [card(i) for i in ids]
+
+    if "players" in view or "seats" in view:
+        by_id = {p.id: p for p in state.players}
+        for pid, name, score, hand in view.get("players", ()):
+            player = by_id.get(pid)
+            if player is None:
+                player = by_id[pid] = Player(id=pid, name=name)
+                state.players.append(player)
+            player.score, player.hand = score, cards(hand)
+        if "seats" in view:
+            state.players[:] = [by_id[pid] for pid in view["seats"]]
+    if "phase" in view:
+        state.phase = Phase[view["phase"]]
+    for key, attr in (("score_limit", "score_limit"), ("hand_size", "hand_size"),
+                      ("judge_index", "judge_index"), ("round", "round_number")):
+        if key in view:
+            setattr(state, attr, view[key])
+    if "prompt" in view:
+        state.current_prompt = card(view["prompt"]) if view["prompt"] is not None else None
+    if "submissions" in view or "reveal_order" in view:
+        if "submissions" in view:
+            state.submissions = {pid: cards(ids) for pid, ids in view["submissions"].items()}
+        order = view.get("reveal_order", [pid for pid, _ in state.submissions_shuffled])
+        state.submissions_shuffled = [(pid, state.submissions[pid]) for pid in order]
+    if "last_round" in view:
+        last_id, last_cards = view["last_round"]
+        state.last_round_selected_id = last_id
+        state.last_round_selected_cards = cards(last_cards)
+    if "draft" in view:
+        draft = view["draft"]
+        state.draft_queues      = {pid: cards(ids) for pid, ids in draft["queues"].items()}
+        state.draft_kept        = {pid: cards(ids) for pid, ids in draft["kept"].items()}
+        state.draft_pass_index  = draft["pass_index"]
+        state.draft_direction   = draft["direction"]
+        state.draft_round_picks = draft["picks"]
+    state.reindex_players()
+
+def apply_resume_state(game: Game, data: Dict[str, Any]) -> None:
+    """Sets the RNG and decks of a started `game` from `resume_state` output."""
+    if data.get("rng") is not None:
+        game.rng.seek(data["rng"])
+    game.state.black_deck = game.repo.restore_deck(data["black_deck"], rng=game.rng,
+                                                   **game.deck_filter("prompt"))
+    game.state.white_deck = game.repo.restore_deck(data["white_deck"], rng=game.rng,
+                                                   **game.deck_filter("response"))
+
+def restore_game(data: Dict[str, Any], repo: CardRepository, resume_log: bool = False) -> Game:
+    """Rebuilds a started `Game` (with no phase listeners) from
+    `snapshot_game` output.  With `resume_log` the game goes on writing
+    to its event log file, after a `restore` event, if the file is still
+    there."""
+    if data.get("v") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {data.get('v')}")
+    if data["cards"] != repo.fingerprint:
+        raise SnapshotError("Snapshot was taken against different card data")
+
+    game = Game([], GameConfig(**data["config"]), repo,
+                host_id=data["host_id"], channel_id=data["channel_id"], seed=data["seed"])
+    game.state = GameState(players=game.players, score_limit=data["score_limit"])
+    apply_resume_state(game, data)
+    apply_view(game.state, data, repo)
+    if resume_log:
+        game.event_log = resume_event_log(data)
+    return game
+
+def resume_event_log(data: Dict[str, Any]) -> Optional[FileEventLog]:
+    """Reopens the event log a snapshot was taken against and records the
+    restore in it; None if the game had no log or the file is gone."""
+    position = data.get("log")
+    if not position or not os.path.exists(position[0]):
+        return None
+    path, events = position
+    event_log = FileEventLog(path)
+    event_log.append(["restore", {"events": events}])
+    return event_log
+
+def dumps(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def loads(blob: bytes) -> Dict[str, Any]:
+    return json.loads(blob)
@@ -0,0 +1,272 @@
+# tournament.py
+"""Many tables from one registration.
+
+A `Tournament` seats its entrants at tables of `min_table`..`max_table`
+players, one `Game` per table channel, and plays a fixed number of rounds.
+Results come in through an inline phase listener on every table: when a
+table finishes, each player still seated there scores one point for every
+opponent at the table they finished ahead of, and the rounds they won go
+in as the tie-break.
+
+`Standings` keeps the entrants sorted as results arrive, moving only the
+players of the table that just finished, so reading the leaders costs the
+same with ten tables as with one.
+
+Players who drop leave their table at once (`Game.leave`).  A table left
+with fewer than `min_table` players is closed early (`Game.end`) and scored
+as it stands.  Every round is seated afresh from the players still in, in
+tables of balanced size; from the second round on players sit with others
+of similar standing.
+"""
+
+import asyncio
+import random
+import secrets
+from bisect      import bisect_left, insort
+from dataclasses import dataclass, replace
+from typing      import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .card_repository import CardRepository
+from .game            import Game
+from .game_config     import GameConfig, max_players_min
+from .game_phases     import Phase
+from .player          import Player
+
+# (players, config, channel_id, seed) -> a Game that has not started yet
+TableFactory = Callable[[List[Player], GameConfig, int, int], Game]
+
+@dataclass
+class Entrant:
+    id:         str
+    name:       str
+    points:     int = 0
+    rounds_won: int = 0
+    tables:     int = 0      # tables finished
+    dropped:    bool = False
+
+    @property
+    def key(self) -> Tuple[int, int, str]:
+        """Sort key: most points, then most rounds won; id breaks ties."""
+        return (-self.points, -self.rounds_won, self.id)
+
+class Standings:
+    """Entrants in standing order, updated one result at a time."""
+
+    def __init__(self, entrants: Dict[str, Entrant]) -> None:
+        self.entrants = entrants
+        self._keys: List[Tuple[int, int, str]] = sorted(e.key for e in entrants.values())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def record(self, entrant: Entrant, points: int, rounds_won: int) -> None:
+        del self._keys[bisect_left(self._keys, entrant.key)]
+        entrant.points += points
+        entrant.rounds_won += rounds_won
+        insort(self._keys, entrant.key)
+
+    def rank(self, entrant: Entrant) -> int:
+        """Competition rank: one more than the entrants strictly ahead."""
+        return bisect_left(self._keys, entrant.key[:2]) + 1
+
+    def ordered(self) -> Iterator[Entrant]:
+        return (self.entrants[key[2]] for key in self._keys)
+
+    def top(self, count: Optional[int] = None) -> List[Tuple[int, Entrant]]:
+        """`(rank, entrant)` for the first `count` entrants, all by default."""
+        keys = self._keys if count is None else self._keys[:count]
+        ranked, rank, prev = [], 0, None
+        for i, key in enumerate(keys):
+            if key[:2] != prev:
+                rank, prev = i + 1, key[:2]
+            ranked.append((rank, self.entrants[key[2]]))
+        return ranked
+
+@dataclass
+class Table:
+    channel_id: int
+    game:       Game
+    seats:      List[str]            # entrant ids seated when the round began
+    done:       bool = False
+
+class Tournament:
+    def __init__(self,
+                 players:      Sequence[Player],
+                 config:       GameConfig,
+                 channel_ids:  Sequence[int],
+                 repository:   CardRepository,
+                 rounds:       int = 3,
+                 min_table:    int = max_players_min,
+                 max_table:    Optional[int] = None,
+                 seed:         Optional[int] = None,
+                 table_factory: Optional[TableFactory] = None) -> None:
+        max_table = max_table or config.max_players
+        if min_table < 2 or max_table < min_table:
+            raise ValueError(f"Invalid table size {min_table}..{max_table}")
+        if len(players) < min_table:
+            raise ValueError(f"Need at least {min_table} players, got {len(players)}.")
+        if len(set(channel_ids)) != len(channel_ids):
+            raise ValueError("Table channels must be distinct.")
+        if len(channel_ids) * max_table < len(players):
+            raise ValueError(
+                f"{len(channel_ids)} tables of {max_table} cannot seat {len(players)} players."
+            )
+
+        # drafting passes packs around a fixed circle of seats, which a
+        # player dropping out would break
+        self.config = replace(config, draft_mode=False, seed=None)
+        self.channel_ids = list(channel_ids)
+        self.repo = repository
+        self.rounds = rounds
+        self.min_table = min_table
+        self.max_table = max_table
+        self.seed = seed if seed is not None else secrets.randbits(32)
+        self.rng = random.Random(self.seed)
+        self.table_factory = table_factory or self._local_table
+
+        self.entrants: Dict[str, Entrant] = {}
+        for p in players:
+            if str(p.id) in self.entrants:
+                raise ValueError(f"Player {p.id} is registered twice.")
+            self.entrants[str(p.id)] = Entrant(id=str(p.id), name=p.name)
+        self.standings = Standings(self.entrants)
+
+        self.round = 0
+        self.tables: Dict[int, Table] = {}        # channel_id → this round's table
+        self._seat_of: Dict[str, Table] = {}      # entrant id → this round's table
+        self._open = 0
+        self._round_done: Optional[asyncio.Event] = None
+
+    def _local_table(self, players: List[Player], config: GameConfig,
+                     channel_id: int, seed: int) -> Game:
+        return Game(players, config, self.repo, channel_id=channel_id, seed=seed)
+
+    # ─── Entrants ───────────────────────────────────────────────
+
+    @property
+    def active(self) -> List[Entrant]:
+        """Entrants still in, in standing order."""
+        return [e for e in self.standings.ordered() if not e.dropped]
+
+    @property
+    def finished(self) -> bool:
+        return self._open == 0 and (self.round >= self.rounds or len(self.active) < self.min_table)
+
+    def table_of(self, player_id: str) -> Optional[Table]:
+        """The table the player sits at this round, if it is still playing."""
+        table = self._seat_of.get(str(player_id))
+        return table if table is not None and not table.done else None
+
+    async def drop(self, player_id: str) -> Optional[Table]:
+        """Drops a player for the rest of the tournament; their points so far
+        stand.  Returns the running table they left, if any."""
+        entrant = self.entrants.get(str(player_id))
+        if entrant is None:
+            raise ValueError(f"Player {player_id} is not registered.")
+        if entrant.dropped:
+            return None
+        entrant.dropped = True
+        table = self.table_of(entrant.id)
+        if table is None:
+            return None
+        await table.game.leave(entrant.id)
+        if not table.done and len(table.game.state.players) < self.min_table:
+            await table.game.end()
+        return table
+
+    async def close_table(self, channel_id: int) -> None:
+        """Ends a running table early; it is scored as it stands."""
+        table = self.tables.get(channel_id)
+        if table is not None and not table.done:
+            await table.game.end()
+
+    def abandon_table(self, channel_id: int) -> None:
+        """Scores a running table as it stands without touching its game,
+        for games that were shut down from outside."""
+        table = self.tables.get(channel_id)
+        if table is not None:
+            self._score_table(table)
+
+    # ─── Rounds ─────────────────────────────────────────────────
+
+    def seat(self) -> List[List[Entrant]]:
+        """Splits the active entrants into tables for the next round.
+
+        Uses as few tables as fit in `max_table` seats each (more only if
+        there are not enough channels) and evens their sizes out; if
+        keeping every table at `min_table` needs fewer tables, some run
+        over `max_table` instead of leaving players out."""
+        players = self.active
+        n = len(players)
+        if n < self.min_table:
+            raise RuntimeError(f"Only {n} players left, need {self.min_table} for a table.")
+        if self.round == 0:
+            self.rng.shuffle(players)
+        count = min(-(-n // self.max_table), len(self.channel_ids), n // self.min_table)
+        size, extra = divmod(n, count)
+        tables, start = [], 0
+        for t in range(count):
+            end = start + size + (t < extra)
+            tables.append(players[start:end])
+            start = end
+        return tables
+
+    async def start_round(self) -> List[Table]:
+        """Seats and starts the next round's tables."""
+        if self._open:
+            raise RuntimeError(f"Round {self.round} is still being played.")
+        if self.round >= self.rounds:
+            raise RuntimeError("The tournament is over.")
+        seating = self.seat()
+        self.round += 1
+        self.tables = {}
+        self._seat_of = {}
+        self._round_done = asyncio.Event()
+        for channel_id, entrants in zip(self.channel_ids, seating):
+            game = self.table_factory(
+                [Player(id=e.id, name=e.name) for e in entrants],
+                self.config, channel_id, self.rng.randrange(2**32)
+            )
+            game.add_phase_listener(self._on_phase)
+            table = Table(channel_id=channel_id, game=game, seats=[e.id for e in entrants])
+            self.tables[channel_id] = table
+            for e in entrants:
+                self._seat_of[e.id] = table
+        self._open = len(self.tables)
+        for table in list(self.tables.values()):
+            await table.game.start()
+        return list(self.tables.values())
+
+    async def wait_round(self) -> None:
+        """Returns once every table of the current round has finished."""
+        if self._round_done is not None:
+            await self._round_done.wait()
+
+    def _on_phase(self, game: Game, old_phase: Phase, new_phase: Phase) -> None:
+        if new_phase is Phase.FINISHED:
+            table = self.tables.get(game.channel_id)
+            if table is not None and table.game is game:
+                self._score_table(table)
+
+    def _score_table(self, table: Table) -> None:
+        if table.done:
+            return
+        table.done = True
+        players = table.game.state.players
+        scores = sorted(p.score for p in players)
+        for p in players:
+            entrant = self.entrants[str(p.id)]
+            entrant.tables += 1
+            # opponents with a lower score than this player's
+            self.standings.record(entrant, bisect_left(scores, p.score), p.score)
+        self._open -= 1
+        if self._open == 0:
+            self._round_done.set()
+
+    async def play(self, run_table: Callable[[Table], Awaitable[None]]) -> None:
+        """Plays every round, running `run_table(table)` for each table and
+        waiting for the round to finish before seating the next."""
+        while not self.finished:
+            tables = await self.start_round()
+            await asyncio.gather(*(run_table(t) for t in tables if not t.done))
+            await self.wait_round()
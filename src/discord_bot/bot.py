@@ -1,16 +1,48 @@
+import asyncio
+import logging
 from discord.ext import commands
-from discord_bot.config import TOKEN, intents
-from discord_bot.services.game_manager import set_bot
+from discord_bot.config import TOKEN, intents, SHARDED, SHARD_COUNT, SHARD_IDS, DEBUG_GUILDS
+from discord_bot.services.game_manager import set_bot, restore_games, close_workers, start_sweeper
+from discord_bot.services.state_manager import get_repository
+from discord_bot.services import tournament_manager
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+def make_bot() -> commands.Bot:
+    options = dict(command_prefix="!", intents=intents, debug_guilds=DEBUG_GUILDS)
+    if not SHARDED:
+        return commands.Bot(**options)
+    if SHARD_IDS and SHARD_COUNT is None:
+        raise SystemExit("CAB_SHARD_IDS needs a fixed shard count in CAB_SHARDS")
+    return commands.AutoShardedBot(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **options)
+
+bot = make_bot()
 
 @bot.event
 async def on_ready():
     user_id = bot.user.id if bot.user else "Unknown"
     print(f"Bot is ready. User ID: {user_id}")
+    # load the card data off the event loop so the gateway stays responsive
+    repo = await asyncio.to_thread(get_repository)
+    print(f"Card repository ready ({len(repo)} cards in {repo.load_seconds:.2f}s)")
+    restored = await restore_games()
+    if restored:
+        print(f"Restored {restored} running game(s)")
+    start_sweeper()
+
+@bot.event
+async def on_shard_ready(shard_id: int):
+    print(f"Shard {shard_id} is ready")
+
+@bot.event
+async def on_shard_disconnect(shard_id: int):
+    print(f"Shard {shard_id} disconnected")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s")
     for cog in ["discord_bot.cogs.game_cog"]:
         bot.load_extension(cog)
     set_bot(bot)
-    bot.run(TOKEN)
\ No newline at end of file
+    tournament_manager.set_bot(bot)
+    try:
+        bot.run(TOKEN)
+    finally:
+        close_workers()
\ No newline at end of file
@@ -1,20 +1,18 @@
 import discord
 from discord.ext import commands
 import asyncio
-from discord_bot.services.state_manager import get_game, remove_game
+from discord_bot.services.state_manager import get_game, get_lobby, remove_game, attach_view, registry_metrics, RegistryFullError
 from discord_bot.services.game_manager  import create_lobby
+from discord_bot.services.outbound      import post, Priority
+from discord_bot.services.shards        import shard_for_guild, shard_health, format_health
 from discord_bot.services.game_flow     import handle_play, handle_judge, handle_draft, handle_stop, handle_skip, handle_join
+from discord_bot.services.component_router import dispatch_component
+from discord_bot.services.tournament_manager import (
+    open_tournament, begin_tournament, drop_player, stop_tournament, get_tournament, tournament_host,
+    parse_channels, format_standings)
 from discord_bot.views.setup_view       import SetupView
 from discord_bot.views.join_view        import JoinView
-from discord_bot.views.draft_view       import DraftView
-from discord_bot.views.play_view        import PlayView
-from discord_bot.views.judge_view       import JudgeView
-from cards_engine.game_phases           import Phase
 from cards_engine.player                import Player
-from cards_engine.game                  import Game
-from discord_bot.views.judge_button_view import JudgeButtonView
-
-guild_ids_master = [1075249749357252680, 1167164629844234270, 972953179710963762]
 
 class GameCog(commands.Cog):
     def __init__(self, bot):
@@ -33,34 +31,41 @@ class GameCog(commands.Cog):
             )
             return None
 
-        lobby = create_lobby(
-            channel_id=ctx.channel_id,
-            host_id=str(ctx.author.id),
-            host_name=ctx.author.display_name
-        )
+        try:
+            lobby = create_lobby(
+                channel_id=ctx.channel_id,
+                host_id=str(ctx.author.id),
+                host_name=ctx.author.display_name,
+                shard_id=shard_for_guild(ctx.guild_id, self.bot.shard_count or 1)
+            )
+        except RegistryFullError:
+            await ctx.respond(
+                "❌ Bubba is hosting too many games right now. Try again in a little while!",
+                ephemeral=True
+            )
+            return None
 
         player_host = Player(id=str(ctx.author.id), name=ctx.author.display_name)
         lobby.players.append(player_host)
 
-        async def on_join_button(interaction: discord.Interaction):
-            """Handle the join button click."""
-            await handle_join(interaction)
-
-        view_join = JoinView(lobby, on_join_button=on_join_button)
-        join_message = await ctx.channel.send(
-            f"👋 {ctx.author.display_name} started a new game of Cards Against Bubba! Join with `/join` or by clicking the button!",
-            view=view_join,
-        )
-        await asyncio.sleep(1)
-        lobby.join_message_id = join_message.id
-
-        view_setup = SetupView(ctx.channel_id, bot=self.bot)
+        # answer the interaction first: it must be acknowledged within 3s,
+        # while the channel post may have to wait for the rate limiter
+        view_setup = attach_view(ctx.channel_id, SetupView(ctx.channel_id, bot=self.bot))
         await ctx.respond(
             content="CONFIGURATION: Please configure which packs and regions to enable, as well as other game settings.",
             view=view_setup,
             ephemeral=True
         )
 
+        view_join = JoinView(lobby, ctx.channel_id)
+        join_message = await post(
+            ctx.channel,
+            f"👋 {ctx.author.display_name} started a new game of Cards Against Bubba! Join with `/join` or by clicking the button!",
+            view=view_join,
+            priority=Priority.INTERACTIVE,
+        )
+        lobby.join_message_id = join_message.id
+
     @commands.slash_command(
             name="join",
             description="Join the current game of Cards Against Bubba",
@@ -88,40 +93,117 @@ class GameCog(commands.Cog):
         description="Select cards to play as a response to the current prompt",
     )
     async def play(self, ctx: discord.ApplicationContext):
-        await handle_play(ctx, get_game(ctx.channel_id), bot=self.bot)
+        await handle_play(ctx, get_game(ctx.channel_id))
 
     @commands.slash_command(
         name="judge",
         description="Select the best response as the judge",
     )
     async def judge(self, ctx: discord.ApplicationContext):
-        async def on_judge_pick(game, player_id):
-            await self.on_judge_pick(ctx.channel_id, player_id)
-        await handle_judge(ctx, game=get_game(ctx.channel_id), on_judge_pick=on_judge_pick)
+        await handle_judge(ctx, game=get_game(ctx.channel_id))
 
     @commands.slash_command(
         name="skip",
         description="Discards the current prompt and moves to the next one.",
     )
     async def skip(self, ctx: discord.ApplicationContext):
-        await handle_skip(ctx, bot=self.bot, game=get_game(ctx.channel_id))
-
-    async def on_judge_pick(self, channel_id: int, player_id: str):
-        game = get_game(channel_id)
-        await game.judge(player_id)
-
-    async def on_button_view_judge(self, interaction: discord.Interaction, game: Game):
-        """Create a view for the judge button."""
-        if str(interaction.user.id) != str(game.state.current_judge.id):
-            await interaction.response.send_message("Only the judge can judge this round!", ephemeral=True)
-            return
-        # Build the actual judge view
-        view = JudgeView(game, judge_id=game.state.current_judge.id, on_judge_pick=self.on_judge_pick)
-        await interaction.response.send_message(
-            "Select the best response:",
-            view=view,
+        await handle_skip(ctx, game=get_game(ctx.channel_id))
+
+    @commands.slash_command(
+        name="shards",
+        description="Show connection latency and load for each of the bot's shards",
+    )
+    async def shards(self, ctx: discord.ApplicationContext):
+        m = registry_metrics()
+        await ctx.respond(
+            f"{format_health(shard_health(self.bot))}\n"
+            f"Open: {m['games']} games, {m['lobbies']} lobbies (limit {m['capacity']}), "
+            f"{m['views']} live views, {m['rss_bytes'] / 2**20:.0f} MiB resident",
+            ephemeral=True
+        )
+
+    # ─── Tournaments ────────────────────────────────────────────
+
+    tournament = discord.SlashCommandGroup("tournament", "Play many tables at once from one sign-up")
+
+    @tournament.command(name="open", description="Open tournament sign-ups in this channel")
+    async def tournament_open(self, ctx: discord.ApplicationContext):
+        if get_game(ctx.channel_id) or get_tournament(ctx.channel_id):
+            await ctx.respond("❌ This channel is already busy with a game or tournament.", ephemeral=True)
+            return None
+        try:
+            lobby = open_tournament(
+                channel_id=ctx.channel_id,
+                host_id=str(ctx.author.id),
+                host_name=ctx.author.display_name,
+                shard_id=shard_for_guild(ctx.guild_id, self.bot.shard_count or 1)
+            )
+        except RegistryFullError:
+            await ctx.respond(
+                "❌ Bubba is hosting too many games right now. Try again in a little while!",
+                ephemeral=True
+            )
+            return None
+
+        await ctx.respond("Sign-ups are open. Use `/tournament begin` once everyone is in.", ephemeral=True)
+        join_message = await post(
+            ctx.channel,
+            f"🏟️ {ctx.author.display_name} is running a Cards Against Bubba tournament! Join with `/join` or by clicking the button!",
+            view=JoinView(lobby, ctx.channel_id),
+            priority=Priority.INTERACTIVE,
+        )
+        lobby.join_message_id = join_message.id
+
+    @tournament.command(name="begin", description="Close sign-ups and seat the first round")
+    async def tournament_begin(
+        self, ctx: discord.ApplicationContext,
+        tables: discord.Option(str, "Channels to play the tables in, e.g. #table-1 #table-2"),
+        rounds: discord.Option(int, "How many rounds to play", min_value=1, max_value=10, default=3),
+    ):
+        lobby = get_lobby(ctx.channel_id)
+        if lobby is not None and str(ctx.author.id) != str(lobby.host.id):
+            await ctx.respond("❌ WHO do you think YOU are? The host?", ephemeral=True)
+            return None
+        try:
+            tournament = await begin_tournament(ctx.channel_id, parse_channels(tables), rounds)
+        except ValueError as e:
+            await ctx.respond(f"❌ {e}", ephemeral=True)
+            return None
+        await ctx.respond(
+            f"🏟️ The tournament is on: {len(tournament.entrants)} players, {rounds} rounds.",
+        )
+
+    @tournament.command(name="standings", description="Show the tournament standings")
+    async def tournament_standings(self, ctx: discord.ApplicationContext):
+        tournament = get_tournament(ctx.channel_id)
+        if tournament is None:
+            await ctx.respond("There is no tournament running here.", ephemeral=True)
+            return None
+        await ctx.respond(
+            f"📊 **Standings, round {tournament.round} of {tournament.rounds}**\n{format_standings(tournament)}",
             ephemeral=True
         )
 
+    @tournament.command(name="drop", description="Leave the tournament for good")
+    async def tournament_drop(self, ctx: discord.ApplicationContext):
+        if not await drop_player(ctx.channel_id, str(ctx.author.id)):
+            await ctx.respond("You are not playing in a tournament here.", ephemeral=True)
+            return None
+        await ctx.respond("You have dropped out of the tournament. Thanks for playing!", ephemeral=True)
+
+    @tournament.command(name="stop", description="Stop seating new tournament rounds")
+    async def tournament_stop(self, ctx: discord.ApplicationContext):
+        if str(ctx.author.id) != str(tournament_host(ctx.channel_id)):
+            await ctx.respond("❌ Only the host of a running tournament can stop it.", ephemeral=True)
+            return None
+        stop_tournament(ctx.channel_id)
+        await ctx.respond("🛑 No more rounds will be seated; tables still playing can finish.")
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        """Game buttons and selects are stateless; route them by custom_id."""
+        if interaction.type is discord.InteractionType.component:
+            await dispatch_component(interaction)
+
 def setup(bot):
     bot.add_cog(GameCog(bot))
@@ -2,4 +2,33 @@ import os
 from discord import Intents
 
 TOKEN = os.getenv("CAB_BOT_TOKEN")
+# running games are snapshotted here so they survive a restart
+STATE_DB = os.getenv("CAB_STATE_DB") or os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "games.sqlite3"))
+# one append-only action log per game, replayable with cards_engine.replay;
+# set CAB_EVENT_LOG_DIR to an empty string to turn logging off
+EVENT_LOG_DIR = os.getenv("CAB_EVENT_LOG_DIR", os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "events")))
+# run games in this many worker processes, routed by channel; 0 keeps
+# every game in the bot process
+GAME_WORKERS = int(os.getenv("CAB_GAME_WORKERS", "0"))
+# sharding: CAB_SHARDS=auto lets Discord recommend a shard count, a number
+# fixes it, and unset runs one unsharded connection.  With a fixed count,
+# CAB_SHARD_IDS=0,1 runs only those shards so several processes can split
+# the bot between them
+_shards = os.getenv("CAB_SHARDS", "").strip().lower()
+SHARDED = bool(_shards)
+SHARD_COUNT = int(_shards) if _shards.isdigit() else None
+SHARD_IDS = [int(s) for s in os.getenv("CAB_SHARD_IDS", "").split(",") if s.strip()] or None
+# register slash commands instantly in these guilds instead of globally
+DEBUG_GUILDS = [int(g) for g in os.getenv("CAB_DEBUG_GUILDS", "").split(",") if g.strip()] or None
+# games and lobbies nobody has touched for this many seconds are closed by
+# the idle sweeper, which runs every CAB_SWEEP_INTERVAL seconds
+GAME_IDLE_TTL = float(os.getenv("CAB_GAME_IDLE_TTL", str(6 * 3600)))
+LOBBY_IDLE_TTL = float(os.getenv("CAB_LOBBY_IDLE_TTL", str(30 * 60)))
+SWEEP_INTERVAL = float(os.getenv("CAB_SWEEP_INTERVAL", "60"))
+# at most this many games and lobbies at once; /start refuses beyond it
+MAX_ACTIVE_CHANNELS = int(os.getenv("CAB_MAX_ACTIVE_CHANNELS", "10000"))
+# most players one /tournament registration takes
+TOURNAMENT_MAX_PLAYERS = int(os.getenv("CAB_TOURNAMENT_MAX_PLAYERS", "500"))
 intents = Intents.default()
\ No newline at end of file
@@ -0,0 +1,179 @@
+# discord_bot/fake_discord.py
+"""In-process stand-ins for the few Discord objects the bot touches.
+
+They implement just the surface used by `game_flow`, `game_manager` and
+the views (sending/editing messages, interaction responses, followups,
+`bot.get_channel`), record every outbound API call, and never touch the
+network, so whole games can be driven locally on one event loop.
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+_ids = itertools.count(10_000)
+
+@dataclass
+class ApiCall:
+    """One outbound request the real bot would have made."""
+    kind:       str
+    channel_id: int
+    at:         float = field(default_factory=time.perf_counter)
+
+class FakeUser:
+    def __init__(self, user_id: int, display_name: str):
+        self.id = user_id
+        self.display_name = display_name
+        self.name = display_name
+        self.mention = f"<@{user_id}>"
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", content: Optional[str], view=None,
+                 ephemeral: bool = False):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.view = view
+        self.ephemeral = ephemeral
+        self.deleted = False
+
+    async def edit(self, content: Optional[str] = None, view=None, **_):
+        self.channel.record("edit_message")
+        if content is not None:
+            self.content = content
+        self.view = view
+        self.channel.notify()
+        return self
+
+    async def delete(self, **_):
+        self.channel.record("delete_message")
+        self.deleted = True
+
+class FakeChannel:
+    """A text channel that keeps its messages in memory."""
+
+    def __init__(self, channel_id: int, api_log: Optional[List[ApiCall]] = None):
+        self.id = channel_id
+        self.messages: List[FakeMessage] = []
+        self.api_log = api_log if api_log is not None else []
+        self._changed = asyncio.Condition()
+
+    def record(self, kind: str) -> None:
+        self.api_log.append(ApiCall(kind, self.id))
+
+    def notify(self) -> None:
+        asyncio.get_running_loop().create_task(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def send(self, content: Optional[str] = None, *, view=None, **_) -> FakeMessage:
+        self.record("send_message")
+        msg = FakeMessage(self, content, view)
+        self.messages.append(msg)
+        await self._notify()
+        return msg
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        self.record("fetch_message")
+        for msg in self.messages:
+            if msg.id == message_id:
+                return msg
+        raise LookupError(message_id)
+
+    async def wait_for(self, predicate: Callable[[], Any], timeout: Optional[float] = None):
+        """Waits until `predicate()` is truthy after some message activity
+        and returns its value."""
+        async with self._changed:
+            return await asyncio.wait_for(self._changed.wait_for(predicate), timeout)
+
+    def latest_view(self, view_type: type, after: int = 0):
+        """(index, view) of the newest message at or after `after` whose
+        view is a `view_type`, or None."""
+        for i in range(len(self.messages) - 1, after - 1, -1):
+            view = self.messages[i].view
+            if isinstance(view, view_type):
+                return i, view
+        return None
+
+class FakeResponse:
+    """`Interaction.response`: may be used once."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _use(self, kind: str) -> None:
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to")
+        self._done = True
+        self._interaction.channel.record(kind)
+
+    async def send_message(self, content: Optional[str] = None, *, view=None,
+                           ephemeral: bool = False, **_):
+        self._use("interaction_response")
+        self._interaction.reply(content, view, ephemeral)
+
+    async def edit_message(self, content: Optional[str] = None, *, view=None, **_):
+        self._use("interaction_edit")
+        self._interaction.reply(content, view, True)
+
+    async def defer(self, **_):
+        self._use("interaction_defer")
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, *, view=None, ephemeral: bool = False, **_):
+        self._interaction.channel.record("followup")
+        self._interaction.reply(content, view, ephemeral)
+
+class FakeInteraction:
+    """A component interaction (button click or select) from one user."""
+
+    def __init__(self, user: FakeUser, channel: FakeChannel, data: Optional[Dict] = None):
+        self.id = next(_ids)
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id
+        self.guild_id = None
+        self.data = data or {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.replies: List[FakeMessage] = []
+
+    def reply(self, content: Optional[str], view, ephemeral: bool) -> None:
+        msg = FakeMessage(self.channel, content, view, ephemeral=ephemeral)
+        self.replies.append(msg)
+        if not ephemeral:
+            self.channel.messages.append(msg)
+            self.channel.notify()
+
+    @property
+    def last_view(self):
+        for msg in reversed(self.replies):
+            if msg.view is not None:
+                return msg.view
+        return None
+
+class FakeBot:
+    """Enough of `commands.Bot` for `game_manager.set_bot`."""
+
+    def __init__(self):
+        self.api_log: List[ApiCall] = []
+        self.channels: Dict[int, FakeChannel] = {}
+        self.user = FakeUser(1, "Bubba")
+
+    def add_channel(self, channel_id: int) -> FakeChannel:
+        channel = self.channels[channel_id] = FakeChannel(channel_id, self.api_log)
+        return channel
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.channels.get(channel_id)
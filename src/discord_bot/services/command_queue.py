@@ -0,0 +1,113 @@
+# discord_bot/services/command_queue.py
+"""Per-channel command queues that serialize game mutations.
+
+Every click that changes a game (submit, judge, draft pick, skip) is
+queued on its channel and run one at a time by that channel's worker,
+including the phase listeners the mutation triggers.  Channels never wait
+on each other: each has its own queue, and a worker only exists while its
+queue has work.
+"""
+
+import time
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing      import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+_WAIT_SAMPLES = 1024   # recent wait times kept per channel
+
+@dataclass
+class QueueMetrics:
+    completed: int   = 0
+    failed:    int   = 0
+    max_depth: int   = 0
+    total_wait_seconds: float = 0.0
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=_WAIT_SAMPLES))
+
+    def wait_percentile(self, p: int) -> float:
+        """Seconds a recent command sat queued before it ran."""
+        samples = sorted(self.waits)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, len(samples) * p // 100)]
+
+class ChannelQueue:
+    """The serialized mutations of one channel's game."""
+
+    def __init__(self, channel_id: int) -> None:
+        self.channel_id = channel_id
+        self.metrics = QueueMetrics()
+        self._pending: Deque[Tuple[Callable[..., Awaitable[Any]], tuple, asyncio.Future, float]] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def depth(self) -> int:
+        """Commands waiting or running."""
+        return len(self._pending) + self._running
+
+    async def run(self, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Queues `fn(*args)` behind this channel's earlier commands and
+        returns its result (or raises its exception) once it has run."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((fn, args, future, time.perf_counter()))
+        self.metrics.max_depth = max(self.metrics.max_depth, self.depth)
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain(), name=f"commands-{self.channel_id}")
+        return await future
+
+    async def _drain(self) -> None:
+        metrics = self.metrics
+        try:
+            while self._pending:
+                fn, args, future, queued_at = self._pending.popleft()
+                if future.cancelled():
+                    continue
+                waited = time.perf_counter() - queued_at
+                metrics.waits.append(waited)
+                metrics.total_wait_seconds += waited
+                self._running = True
+                try:
+                    result = await fn(*args)
+                except Exception as e:
+                    metrics.failed += 1
+                    if not future.cancelled():
+                        future.set_exception(e)
+                else:
+                    metrics.completed += 1
+                    if not future.cancelled():
+                        future.set_result(result)
+                finally:
+                    self._running = False
+        finally:
+            self._worker = None
+
+_queues: Dict[int, ChannelQueue] = {}   # channel_id → its queue
+
+def get_queue(channel_id: int) -> ChannelQueue:
+    queue = _queues.get(channel_id)
+    if queue is None:
+        queue = _queues[channel_id] = ChannelQueue(channel_id)
+    return queue
+
+def discard_queue(channel_id: int) -> None:
+    """Forgets a finished game's queue; commands already queued still run."""
+    _queues.pop(channel_id, None)
+
+async def run_serialized(channel_id: int, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+    """Runs one game mutation in `channel_id`'s queue."""
+    return await get_queue(channel_id).run(fn, *args)
+
+def queue_metrics() -> Dict[int, Dict[str, float]]:
+    """A snapshot of every live queue: depth, totals and wait percentiles."""
+    return {
+        channel_id: {
+            "depth":       q.depth,
+            "max_depth":   q.metrics.max_depth,
+            "completed":   q.metrics.completed,
+            "failed":      q.metrics.failed,
+            "wait_p50_ms": q.metrics.wait_percentile(50) * 1e3,
+            "wait_p99_ms": q.metrics.wait_percentile(99) * 1e3,
+        }
+        for channel_id, q in _queues.items()
+    }
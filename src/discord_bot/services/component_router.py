@@ -0,0 +1,154 @@
+# discord_bot/services/component_router.py
+"""Routes clicks on the game's stateless components to the engine.
+
+Every game button and select carries a `views.components` custom_id; the
+cog hands each component interaction to `dispatch_component`, which looks
+the game up by channel, rejects components from an earlier round and
+applies the action.  No per-message view objects are tracked anywhere.
+"""
+
+from typing import Awaitable, Callable, Dict
+
+from cards_engine.game_phases import Phase
+from discord_bot.services.state_manager import get_game, get_lobby
+from discord_bot.services.command_queue import run_serialized
+from discord_bot.services.game_flow import handle_play, handle_judge, handle_join, respond
+from discord_bot.views.components import (
+    ComponentId, parse_custom_id, decode_picks, JOIN, PLAY, PICK, JUDGE, VERDICT, DRAFT)
+from discord_bot.views.draft_view import DraftView
+from discord_bot.views.join_view  import JoinView
+from discord_bot.views.play_view  import PlayView, blank_name
+
+Handler = Callable[[object, ComponentId], Awaitable[None]]
+
+async def dispatch_component(interaction) -> bool:
+    """Handles `interaction` if it came from one of our components and
+    returns whether it did."""
+    data = interaction.data or {}
+    cid = parse_custom_id(data.get("custom_id"))
+    handler = _HANDLERS.get(cid.action) if cid else None
+    if handler is None:
+        return False
+    await handler(interaction, cid)
+    return True
+
+def _current_game(cid: ComponentId):
+    """The channel's game if `cid` belongs to its current round."""
+    game = get_game(cid.channel_id)
+    if game is None or game.state is None or game.state.round_number != cid.round:
+        return None
+    return game
+
+async def _stale(interaction, content: str = "⌛ That round is already over.") -> None:
+    await respond(interaction, content, ephemeral=True)
+
+def _value(interaction) -> int:
+    return int(interaction.data["values"][0])
+
+# ─── Handlers ───────────────────────────────────────────────────
+
+async def _on_join(interaction, cid: ComponentId) -> None:
+    lobby = get_lobby(cid.channel_id)
+    joined = len(lobby.players) if lobby else 0
+    await handle_join(interaction)
+    message = getattr(interaction, "message", None)
+    if lobby is not None and message is not None and len(lobby.players) != joined:
+        await message.edit(view=JoinView(lobby, cid.channel_id))
+
+async def _on_play(interaction, cid: ComponentId) -> None:
+    game = _current_game(cid)
+    if game is None:
+        return await _stale(interaction)
+    await handle_play(interaction, game)
+
+async def _on_pick(interaction, cid: ComponentId) -> None:
+    game = _current_game(cid)
+    if game is None or game.state.phase != Phase.SUBMISSIONS:
+        return await _stale(interaction)
+    player = game.state.player_by_id(str(interaction.user.id))
+    if player is None:
+        return await respond(interaction, "You are NOT in this game!", ephemeral=True)
+
+    picks = decode_picks(cid.arg) + [_value(interaction)]
+    pick_count = game.state.current_prompt.pick if game.state.current_prompt else 1
+    if len(picks) < pick_count:
+        await interaction.response.edit_message(
+            content=f"Select a response to play for the {blank_name(len(picks))} blank of this prompt.",
+            view=PlayView(game, player, picks)
+        )
+        return
+
+    edit_message = "Your responses have been submitted!"
+    if game.presentation_rng.randint(0, 100) < 2:
+        edit_message = "Your responses have been submitted! Bubba is pleased..."
+    await interaction.response.edit_message(content=edit_message, view=None)
+    try:
+        await run_serialized(cid.channel_id, game.submit, player.id, picks)
+    except (RuntimeError, ValueError):
+        # the round moved on (a skip, say) while this pick was queued
+        await interaction.followup.send("⌛ Too late, that round is already over.", ephemeral=True)
+
+async def _on_judge(interaction, cid: ComponentId) -> None:
+    game = _current_game(cid)
+    if game is None:
+        return await _stale(interaction)
+    await handle_judge(interaction, game)
+
+async def _on_verdict(interaction, cid: ComponentId) -> None:
+    game = _current_game(cid)
+    if game is None or game.state.phase != Phase.JUDGING:
+        return await _stale(interaction)
+    if str(interaction.user.id) != str(game.state.current_judge.id):
+        return await respond(interaction, "Only the judge can select!", ephemeral=True)
+
+    player_id, winner_cards = game.state.submissions_shuffled[_value(interaction)]
+    await respond(
+        interaction,
+        f"Selected the answers: {', '.join(card.text for card in winner_cards)}",
+        ephemeral=True
+    )
+    try:
+        await run_serialized(cid.channel_id, game.judge, player_id)
+    except (RuntimeError, ValueError):
+        # a second click from another copy of the select lost the race
+        pass
+
+async def _on_draft(interaction, cid: ComponentId) -> None:
+    game = _current_game(cid)
+    user_id = str(interaction.user.id)
+    if (game is None or game.state.phase != Phase.DRAFT_PICKING
+            or user_id not in game.state.draft_queues
+            or str(len(game.state.draft_kept.get(user_id, ()))) != cid.arg):
+        return await _stale(interaction, "⌛ That pack has already moved on. Use `/draft` to see your current one.")
+
+    # options are valued by card id; the id is turned into a position only
+    # once the pick runs, after any rotation queued ahead of it
+    card_id = _value(interaction)
+    async def pick_card() -> bool:
+        queue = game.state.draft_queues.get(user_id, ())
+        pick_index = next((i for i, c in enumerate(queue) if c.card_id == card_id), None)
+        if pick_index is None or game.state.phase != Phase.DRAFT_PICKING:
+            return False
+        await game.draft_pick(user_id, pick_index)
+        return True
+    if not await run_serialized(cid.channel_id, pick_card):
+        return await _stale(interaction, "⌛ That card is no longer in your pack. Use `/draft` to see your current one.")
+    if game.state.phase != Phase.DRAFT_PICKING:
+        await interaction.response.edit_message(
+            content="✅ Draft complete! Check your hand to see what you kept.",
+            view=None
+        )
+        return
+    await interaction.response.edit_message(
+        content="Next pack — pick again:",
+        view=DraftView(game, user_id)
+    )
+
+_HANDLERS: Dict[str, Handler] = {
+    JOIN:    _on_join,
+    PLAY:    _on_play,
+    PICK:    _on_pick,
+    JUDGE:   _on_judge,
+    VERDICT: _on_verdict,
+    DRAFT:   _on_draft,
+}
@@ -1,45 +1,69 @@
 import asyncio
-import random
 from discord import Interaction, ApplicationContext
 from cards_engine.player import Player
 from cards_engine.game_phases import Phase
 from discord_bot.services.state_manager import get_lobby
+from discord_bot.services.reveal_scheduler import schedule_reveal, cancel_reveal
+from discord_bot.services.command_queue import run_serialized
+from discord_bot.services.outbound import post, post_edit, Priority, MESSAGE_LIMIT
+from discord_bot.services.snapshot_store import save_game
 from discord_bot.views.judge_button_view import JudgeButtonView
 from discord_bot.views.play_button_view import PlayButtonView
 from discord_bot.views.play_view import PlayView
 from discord_bot.views.judge_view import JudgeView
 from discord_bot.views.draft_view import DraftView
 
-async def reveal_submissions(channel, game, on_judge_button, delay=3.0):
-    """Reveal all submissions anonymously to the main channel, one at a time."""
-    submissions = list(game.state.submissions.items())
+# multiplies every reveal delay; the stress harness shrinks it to run
+# many games quickly
+_reveal_pace = 1.0
+
+def set_reveal_pace(factor: float) -> None:
+    global _reveal_pace
+    _reveal_pace = factor
+
+def start_reveal(channel, game, delay=3.0):
+    """Fixes the anonymous submission order now and reveals it in the
+    background, so the phase change that triggered it returns at once.
+    An order restored from a snapshot is kept: judge selects posted
+    before the restart index into it."""
+    submissions = game.state.submissions_shuffled
+    if not submissions:
+        submissions = list(game.state.submissions.items())
+        game.presentation_rng.shuffle(submissions)
+        game.state.submissions_shuffled = submissions
+    return schedule_reveal(channel.id, reveal_submissions(channel, game, submissions, delay))
+
+async def reveal_submissions(channel, game, submissions, delay=3.0):
+    """Reveal the submissions anonymously to the main channel by editing one
+    message in place, one submission per `delay` seconds."""
     prompt = game.state.current_prompt
+    judge = game.state.current_judge
 
-    random.shuffle(submissions)
-    game.state.submissions_shuffled = submissions
-
-    await channel.send("✅ All responses are in! Revealing submissions anonymously...")
-    await asyncio.sleep(delay)
-
+    content = "✅ All responses are in! Revealing submissions anonymously..."
+    message = await post(channel, content, coalesce=False)
+    delay *= _reveal_pace
     for idx, (player_id, cards) in enumerate(submissions):
-        responses = [c.text for c in cards]
-        formatted = prompt.format_prompt(responses)
-        await channel.send(f"**#{idx+1}:** {formatted}")
         await asyncio.sleep(delay)
+        line = f"**#{idx+1}:** {prompt.format_prompt([c.text for c in cards])}"
+        if len(content) + 1 + len(line) > MESSAGE_LIMIT:
+            content = line
+            message = await post(channel, content, coalesce=False)
+        else:
+            content = f"{content}\n{line}"
+            post_edit(message, content)
+    await asyncio.sleep(delay)
 
-    judge = game.state.current_judge
-    async def on_judge_pick(game, player_id):
-        await game.judge(player_id)
-    view_judge_button = JudgeButtonView(
-        game, 
-        on_judge_button=lambda interaction, game: handle_judge(interaction, game, on_judge_pick=on_judge_pick)
-    )
-    await channel.send(
+    # the judge may have picked early with /judge while we were pacing
+    if game.state.phase != Phase.JUDGING or game.state.submissions_shuffled is not submissions:
+        return
+
+    post(
+        channel,
         f"All submissions revealed! <@{judge.id}>, please select the best response by clicking the button below.",
-        view=view_judge_button
+        view=JudgeButtonView(game)
     )
 
-async def announce_round_start(channel, game, on_play_button):
+async def announce_round_start(channel, game, priority=Priority.ANNOUNCEMENT):
     judge_current = getattr(game.state, "current_judge", None)
     judge_mention = f"<@{judge_current.id}>" if judge_current else "Unknown"
     prompt_card = getattr(game.state, "current_prompt", None)
@@ -47,24 +71,28 @@ async def announce_round_start(channel, game, on_play_button):
     prompt_picks = prompt_card.pick if prompt_card else 1
 
     if game.state.phase == Phase.DRAFT_PICKING:
-        await channel.send(
+        post(
+            channel,
             "🏀 **Draft mode** is enabled. "
-            "Please type **/draft** to begin selecting your cards!"
+            "Please type **/draft** to begin selecting your cards!",
+            priority=priority
         )
     else:
-        view_play_button = PlayButtonView(game, on_play_button=on_play_button)
+        view_play_button = PlayButtonView(game)
         prompt_picks_plurality = "blanks" if prompt_picks > 1 else "blank"
         message_content = (
             f"_ _\nThe Judge is currently **{judge_mention}**.\n"
             f"Your prompt is: **{prompt_text}**\n"
             f"(There should be **{prompt_picks}** {prompt_picks_plurality}. If there is not, the Judge may `/skip`.)\n"
         )
-        await channel.send(
-            content=message_content,
-            view=view_play_button
+        post(
+            channel,
+            message_content,
+            view=view_play_button,
+            priority=priority
         )
 
-async def handle_play(ctx_or_interaction, game, bot, *, as_button=False):
+async def handle_play(ctx_or_interaction, game):
     channel_id, user_id = get_channel_and_user_id(ctx_or_interaction)
 
     if not game:
@@ -81,11 +109,11 @@ async def handle_play(ctx_or_interaction, game, bot, *, as_button=False):
     if game.state.current_judge.id == player.id:
         return await respond(ctx_or_interaction, "You are the judge this round!", ephemeral=True)
 
-    view = PlayView(channel_id, user_id, bot)
+    view = PlayView(game, player)
     msg = "Select a response to play for this prompt." if view.pick_count == 1 else "Select a response to play for the first blank of this prompt."
     await respond(ctx_or_interaction, msg, view=view, ephemeral=True)
 
-async def handle_judge(ctx_or_interaction, game, *, on_judge_pick):
+async def handle_judge(ctx_or_interaction, game):
     channel_id, user_id = get_channel_and_user_id(ctx_or_interaction)
 
     if not game:
@@ -100,7 +128,7 @@ async def handle_judge(ctx_or_interaction, game, *, on_judge_pick):
     if not player or player.id != game.state.current_judge.id:
         return await respond(ctx_or_interaction, "You are NOT the judge this round!", ephemeral=True)
 
-    view = JudgeView(game, judge_id=game.state.current_judge.id, on_judge_pick=on_judge_pick)
+    view = JudgeView(game)
     await respond(ctx_or_interaction, "Select the best response from the submissions:", view=view, ephemeral=True)
 
 async def handle_draft(ctx_or_interaction, game):
@@ -108,8 +136,10 @@ async def handle_draft(ctx_or_interaction, game):
 
     if not game or game.state.phase != Phase.DRAFT_PICKING:
         return await respond(ctx_or_interaction, "No draft in progress.", ephemeral=True)
+    if user_id not in game.state.draft_queues:
+        return await respond(ctx_or_interaction, "You are NOT in this game!", ephemeral=True)
 
-    view = DraftView(channel_id, user_id)
+    view = DraftView(game, user_id)
     await respond(ctx_or_interaction, "Your draft pack, pick one card:", view=view, ephemeral=True)
 
 async def handle_stop(ctx_or_interaction, game_manager_get_game, game_manager_remove_game):
@@ -126,13 +156,11 @@ async def handle_stop(ctx_or_interaction, game_manager_get_game, game_manager_re
         return await respond(ctx_or_interaction, "❌ WHO do you think YOU are? The host?", ephemeral=True)
 
     game_manager_remove_game(channel_id)
+    cancel_reveal(channel_id)
     await respond(ctx_or_interaction, "Ending the game now ...", ephemeral=True)
-    try:
-        await ctx_or_interaction.channel.send("🛑 **Game ended by the host!**")
-    except Exception:
-        pass
+    post(ctx_or_interaction.channel, "🛑 **Game ended by the host!**", priority=Priority.INTERACTIVE)
 
-async def handle_skip(ctx_or_interaction, bot, game):
+async def handle_skip(ctx_or_interaction, game):
     """Handler for skipping the current prompt."""
     channel_id, user_id = get_channel_and_user_id(ctx_or_interaction)
 
@@ -147,19 +175,21 @@ async def handle_skip(ctx_or_interaction, bot, game):
     if player.id != game.state.current_judge.id:
         return await respond(ctx_or_interaction, "You are NOT the judge this round!", ephemeral=True)
 
-    game.engine.draw_prompt(game.state)
+    try:
+        # skip through the game so cards already played go back to their owners
+        await run_serialized(channel_id, game.skip, player.id)
+    except (RuntimeError, ValueError):
+        # everyone submitted (or the game moved on) while we were queued
+        return await respond(ctx_or_interaction, "Too late to skip this prompt.", ephemeral=True)
+    # the phase stays SUBMISSIONS, so no listener saves the new prompt
+    save_game(game)
     await respond(ctx_or_interaction, "Prompt skipped!", ephemeral=True)
-    await asyncio.sleep(0.5)
-    await ctx_or_interaction.channel.send(
-        f"⏭️ The Judge, **{player.name}**, has skipped the current prompt. A new one has been drawn!"
-    )
-    await asyncio.sleep(0.5)
-    def on_play_button(interaction, game):
-        return handle_play(interaction, game, bot=bot, as_button=True)
-    await announce_round_start(
-        ctx_or_interaction.channel, game,
-        on_play_button=on_play_button
+    post(
+        ctx_or_interaction.channel,
+        f"⏭️ The Judge, **{player.name}**, has skipped the current prompt. A new one has been drawn!",
+        priority=Priority.INTERACTIVE
     )
+    await announce_round_start(ctx_or_interaction.channel, game, priority=Priority.INTERACTIVE)
 
 async def handle_join(ctx_or_interaction):
     channel_id, user_id = get_channel_and_user_id(ctx_or_interaction)
@@ -173,7 +203,7 @@ async def handle_join(ctx_or_interaction):
     if any(player.id == str(user_id) for player in lobby.players):
         return await respond(ctx_or_interaction, "You are already in the game!", ephemeral=True)
     
-    if len(lobby.players) >= lobby.config.max_players:
+    if len(lobby.players) >= (lobby.max_players or lobby.config.max_players):
         return await respond(ctx_or_interaction, "The lobby is full! You can't join.", ephemeral=True)
 
     # Add the player
@@ -204,7 +234,8 @@ async def respond(ctx_or_interaction, *args, **kwargs):
 def get_channel_and_user_id(ctx_or_interaction):
     if isinstance(ctx_or_interaction, ApplicationContext):
         return ctx_or_interaction.channel_id, str(ctx_or_interaction.author.id)
-    elif isinstance(ctx_or_interaction, Interaction):
+    elif isinstance(ctx_or_interaction, Interaction) or hasattr(ctx_or_interaction, "user"):
+        # anything shaped like an Interaction, e.g. discord_bot.fake_discord
         return ctx_or_interaction.channel.id, str(ctx_or_interaction.user.id)
     else:
         raise ValueError("Unknown context type")
\ No newline at end of file
@@ -1,62 +1,248 @@
-import random
+import os
+import time
 import asyncio
-from typing                             import Dict, List, Tuple
+import logging
+from typing                             import Dict, List, Optional, Tuple
 from cards_engine.game                  import Game
-from cards_engine.card_repository       import CardRepository
+from cards_engine.game_config           import GameConfig
 from cards_engine.game_phases           import Phase
+from cards_engine.phase_dispatch        import ListenerMode
 from cards_engine.player                import Player
+from cards_engine.snapshot              import restore_game, loads, SnapshotError
+from cards_engine.event_log             import FileEventLog
+from cards_engine.game_worker           import GameWorkerPool, RemoteGame
+from discord_bot.config                 import EVENT_LOG_DIR, GAME_WORKERS, GAME_IDLE_TTL, LOBBY_IDLE_TTL, SWEEP_INTERVAL
 from discord_bot.services.lobby         import Lobby
-from discord_bot.services.state_manager import set_game, set_lobby, get_lobby, remove_lobby, remove_game
-from discord_bot.services.game_flow     import reveal_submissions, announce_round_start, handle_play, handle_judge, handle_draft
+from discord_bot.services.state_manager import set_game, get_game, set_lobby, get_lobby, remove_lobby, remove_game, get_repository, get_shard
+from discord_bot.services.state_manager import touch, idle_channels, record_eviction
+from discord_bot.services.shards        import shard_of_channel, owns_all_shards
+from discord_bot.services.snapshot_store import get_store, persist_game
+from discord_bot.services.reveal_scheduler import cancel_reveal
+from discord_bot.services.outbound      import post, Priority
+from discord_bot.services.game_flow     import start_reveal, announce_round_start
 
-_repo = CardRepository()
 _lobbies: Dict[int, Lobby] = {}   # channel_id → Lobby
 _games:   Dict[int, Game]  = {}   # channel_id → running Game
 _bot = None
+_event_log_dir = EVENT_LOG_DIR
+_worker_count = GAME_WORKERS
+_pool = None
+_sweeper = None
+
+log = logging.getLogger(__name__)
 
 def set_bot(bot) -> None:
     """Sets the global bot instance."""
     global _bot
     _bot = bot
 
-def create_lobby(channel_id: int, host_id: int, host_name: str) -> Lobby:
+def set_event_log_dir(path) -> None:
+    """Where new games write their event logs; None turns logging off."""
+    global _event_log_dir
+    _event_log_dir = path
+
+def set_game_workers(count: int) -> None:
+    """How many worker processes run games; 0 runs them in this process.
+    Only affects games started after the call."""
+    global _worker_count
+    close_workers()
+    _worker_count = count
+
+def _worker_pool():
+    global _pool
+    if _pool is None and _worker_count > 0:
+        _pool = GameWorkerPool(_worker_count, get_repository())
+    return _pool
+
+def close_workers() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+def _event_log_path(channel_id: int):
+    if not _event_log_dir:
+        return None
+    try:
+        os.makedirs(_event_log_dir, exist_ok=True)
+    except OSError as e:
+        log.warning("Not logging events for channel %s: %s", channel_id, e)
+        return None
+    return os.path.join(_event_log_dir, f"{channel_id}-{int(time.time())}.jsonl")
+
+def _open_event_log(channel_id: int):
+    path = _event_log_path(channel_id)
+    if path is None:
+        return None
+    try:
+        return FileEventLog(path)
+    except OSError as e:
+        log.warning("Not logging events for channel %s: %s", channel_id, e)
+        return None
+
+def create_lobby(channel_id: int, host_id: int, host_name: str, shard_id: int = 0) -> Lobby:
     host_player = Player(id=str(host_id), name=host_name)
     lobby = Lobby(host=host_player)
-    set_lobby(channel_id, lobby)
+    set_lobby(channel_id, lobby, shard_id=shard_id)
     return lobby
 
 async def start_game(channel_id: int) -> Game:
     lobby = get_lobby(channel_id)
-    random.shuffle(lobby.players)
-    real = Game(
-        players    = lobby.players,
-        config     = lobby.config,
-        repository = _repo,
-        host_id    = lobby.host.id,
-        channel_id = channel_id
-    )
+    shard_id = get_shard(channel_id)
+    real = _new_game(lobby.players, lobby.config, channel_id, host_id=lobby.host.id)
     remove_lobby(channel_id)
-    real.add_phase_listener(on_phase_change)
-    set_game(channel_id, real)
+    real.presentation_rng.shuffle(real.players)   # random seating
+    _track(real, shard_id)
     await real.start()
     return real
 
+def start_table(players: List[Player], config: GameConfig, channel_id: int,
+                seed: int, host_id: str = "") -> Game:
+    """A tracked game for one tournament table, not started yet; see
+    `cards_engine.tournament.TableFactory`."""
+    game = _new_game(players, config, channel_id, host_id=host_id, seed=seed)
+    _track(game, shard_of_channel(_bot, channel_id))
+    return game
+
+def _new_game(players: List[Player], config: GameConfig, channel_id: int,
+              host_id: str = "", seed: Optional[int] = None) -> Game:
+    pool = _worker_pool()
+    if pool is not None:
+        # the worker opens the log itself; only the path travels
+        return RemoteGame(
+            pool,
+            players        = players,
+            config         = config,
+            repository     = get_repository(),
+            host_id        = host_id,
+            channel_id     = channel_id,
+            seed           = seed,
+            event_log_path = _event_log_path(channel_id)
+        )
+    return Game(
+        players    = players,
+        config     = config,
+        repository = get_repository(),
+        host_id    = host_id,
+        channel_id = channel_id,
+        seed       = seed,
+        event_log  = _open_event_log(channel_id)
+    )
+
+def _track(game: Game, shard_id: int = 0) -> None:
+    game.add_phase_listener(_mark_active)
+    # snapshots are taken inline so they match the phase they are saved for
+    game.add_phase_listener(persist_game)
+    # announcements are paced for people; gameplay should not wait on them
+    game.add_phase_listener(on_phase_change, mode=ListenerMode.BACKGROUND)
+    set_game(game.channel_id, game, shard_id=shard_id)
+
+def _mark_active(game: Game, old_phase: Phase, new_phase: Phase) -> None:
+    touch(game.channel_id)
+
+# ─── Idle sweeper ───────────────────────────────────────────────
+
+async def sweep_idle(game_ttl: float = GAME_IDLE_TTL, lobby_ttl: float = LOBBY_IDLE_TTL,
+                     now: float = None) -> Tuple[int, int]:
+    """Closes games and lobbies idle for longer than their TTL, stopping
+    their views.  Returns how many (games, lobbies) were evicted."""
+    games, lobbies = idle_channels(game_ttl, lobby_ttl, now)
+    for channel_id in lobbies:
+        remove_lobby(channel_id)
+        record_eviction("lobbies")
+        _notify_idle(channel_id, "⌛ Nobody started the game, so Bubba closed the lobby.")
+    for channel_id in games:
+        cancel_reveal(channel_id)
+        remove_game(channel_id)
+        record_eviction("games")
+        _notify_idle(channel_id, "⌛ This game went quiet for too long, so Bubba ended it.")
+    if games or lobbies:
+        log.info("Evicted %d idle game(s) and %d idle lobby(s)", len(games), len(lobbies))
+    return len(games), len(lobbies)
+
+def _notify_idle(channel_id: int, content: str) -> None:
+    channel = _bot.get_channel(channel_id) if _bot is not None else None
+    if channel is not None:
+        post(channel, content)
+
+def start_sweeper(interval: float = SWEEP_INTERVAL) -> asyncio.Task:
+    """Runs `sweep_idle` every `interval` seconds; safe to call again on
+    reconnect."""
+    global _sweeper
+    if _sweeper is None or _sweeper.done():
+        _sweeper = asyncio.get_running_loop().create_task(_sweep_forever(interval))
+    return _sweeper
+
+def stop_sweeper() -> None:
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.cancel()
+        _sweeper = None
+
+async def _sweep_forever(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_idle()
+        except Exception:
+            log.exception("Idle sweep failed")
+
+async def restore_games() -> int:
+    """Picks saved games back up after a restart and re-posts the current
+    round so players can find it; buttons posted before the restart keep
+    working too.  Returns how many games were restored."""
+    store = get_store()
+    repo = get_repository()
+    restored = 0
+    for channel_id, blob in store.load_all():
+        if get_game(channel_id):
+            continue   # on_ready fires again after reconnects
+        channel = _bot.get_channel(channel_id)
+        if channel is None:
+            # with shards split across processes, another process may own it
+            if owns_all_shards(_bot):
+                store.delete(channel_id)
+            continue
+        pool = _worker_pool()
+        try:
+            if pool is not None:
+                game = await RemoteGame.restore(pool, loads(blob), repo)
+            else:
+                game = restore_game(loads(blob), repo, resume_log=True)
+        except (SnapshotError, KeyError, IndexError) as e:
+            log.warning("Dropping saved game for channel %s: %s", channel_id, e)
+            store.delete(channel_id)
+            continue
+        if _event_log_dir and game.log_position() is None:
+            log.warning("Restored game in channel %s has no event log to resume; "
+                        "it will not be replayable", channel_id)
+        _track(game, shard_of_channel(_bot, channel_id))
+        post(channel, "♻️ Bubba had to step out for a moment. Picking the game back up where it left off!",
+             priority=Priority.INTERACTIVE)
+        await _reannounce(game, channel)
+        restored += 1
+    return restored
+
+async def _reannounce(game: Game, channel) -> None:
+    if game.state.phase == Phase.JUDGING:
+        start_reveal(channel, game, delay=0)
+    else:
+        await announce_round_start(channel, game)
+
 
 async def on_phase_change(game: Game, old_phase: Phase, new_phase: Phase):
-    print(f"[GameManager] Phase changed  ({old_phase} -> {new_phase}) for game {game.channel_id}")
+    log.debug("Phase changed (%s -> %s) for game %s", old_phase.name, new_phase.name, game.channel_id)
     game_channel = _bot.get_channel(game.channel_id)
+    if old_phase == Phase.JUDGING:
+        cancel_reveal(game.channel_id)
     if new_phase == Phase.JUDGING:
-        async def on_judge_button(interaction, game):
-            return await handle_judge(interaction, game, on_judge_pick=on_judge_button)
-
-        await reveal_submissions(game_channel, game, on_judge_button=on_judge_button)
+        # paced in the background; the transition itself finishes now
+        start_reveal(game_channel, game)
         return
 
     elif new_phase == Phase.SUBMISSIONS:
         await announce_round_winner(game, game_channel)
-        def on_play_button(interaction, game):
-            return handle_play(interaction, game, bot=_bot, as_button=True)
-        await announce_round_start(game_channel, game, on_play_button=on_play_button)
+        await announce_round_start(game_channel, game)
 
     elif new_phase == Phase.FINISHED:
         await announce_round_winner(game, game_channel)
@@ -76,11 +262,11 @@ async def announce_round_winner(game: Game, channel):
     score_plurality = "point" if score == 1 else "points"
     cards_plurality = "card" if len(winner_cards) == 1 else "cards"
 
-    await channel.send(
+    post(
+        channel,
         f"🏆 **{name}** wins the round, and now has **{score}** {score_plurality}!\n"
         f"Winning {cards_plurality}:\n{cards_list}\n"
     )
-    await asyncio.sleep(2)
 
 
 async def announce_game_winner(game: Game, channel):
@@ -92,9 +278,14 @@ async def announce_game_winner(game: Game, channel):
     points_label = "point" if champ_score == 1 else "points"
 
     # Header
-    await channel.send(
-        f"_ _\n🎉 **{champ_name}** has reached {champ_score} {points_label} and wins the game! 🏆"
-    )
+    if champ_id is None:
+        # ended early (too few players left), so nobody reached the limit
+        post(channel, "_ _\n🏁 The game is over before anyone reached the score limit.")
+    else:
+        post(
+            channel,
+            f"_ _\n🎉 **{champ_name}** has reached {champ_score} {points_label} and wins the game! 🏆"
+        )
 
     # Build and send leaderboard lines
     board = _generate_leaderboard(game.state.players)
@@ -103,10 +294,11 @@ async def announce_game_winner(game: Game, channel):
         for name, pts in entries:
             pts_label = "point" if pts == 1 else "points"
             lines.append(f"{label} {name} - {pts} {pts_label}")
-    await channel.send("\n".join(lines))
+    post(channel, "\n".join(lines))
 
-    # Cleanup
-    remove_game(game.channel_id)
+    # Cleanup; a tournament may already have seated its next table here
+    if get_game(game.channel_id) is game:
+        remove_game(game.channel_id)
 
 def _generate_leaderboard(players: List[Player]) -> List[Tuple[str, List[Tuple[str, int]]]]:
     # sort descending by score
@@ -135,20 +327,20 @@ def _generate_leaderboard(players: List[Player]) -> List[Tuple[str, List[Tuple[s
     result: List[Tuple[str, List[Tuple[str, int]]]] = []
     for rank in sorted(ranks):
         players_at_rank = ranks[rank]
-        if rank == 1:
-            label = "🥇"
-        elif rank == 2:
-            label = "🥈"
-        elif rank == 3:
-            label = "🥉"
-        else:
-            label = f"{_ordinal(rank)}: "
-
         entries: List[Tuple[str, int]] = [(p.name, p.score) for p in players_at_rank]
-        result.append((label, entries))
+        result.append((rank_label(rank), entries))
 
     return result
 
+def rank_label(rank: int) -> str:
+    if rank == 1:
+        return "🥇"
+    elif rank == 2:
+        return "🥈"
+    elif rank == 3:
+        return "🥉"
+    return f"{_ordinal(rank)}: "
+
 def _ordinal(n: int) -> str:
     if 10 <= n % 100 <= 20:
         suffix = "th"
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 from cards_engine.player import Player
 from cards_engine.game_config import GameConfig
 
@@ -8,4 +8,6 @@ class Lobby:
     host:    Player
     players: List[Player] = field(default_factory=list)
     config:  GameConfig   = field(default_factory=GameConfig)
-    join_message_id: int = 0
\ No newline at end of file
+    join_message_id: int = 0
+    # caps sign-ups instead of config.max_players, e.g. for a tournament
+    max_players: Optional[int] = None
\ No newline at end of file
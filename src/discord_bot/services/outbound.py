@@ -0,0 +1,300 @@
+# discord_bot/services/outbound.py
+"""Rate-limit-aware scheduler for messages the bot posts to channels.
+
+Announcements and reveal edits are queued per channel and sent by that
+channel's worker once both the channel's and the bot-wide token buckets
+allow it, instead of firing `channel.send` back to back and sleeping to
+stay under Discord's limits.
+
+- Priority: INTERACTIVE posts (the direct result of someone's command)
+  jump ahead of queued ANNOUNCEMENTs in their channel, and announcements
+  leave part of the global bucket unused so interactive posts in other
+  channels are not starved by busy games.
+- Coalescing: consecutive text announcements still waiting in the same
+  channel are merged into one message (up to Discord's length cap), and
+  consecutive edits of one message collapse into the latest.
+
+A channel's lane (queues, bucket and worker) only exists while it has
+something to send or its bucket is still refilling, so the scheduler does
+not grow with every channel the bot has ever posted in.
+
+Interaction responses (`respond`, followups) do not go through here; they
+use the interaction's own token and are never queued behind announcements.
+"""
+
+import time
+import heapq
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from enum        import IntEnum
+from typing      import Any, Deque, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+MESSAGE_LIMIT = 2000   # Discord's cap on message content
+_DELAY_SAMPLES = 4096  # recent queue delays kept for percentiles
+
+# Discord allows about 5 messages per 5s in a channel and 50 requests/s per bot
+CHANNEL_RATE, CHANNEL_BURST = 1.0, 5
+GLOBAL_RATE,  GLOBAL_BURST  = 50.0, 50
+ANNOUNCEMENT_RESERVE = 10   # global tokens only interactive posts may use
+
+class Priority(IntEnum):
+    INTERACTIVE  = 0
+    ANNOUNCEMENT = 1
+
+class TokenBucket:
+    """`rate` tokens per second up to `capacity`; a rate of None never limits."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: Optional[float], capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def wait_time(self, reserve: float = 0) -> float:
+        """Seconds until a token can be taken while leaving `reserve` behind."""
+        if self.rate is None:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        missing = 1 + reserve - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self) -> None:
+        if self.rate is not None:
+            self.tokens -= 1
+
+    def full_in(self) -> float:
+        """Seconds until the bucket is back at capacity."""
+        if self.rate is None:
+            return 0.0
+        self.wait_time()
+        return (self.capacity - self.tokens) / self.rate
+
+@dataclass
+class OutboundMetrics:
+    sent:      int = 0
+    edited:    int = 0
+    coalesced: int = 0
+    failed:    int = 0
+    delays: Deque[float] = field(default_factory=lambda: deque(maxlen=_DELAY_SAMPLES))
+
+    def delay_percentile(self, p: int) -> float:
+        """Seconds a recent message waited between being queued and sent."""
+        samples = sorted(self.delays)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, len(samples) * p // 100)]
+
+@dataclass
+class _Outgoing:
+    channel:   Any
+    content:   Optional[str]
+    view:      Any
+    message:   Any             # set for edits
+    coalesce:  bool
+    queued_at: float
+    futures:   List[asyncio.Future]
+
+    def absorb(self, other: "_Outgoing") -> bool:
+        """Merges `other`, queued right after this one, if the result is
+        still a single valid request."""
+        if not (self.coalesce and other.coalesce):
+            return False
+        if self.message is not None or other.message is not None:
+            if self.message is not other.message:
+                return False
+            self.content = other.content if other.content is not None else self.content
+            self.view = other.view if other.view is not None else self.view
+        else:
+            if self.view is not None or self.content is None or other.content is None:
+                return False
+            if len(self.content) + 1 + len(other.content) > MESSAGE_LIMIT:
+                return False
+            self.content = f"{self.content}\n{other.content}"
+            self.view = other.view
+        self.futures.extend(other.futures)
+        return True
+
+class _ChannelLane:
+    __slots__ = ("bucket", "queues", "worker")
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.bucket = bucket
+        self.queues: Dict[Priority, Deque[_Outgoing]] = {p: deque() for p in Priority}
+        self.worker: Optional[asyncio.Task] = None
+
+    def next(self) -> Optional[_Outgoing]:
+        for priority in Priority:
+            if self.queues[priority]:
+                return self.queues[priority].popleft()
+        return None
+
+    def idle(self) -> bool:
+        return self.worker is None and not any(self.queues.values())
+
+    def peek_priority(self) -> Priority:
+        return next((p for p in Priority if self.queues[p]), Priority.ANNOUNCEMENT)
+
+class OutboundScheduler:
+    def __init__(self,
+                 channel_rate:  Optional[float] = CHANNEL_RATE,
+                 channel_burst: int             = CHANNEL_BURST,
+                 global_rate:   Optional[float] = GLOBAL_RATE,
+                 global_burst:  int             = GLOBAL_BURST,
+                 announcement_reserve: int      = ANNOUNCEMENT_RESERVE) -> None:
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.announcement_reserve = announcement_reserve
+        self.metrics = OutboundMetrics()
+        self._lanes: Dict[int, _ChannelLane] = {}
+        # (time its bucket is full again, channel id) for lanes gone idle;
+        # a lane is dropped once refilled, since a new one starts out full
+        self._idle: List[Tuple[float, int]] = []
+
+    def send(self, channel, content: Optional[str] = None, *, view=None,
+             priority: Priority = Priority.ANNOUNCEMENT, coalesce: bool = True) -> asyncio.Future:
+        """Queues a new message; the future resolves to the sent message.
+        Awaiting it is optional."""
+        return self._enqueue(_Outgoing(channel, content, view, None, coalesce,
+                                       time.perf_counter(), []), priority)
+
+    def edit(self, message, content: Optional[str] = None, *, view=None,
+             priority: Priority = Priority.ANNOUNCEMENT) -> asyncio.Future:
+        """Queues an edit of `message`; a later queued edit of the same
+        message replaces this one."""
+        return self._enqueue(_Outgoing(message.channel, content, view, message, True,
+                                       time.perf_counter(), []), priority)
+
+    def __len__(self) -> int:
+        """Channels with a lane right now."""
+        return len(self._lanes)
+
+    def pending(self, channel_id: int) -> int:
+        lane = self._lanes.get(channel_id)
+        return sum(len(q) for q in lane.queues.values()) if lane else 0
+
+    async def drain(self) -> None:
+        """Waits until every queued message has been sent."""
+        while True:
+            workers = [lane.worker for lane in self._lanes.values() if lane.worker is not None]
+            if not workers:
+                return
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    # ─── Internals ─────────────────────────────────────────────
+
+    def _enqueue(self, item: _Outgoing, priority: Priority) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        # nobody has to await an announcement, so never warn about its result
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        item.futures.append(future)
+
+        self._drop_idle_lanes()
+        lane = self._lanes.get(item.channel.id)
+        if lane is None:
+            lane = self._lanes[item.channel.id] = _ChannelLane(TokenBucket(self.channel_rate, self.channel_burst))
+        queue = lane.queues[priority]
+        if queue and queue[-1].absorb(item):
+            self.metrics.coalesced += 1
+        else:
+            queue.append(item)
+        if lane.worker is None:
+            lane.worker = asyncio.create_task(self._drain_lane(item.channel.id, lane),
+                                              name=f"outbound-{item.channel.id}")
+        return future
+
+    def _drop_idle_lanes(self) -> None:
+        now = time.monotonic()
+        while self._idle and self._idle[0][0] <= now:
+            _, channel_id = heapq.heappop(self._idle)
+            lane = self._lanes.get(channel_id)
+            if lane is not None and lane.idle() and lane.bucket.full_in() <= 0:
+                del self._lanes[channel_id]
+
+    def _retire(self, channel_id: int, lane: _ChannelLane) -> None:
+        """Forgets an emptied lane now, or once its bucket has refilled."""
+        full_in = lane.bucket.full_in()
+        if full_in <= 0:
+            if self._lanes.get(channel_id) is lane:
+                del self._lanes[channel_id]
+        else:
+            heapq.heappush(self._idle, (time.monotonic() + full_in, channel_id))
+
+    async def _drain_lane(self, channel_id: int, lane: _ChannelLane) -> None:
+        try:
+            while any(lane.queues.values()):
+                reserve = self.announcement_reserve if lane.peek_priority() is Priority.ANNOUNCEMENT else 0
+                wait = max(lane.bucket.wait_time(), self.global_bucket.wait_time(reserve))
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                item = lane.next()
+                lane.bucket.take()
+                self.global_bucket.take()
+                await self._deliver(item)
+            lane.worker = None
+            self._retire(channel_id, lane)
+        finally:
+            lane.worker = None
+
+    async def _deliver(self, item: _Outgoing) -> None:
+        self.metrics.delays.append(time.perf_counter() - item.queued_at)
+        try:
+            if item.message is not None:
+                # leave the message's view alone unless the edit brings one
+                kwargs = {"view": item.view} if item.view is not None else {}
+                result = await item.message.edit(content=item.content, **kwargs)
+                self.metrics.edited += 1
+            else:
+                result = await item.channel.send(item.content, view=item.view)
+                self.metrics.sent += 1
+        except Exception as e:
+            self.metrics.failed += 1
+            log.exception("Sending to channel %s failed", item.channel.id)
+            for f in item.futures:
+                if not f.done():
+                    f.set_exception(e)
+        else:
+            for f in item.futures:
+                if not f.done():
+                    f.set_result(result)
+
+_scheduler: Optional[OutboundScheduler] = None
+
+def get_outbound() -> OutboundScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = OutboundScheduler()
+    return _scheduler
+
+def set_outbound(scheduler: OutboundScheduler) -> None:
+    """Replaces the process-wide scheduler, e.g. with different limits."""
+    global _scheduler
+    _scheduler = scheduler
+
+def post(channel, content: Optional[str] = None, *, view=None,
+         priority: Priority = Priority.ANNOUNCEMENT, coalesce: bool = True) -> asyncio.Future:
+    return get_outbound().send(channel, content, view=view, priority=priority, coalesce=coalesce)
+
+def post_edit(message, content: Optional[str] = None, *, view=None,
+              priority: Priority = Priority.ANNOUNCEMENT) -> asyncio.Future:
+    return get_outbound().edit(message, content, view=view, priority=priority)
+
+def outbound_metrics() -> Dict[str, float]:
+    m = get_outbound().metrics
+    return {
+        "sent":         m.sent,
+        "edited":       m.edited,
+        "coalesced":    m.coalesced,
+        "failed":       m.failed,
+        "delay_p50_ms": m.delay_percentile(50) * 1e3,
+        "delay_p99_ms": m.delay_percentile(99) * 1e3,
+    }
@@ -0,0 +1,40 @@
+# discord_bot/services/reveal_scheduler.py
+"""Background reveal tasks, at most one per channel.
+
+Revealing submissions is paced for suspense, so it runs as its own task
+instead of inside the phase change that triggered it; the engine finishes
+its transition immediately and the channel's reveal plays out on its own.
+"""
+
+import asyncio
+import logging
+from typing import Coroutine, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+_reveals: Dict[int, asyncio.Task] = {}   # channel_id → running reveal
+
+def schedule_reveal(channel_id: int, reveal: Coroutine) -> asyncio.Task:
+    """Runs `reveal` in the background, replacing any reveal still going
+    in the same channel."""
+    cancel_reveal(channel_id)
+    task = asyncio.get_running_loop().create_task(reveal, name=f"reveal-{channel_id}")
+    _reveals[channel_id] = task
+    task.add_done_callback(lambda t: _finished(channel_id, t))
+    return task
+
+def cancel_reveal(channel_id: int) -> bool:
+    task = _reveals.pop(channel_id, None)
+    if task is None or task.done():
+        return False
+    task.cancel()
+    return True
+
+def pending_reveal(channel_id: int) -> Optional[asyncio.Task]:
+    return _reveals.get(channel_id)
+
+def _finished(channel_id: int, task: asyncio.Task) -> None:
+    if _reveals.get(channel_id) is task:
+        del _reveals[channel_id]
+    if not task.cancelled() and task.exception() is not None:
+        log.error("Reveal for channel %s failed", channel_id, exc_info=task.exception())
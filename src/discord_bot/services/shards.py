@@ -0,0 +1,75 @@
+# discord_bot/services/shards.py
+"""Shard bookkeeping and the per-shard health report.
+
+Discord assigns every guild to shard `(guild_id >> 22) % shard_count`, and
+each shard is its own gateway connection.  A channel's interactions always
+arrive on its guild's shard, so running games are grouped by shard too:
+each shard process only ever holds the games of the guilds it serves.
+"""
+
+import math
+from dataclasses import dataclass
+from typing      import List, Optional
+
+from discord_bot.services.state_manager import shard_occupancy
+
+@dataclass
+class ShardHealth:
+    shard_id:   int
+    connected:  bool
+    latency_ms: float   # nan until the first heartbeat is acknowledged
+    guilds:     int
+    games:      int
+    lobbies:    int
+
+def shard_for_guild(guild_id: Optional[int], shard_count: int) -> int:
+    if not guild_id or shard_count <= 1:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+def shard_of_channel(bot, channel_id: int) -> int:
+    """The shard serving `channel_id`'s guild; 0 for DMs and unknown channels."""
+    channel = bot.get_channel(channel_id) if bot is not None else None
+    guild = getattr(channel, "guild", None)
+    shard_id = getattr(guild, "shard_id", None)
+    return shard_id or 0
+
+def owns_all_shards(bot) -> bool:
+    """False when this process runs only some of the bot's shards, in which
+    case channels it cannot see may belong to another process."""
+    shard_ids = getattr(bot, "shard_ids", None)
+    shard_count = getattr(bot, "shard_count", None)
+    return shard_ids is None or shard_count is None or len(shard_ids) >= shard_count
+
+def _ms(seconds: float) -> float:
+    return seconds * 1e3 if math.isfinite(seconds) else math.nan
+
+def shard_health(bot) -> List[ShardHealth]:
+    """One entry per shard this process runs, ordered by shard id."""
+    shards = getattr(bot, "shards", None)
+    if shards:
+        links = {sid: (not info.is_closed(), _ms(info.latency)) for sid, info in shards.items()}
+    else:
+        links = {getattr(bot, "shard_id", None) or 0: (not bot.is_closed(), _ms(bot.latency))}
+
+    guilds = {sid: 0 for sid in links}
+    for guild in bot.guilds:
+        sid = guild.shard_id or 0
+        guilds[sid] = guilds.get(sid, 0) + 1
+    occupancy = shard_occupancy()
+
+    report = []
+    for sid in sorted(links.keys() | occupancy.keys()):
+        connected, latency = links.get(sid, (False, math.nan))
+        games, lobbies = occupancy.get(sid, (0, 0))
+        report.append(ShardHealth(sid, connected, latency, guilds.get(sid, 0), games, lobbies))
+    return report
+
+def format_health(report: List[ShardHealth]) -> str:
+    lines = []
+    for s in report:
+        status = "🟢" if s.connected else "🔴"
+        latency = "—" if math.isnan(s.latency_ms) else f"{s.latency_ms:.0f} ms"
+        lines.append(f"{status} Shard {s.shard_id}: {latency}, {s.guilds} guilds, "
+                     f"{s.games} games, {s.lobbies} lobbies")
+    return "\n".join(lines) or "No shards connected."
@@ -1,27 +1,131 @@
-from cards_engine.card_repository import CardRepository
+import os
+import time
+import weakref
+from cards_engine.card_repository import CardRepository, get_shared_repository
 from cards_engine.game import Game
+from discord_bot.config import MAX_ACTIVE_CHANNELS
+from discord_bot.services.command_queue import discard_queue
+from discord_bot.services.snapshot_store import forget_game
+from discord_bot.views.hand_options import forget_channel as forget_options
 
-_repo = CardRepository()
 _games = {}
 _lobbies = {}
+_shards = {}    # channel_id → shard serving it, while it has a game or lobby
+_activity = {}  # channel_id → time.monotonic() of its last lookup or phase change
+_views = {}     # channel_id → WeakSet of views to stop when the channel is cleared
+_evicted = {"games": 0, "lobbies": 0}
 
-def get_repository():
-    return _repo
+class RegistryFullError(RuntimeError):
+    """Every game/lobby slot is taken; a new lobby cannot be opened."""
+
+def get_repository() -> CardRepository:
+    """The process-wide card repository; loaded on first call."""
+    return get_shared_repository()
+
+def touch(channel_id):
+    """Marks the channel as active now."""
+    if channel_id in _games or channel_id in _lobbies:
+        _activity[channel_id] = time.monotonic()
 
 def get_game(channel_id):
-    return _games.get(channel_id)
+    game = _games.get(channel_id)
+    if game is not None:
+        _activity[channel_id] = time.monotonic()
+    return game
 
-def set_game(channel_id, game):
+def set_game(channel_id, game, shard_id=None):
     _games[channel_id] = game
+    _activity[channel_id] = time.monotonic()
+    if shard_id is not None:
+        _shards[channel_id] = shard_id
 
 def remove_game(channel_id):
-    _games.pop(channel_id, None)
+    game = _games.pop(channel_id, None)
+    if game is not None:
+        game.close()
+    _release(channel_id)
+    discard_queue(channel_id)
+    forget_game(channel_id)
+    forget_options(channel_id)
 
 def get_lobby(channel_id):
-    return _lobbies.get(channel_id)
+    lobby = _lobbies.get(channel_id)
+    if lobby is not None:
+        _activity[channel_id] = time.monotonic()
+    return lobby
 
-def set_lobby(channel_id, lobby):
+def set_lobby(channel_id, lobby, shard_id=None):
+    if channel_id not in _lobbies and len(_games) + len(_lobbies) >= MAX_ACTIVE_CHANNELS:
+        raise RegistryFullError(f"{MAX_ACTIVE_CHANNELS} games and lobbies are already open")
     _lobbies[channel_id] = lobby
+    _activity[channel_id] = time.monotonic()
+    if shard_id is not None:
+        _shards[channel_id] = shard_id
 
 def remove_lobby(channel_id):
     _lobbies.pop(channel_id, None)
+    _release(channel_id)
+
+def attach_view(channel_id, view):
+    """Ties a long-lived view (timeout=None) to the channel's lobby or
+    game: it is stopped when they are removed, so the view, and the game
+    it references, do not outlive them."""
+    _views.setdefault(channel_id, weakref.WeakSet()).add(view)
+    return view
+
+def _release(channel_id):
+    """Stops the channel's views and drops its bookkeeping once it has
+    neither a lobby nor a game."""
+    views = _views.pop(channel_id, None)
+    for view in list(views or ()):
+        view.stop()
+    if channel_id not in _games and channel_id not in _lobbies:
+        _shards.pop(channel_id, None)
+        _activity.pop(channel_id, None)
+
+def idle_channels(game_ttl, lobby_ttl, now=None):
+    """(games, lobbies): channel ids idle for longer than their TTL."""
+    now = time.monotonic() if now is None else now
+    def stale(registry, ttl):
+        return [cid for cid in registry if now - _activity.get(cid, now) > ttl]
+    return stale(_games, game_ttl), stale(_lobbies, lobby_ttl)
+
+def record_eviction(kind):
+    _evicted[kind] += 1
+
+def registry_metrics(now=None):
+    """Occupancy of the registry: live games/lobbies, tracked views, the
+    longest idle time, evictions so far and the process's resident memory."""
+    now = time.monotonic() if now is None else now
+    idle = [now - t for t in _activity.values()]
+    return {
+        "games":          len(_games),
+        "lobbies":        len(_lobbies),
+        "capacity":       MAX_ACTIVE_CHANNELS,
+        "views":          sum(len(v) for v in _views.values()),
+        "max_idle_s":     max(idle, default=0.0),
+        "evicted_games":  _evicted["games"],
+        "evicted_lobbies": _evicted["lobbies"],
+        "rss_bytes":      _rss_bytes(),
+    }
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def get_shard(channel_id):
+    return _shards.get(channel_id, 0)
+
+def shard_occupancy():
+    """shard_id → (running games, open lobbies)."""
+    counts = {}
+    for registry, slot in ((_games, 0), (_lobbies, 1)):
+        for channel_id in registry:
+            entry = counts.setdefault(_shards.get(channel_id, 0), [0, 0])
+            entry[slot] += 1
+    return {sid: tuple(entry) for sid, entry in counts.items()}
@@ -0,0 +1,180 @@
+# discord_bot/services/tournament_manager.py
+"""Runs tournaments: one registration channel, many table channels.
+
+`/tournament open` takes sign-ups in a channel the way `/start` does, up to
+`TOURNAMENT_MAX_PLAYERS` instead of one table's worth.  `/tournament begin`
+hands the players to a `cards_engine.tournament.Tournament` whose tables
+are ordinary tracked games in the channels given, so announcements,
+components, snapshots and worker processes work as for any other game.
+Standings go to the registration channel after every round.
+
+Tournaments live in memory only: after a restart their tables carry on as
+single games, but no further rounds are seated.
+"""
+
+import re
+import asyncio
+import logging
+from functools import partial
+from typing    import Dict, List, Optional
+
+from cards_engine.game_config           import GameConfig
+from cards_engine.player                import Player
+from cards_engine.tournament            import Tournament
+from discord_bot.config                 import TOURNAMENT_MAX_PLAYERS, SWEEP_INTERVAL
+from discord_bot.services.lobby         import Lobby
+from discord_bot.services.state_manager import get_game, get_lobby, remove_lobby, get_repository
+from discord_bot.services.command_queue import run_serialized
+from discord_bot.services.outbound      import post, Priority
+from discord_bot.services.snapshot_store import save_game
+from discord_bot.services.game_flow     import announce_round_start
+from discord_bot.services.game_manager  import create_lobby, start_table, rank_label
+
+STANDINGS_SHOWN = 20    # lines of standings posted after each round
+
+_tournaments: Dict[int, Tournament] = {}     # registration channel → tournament
+_tables:      Dict[int, int]        = {}     # table channel → registration channel
+_runners:     Dict[int, asyncio.Task] = {}
+_hosts:       Dict[int, str]        = {}     # registration channel → host id
+_bot = None
+
+log = logging.getLogger(__name__)
+
+def set_bot(bot) -> None:
+    global _bot
+    _bot = bot
+
+def get_tournament(channel_id: int) -> Optional[Tournament]:
+    """The tournament registered in, or playing a table in, `channel_id`."""
+    return _tournaments.get(_tables.get(channel_id, channel_id))
+
+def tournament_host(channel_id: int) -> Optional[str]:
+    return _hosts.get(_tables.get(channel_id, channel_id))
+
+def parse_channels(text: str) -> List[int]:
+    """Channel ids from `#channel` mentions or bare ids, in order, once each."""
+    ids = [int(i) for i in re.findall(r"\d{15,}", text or "")]
+    return list(dict.fromkeys(ids))
+
+def open_tournament(channel_id: int, host_id: str, host_name: str, shard_id: int = 0) -> Lobby:
+    lobby = create_lobby(channel_id, host_id, host_name, shard_id=shard_id)
+    repo = get_repository()
+    lobby.config = GameConfig(expansions=repo.available_expansions(),
+                              regions={r: True for r in repo.available_regions()})
+    lobby.max_players = TOURNAMENT_MAX_PLAYERS
+    lobby.players.append(Player(id=str(host_id), name=host_name))
+    return lobby
+
+async def begin_tournament(channel_id: int, table_channels: List[int], rounds: int) -> Tournament:
+    """Turns the registration lobby in `channel_id` into a running
+    tournament.  Raises ValueError if it cannot be seated."""
+    lobby = get_lobby(channel_id)
+    if lobby is None or not lobby.max_players:
+        raise ValueError("There is no tournament registration open in this channel.")
+    busy = [c for c in table_channels if c == channel_id or get_game(c) or get_lobby(c) or c in _tables]
+    if busy:
+        raise ValueError(f"<#{busy[0]}> is already in use.")
+
+    tournament = Tournament(
+        lobby.players, lobby.config, table_channels, get_repository(), rounds=rounds,
+        table_factory=partial(start_table, host_id=lobby.host.id)
+    )
+    remove_lobby(channel_id)
+    _tournaments[channel_id] = tournament
+    _hosts[channel_id] = str(lobby.host.id)
+    for c in table_channels:
+        _tables[c] = channel_id
+    _runners[channel_id] = asyncio.create_task(_run(channel_id, tournament))
+    return tournament
+
+async def drop_player(channel_id: int, player_id: str) -> bool:
+    """Drops `player_id` from the tournament playing in `channel_id`;
+    False if they are not in it."""
+    tournament = get_tournament(channel_id)
+    entrant = tournament.entrants.get(str(player_id)) if tournament else None
+    if entrant is None or entrant.dropped:
+        return False
+    table = tournament.table_of(player_id)
+    if table is None:
+        await tournament.drop(player_id)
+        return True
+
+    # the table's game changes, so wait our turn behind its other actions
+    round_before = table.game.state.round_number
+    await run_serialized(table.channel_id, tournament.drop, player_id)
+    post(_bot.get_channel(table.channel_id), f"🚪 **{entrant.name}** has left the tournament.")
+    if table.done:
+        return True
+    # the table plays on without them; no phase change saves that
+    save_game(table.game)
+    if table.game.state.round_number != round_before:
+        # the round was void; no phase change announces the fresh prompt
+        await announce_round_start(_bot.get_channel(table.channel_id), table.game)
+    return True
+
+def format_standings(tournament: Tournament, count: Optional[int] = STANDINGS_SHOWN) -> str:
+    lines = []
+    for rank, e in tournament.standings.top(count):
+        flag = " (dropped)" if e.dropped else ""
+        pts_label = "point" if e.points == 1 else "points"
+        rounds_label = "round" if e.rounds_won == 1 else "rounds"
+        lines.append(f"{rank_label(rank)} {e.name}{flag} - {e.points} {pts_label}, {e.rounds_won} {rounds_label} won")
+    hidden = len(tournament.standings) - len(lines)
+    if hidden > 0:
+        lines.append(f"…and {hidden} more.")
+    return "\n".join(lines)
+
+# ─── Runner ─────────────────────────────────────────────────────
+
+async def _run(channel_id: int, tournament: Tournament) -> None:
+    channel = _bot.get_channel(channel_id)
+    try:
+        while not tournament.finished:
+            tables = await tournament.start_round()
+            post(channel,
+                 f"🃏 **Round {tournament.round} of {tournament.rounds}** is on, at "
+                 + ", ".join(f"<#{t.channel_id}>" for t in tables) + ".",
+                 priority=Priority.INTERACTIVE)
+            for table in tables:
+                mentions = " ".join(f"<@{pid}>" for pid in table.seats)
+                post(_bot.get_channel(table.channel_id),
+                     f"🃏 Tournament round {tournament.round}: {mentions}, this is your table!")
+            await _wait_round(tournament)
+            post(channel, f"📊 **Standings after round {tournament.round}**\n{format_standings(tournament)}")
+        post(channel, f"🏆 **The tournament is over!**\n{format_standings(tournament)}",
+             priority=Priority.INTERACTIVE)
+    except Exception:
+        log.exception("Tournament in channel %s failed", channel_id)
+        post(channel, "❌ Something went wrong and the tournament had to stop.", priority=Priority.INTERACTIVE)
+    finally:
+        _forget(channel_id, tournament)
+
+async def _wait_round(tournament: Tournament) -> None:
+    """Waits for every table to finish.  Tables whose game was taken down
+    some other way (`/stop`, the idle sweeper) are scored as they stood."""
+    while True:
+        try:
+            await asyncio.wait_for(tournament.wait_round(), SWEEP_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            for table in list(tournament.tables.values()):
+                if not table.done and get_game(table.channel_id) is not table.game:
+                    tournament.abandon_table(table.channel_id)
+
+def _forget(channel_id: int, tournament: Tournament) -> None:
+    _tournaments.pop(channel_id, None)
+    _runners.pop(channel_id, None)
+    _hosts.pop(channel_id, None)
+    for c in tournament.channel_ids:
+        _tables.pop(c, None)
+
+def stop_tournament(channel_id: int) -> bool:
+    """Stops seating new rounds of the tournament registered in, or playing
+    a table in, `channel_id`; tables already playing finish as single games."""
+    channel_id = _tables.get(channel_id, channel_id)
+    task = _runners.get(channel_id)
+    if task is None:
+        return False
+    task.cancel()
+    _forget(channel_id, _tournaments[channel_id])
+    return True
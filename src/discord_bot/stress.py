@@ -0,0 +1,241 @@
+# discord_bot/stress.py
+"""Multi-game stress harness against the fake Discord transport.
+
+Drives many channels through complete games at once on a single event
+loop, using the real cogs' handlers and views with bot players clicking
+buttons and picking from selects, and reports per-interaction latency,
+event-loop lag, API call volume and memory:
+
+    python -m discord_bot.stress --channels 200 --sleep-scale 0.01
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import resource
+import tracemalloc
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from discord.ui import Select
+
+from cards_engine.game_phases           import Phase
+from cards_engine.player                import Player
+from cards_engine.simulator             import SimulationStats
+from discord_bot.fake_discord           import FakeBot, FakeChannel, FakeInteraction, FakeUser
+from discord_bot.services               import game_flow, outbound
+from discord_bot.services.outbound      import OutboundScheduler, get_outbound, set_outbound, outbound_metrics
+from discord_bot.services.game_flow     import handle_join, handle_draft, handle_skip
+from discord_bot.services.command_queue import get_queue
+from discord_bot.services.snapshot_store import SnapshotStore, set_store
+from discord_bot.services.game_manager  import create_lobby, start_game, set_bot, set_event_log_dir
+from discord_bot.services.state_manager import get_game, get_repository
+from discord_bot.views.play_button_view import PlayButtonView
+from discord_bot.views.judge_button_view import JudgeButtonView
+from discord_bot.views.play_view        import PlayView
+from discord_bot.services.component_router import dispatch_component
+
+WAIT_TIMEOUT = 60.0
+
+@dataclass
+class StressStats(SimulationStats):
+    api_calls: int = 0
+    queue_max_depth: int = 0
+
+def scale_sleeps(factor: float) -> None:
+    """Shrinks the reveal pacing and speeds up the outbound rate limits by
+    the same factor so a run finishes in reasonable wall-clock time."""
+    game_flow.set_reveal_pace(factor)
+    set_outbound(OutboundScheduler(
+        channel_rate = outbound.CHANNEL_RATE / factor if factor else None,
+        global_rate  = outbound.GLOBAL_RATE / factor if factor else None,
+    ))
+
+class ChannelDriver:
+    """Plays one channel's game from lobby to leaderboard."""
+
+    def __init__(self, bot: FakeBot, channel: FakeChannel, users: List[FakeUser],
+                 rng: random.Random, stats: StressStats):
+        self.bot = bot
+        self.channel = channel
+        self.users = {str(u.id): u for u in users}
+        self.rng = rng
+        self.stats = stats
+
+    async def timed(self, action: str, coro):
+        started = time.perf_counter()
+        result = await coro
+        self.stats.record(action, time.perf_counter() - started)
+        return result
+
+    async def run(self, config_overrides: dict) -> None:
+        host = next(iter(self.users.values()))
+        lobby = create_lobby(self.channel.id, host_id=host.id, host_name=host.display_name)
+        lobby.players.append(Player(id=str(host.id), name=host.display_name))
+        for user in list(self.users.values())[1:]:
+            await self.timed("join", handle_join(FakeInteraction(user, self.channel)))
+        lobby.config = replace(lobby.config, **config_overrides)
+
+        game = await self.timed("start", start_game(self.channel.id))
+        queue = get_queue(self.channel.id)
+        seen = 0
+        while get_game(self.channel.id) is game and game.state.phase is not Phase.FINISHED:
+            phase = game.state.phase
+            if phase is Phase.DRAFT_PICKING:
+                await self.draft_round(game)
+            elif phase is Phase.SUBMISSIONS:
+                seen = await self.submission_round(game, seen)
+            elif phase is Phase.JUDGING:
+                seen = await self.judging(game, seen)
+                self.stats.rounds += 1
+        await game.phase_events.drain()
+        self.stats.games += 1
+        self.stats.queue_max_depth = max(self.stats.queue_max_depth, queue.metrics.max_depth)
+        for waited in queue.metrics.waits:
+            self.stats.record("queue_wait", waited)
+
+    async def draft_round(self, game) -> None:
+        # one pick per player per pass, like people re-running /draft
+        for player in list(game.state.players):
+            if game.state.phase is not Phase.DRAFT_PICKING:
+                return
+            inter = FakeInteraction(self.users[player.id], self.channel)
+            await self.timed("draft_open", handle_draft(inter, game))
+            await self.timed("draft_pick", self.choose(inter.last_view, self.users[player.id]))
+
+    async def submission_round(self, game, seen: int) -> int:
+        found = await self.channel.wait_for(
+            lambda: self.channel.latest_view(PlayButtonView, after=seen), WAIT_TIMEOUT)
+        seen, button_view = found[0] + 1, found[1]
+
+        judge = game.state.current_judge
+        pick = game.state.current_prompt.pick
+        if any(len(p.hand) < pick for p in game.state.players if p is not judge):
+            await self.timed("skip", handle_skip(
+                FakeInteraction(self.users[judge.id], self.channel), game))
+            return seen
+        # every non-judge plays at once, as they would in a busy channel
+        await asyncio.gather(*(
+            self.play_cards(button_view, self.users[p.id])
+            for p in list(game.state.players) if p is not judge
+        ))
+        return seen
+
+    async def play_cards(self, button_view: PlayButtonView, user: FakeUser) -> None:
+        inter = await self.timed("play_button", self.click(button_view, user))
+        view = inter.last_view
+        while isinstance(view, PlayView):
+            inter = await self.timed("play_pick", self.choose(view, user))
+            view = inter.last_view
+
+    async def judging(self, game, seen: int) -> int:
+        found = await self.channel.wait_for(
+            lambda: self.channel.latest_view(JudgeButtonView, after=seen), WAIT_TIMEOUT)
+        seen, button_view = found[0] + 1, found[1]
+
+        judge = self.users[game.state.current_judge.id]
+        inter = await self.timed("judge_button", self.click(button_view, judge))
+        await self.timed("judge_pick", self.choose(inter.last_view, judge))
+        return seen
+
+    async def click(self, view, user: FakeUser) -> FakeInteraction:
+        """Presses the view's button, routed by custom_id like the real bot."""
+        button = next(c for c in view.children if not isinstance(c, Select))
+        inter = FakeInteraction(user, self.channel, {"custom_id": button.custom_id})
+        await dispatch_component(inter)
+        return inter
+
+    async def choose(self, view, user: FakeUser) -> FakeInteraction:
+        """Picks a random option from the view's select."""
+        select = next(c for c in view.children if isinstance(c, Select))
+        value = self.rng.choice(select.options).value
+        inter = FakeInteraction(user, self.channel, {"custom_id": select.custom_id, "values": [value]})
+        await dispatch_component(inter)
+        return inter
+
+async def monitor_loop_lag(stats: StressStats, interval: float, stop: asyncio.Event) -> None:
+    """Records how late the loop wakes up a timer: a direct measure of how
+    long other callbacks hog it."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stats.record("loop_lag", max(0.0, time.perf_counter() - started - interval))
+
+async def run_stress(channels: int, rng: random.Random, players: int = 4,
+                     score_limit: int = 3, draft_ratio: float = 0.0,
+                     lag_interval: float = 0.01) -> StressStats:
+    bot = FakeBot()
+    set_bot(bot)
+    set_store(SnapshotStore(":memory:"))   # exercise snapshots without touching the bot's file
+    set_event_log_dir(None)
+    repo = get_repository()
+    stats = StressStats()
+
+    drivers = []
+    for c in range(channels):
+        channel = bot.add_channel(900_000 + c)
+        users = [FakeUser(10_000 * (c + 1) + i, f"Bot{c}-{i}") for i in range(players)]
+        overrides = dict(
+            expansions  = repo.available_expansions(),
+            regions     = {r: True for r in repo.available_regions()},
+            score_limit = score_limit,
+            draft_mode  = rng.random() < draft_ratio,
+            seed        = rng.randrange(2**32),
+        )
+        drivers.append((ChannelDriver(bot, channel, users, random.Random(rng.random()), stats), overrides))
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(monitor_loop_lag(stats, lag_interval, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(driver.run(overrides) for driver, overrides in drivers))
+    await get_outbound().drain()
+    stats.seconds = time.perf_counter() - started
+    stop.set()
+    await lag_task
+
+    stats.api_calls = len(bot.api_log)
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Drive many simultaneous fake-Discord games on one event loop.")
+    p.add_argument('-c', '--channels', type=int, default=100)
+    p.add_argument('-p', '--players', type=int, default=4)
+    p.add_argument('--score-limit', type=int, default=3)
+    p.add_argument('--draft-ratio', type=float, default=0.0)
+    p.add_argument('--sleep-scale', type=float, default=0.01,
+                   help="multiplier for reveal pacing and rate-limit windows (1 = real time)")
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--tracemalloc', action='store_true',
+                   help="report Python heap peak instead of process RSS (slower)")
+    args = p.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    scale_sleeps(args.sleep_scale)
+    get_repository()  # load cards before the clock starts
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    stats = asyncio.run(run_stress(
+        args.channels, random.Random(seed),
+        players     = args.players,
+        score_limit = args.score_limit,
+        draft_ratio = args.draft_ratio,
+    ))
+    if args.tracemalloc:
+        stats.peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+    else:
+        stats.peak_memory_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"seed: {seed}  channels: {args.channels}  sleep scale: {args.sleep_scale}")
+    print(f"api calls: {stats.api_calls} ({stats.api_calls / max(stats.games, 1):.1f}/game)  "
+          f"max queue depth: {stats.queue_max_depth}")
+    sched = outbound_metrics()
+    print(f"outbound: {sched['sent']} sent, {sched['edited']} edits, {sched['coalesced']} coalesced, "
+          f"delay p50 {sched['delay_p50_ms']:.1f} ms, p99 {sched['delay_p99_ms']:.1f} ms")
+    print(stats.report())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# discord_bot/views/components.py
+"""custom_id scheme for the game's stateless components.
+
+Every button and select the game posts carries everything needed to act
+on a click in its custom_id:
+
+    cab:<action>:<channel_id>:<round>[:<arg>]
+
+so no view object has to be kept per message.  Clicks are routed by
+`services.component_router`, which checks the round against the game's
+current one and rejects stale components; because nothing lives in
+memory, components posted before a restart keep working after it.
+"""
+
+from dataclasses import dataclass
+from typing      import Optional
+
+PREFIX = "cab"
+
+# actions
+JOIN    = "join"      # lobby join button
+PLAY    = "play"      # round button that opens a player's hand
+PICK    = "pick"      # hand select; arg is the hand indices picked so far
+JUDGE   = "judge"     # button that opens the judge's select
+VERDICT = "verdict"   # judge select over the anonymous submissions
+DRAFT   = "draft"     # draft select; arg is how many cards the player has kept
+
+@dataclass(frozen=True)
+class ComponentId:
+    action:     str
+    channel_id: int
+    round:      int
+    arg:        str = ""
+
+    def __str__(self) -> str:
+        base = f"{PREFIX}:{self.action}:{self.channel_id}:{self.round}"
+        return f"{base}:{self.arg}" if self.arg else base
+
+def custom_id(action: str, channel_id: int, round: int = 0, arg: str = "") -> str:
+    return str(ComponentId(action, channel_id, round, arg))
+
+def parse_custom_id(value: Optional[str]) -> Optional[ComponentId]:
+    """The ComponentId encoded in `value`, or None if it is not one of ours."""
+    if not value or not value.startswith(PREFIX + ":"):
+        return None
+    parts = value.split(":", 4)
+    if len(parts) < 4:
+        return None
+    try:
+        return ComponentId(parts[1], int(parts[2]), int(parts[3]), parts[4] if len(parts) == 5 else "")
+    except ValueError:
+        return None
+
+def encode_picks(picks) -> str:
+    return ".".join(str(i) for i in picks)
+
+def decode_picks(arg: str):
+    return [int(i) for i in arg.split(".") if i]
@@ -0,0 +1,96 @@
+# discord_bot/views/hand_options.py
+"""Cached select options for players' hands and draft packs.
+
+A hand only changes between rounds, but its select is rebuilt for every
+blank of a multi-blank prompt and every time `/play` is reopened.  Its
+options are built once per distinct hand (keyed by the card ids in
+order) and reused; later blanks just leave out the indices already picked.
+
+Draft packs move to the next seat after every pass, so their options are
+valued by card id rather than position and cached per channel: a pack
+rendered for one player is reused as-is by the next, minus the card taken.
+
+Both keys are the cards themselves, not the lists holding them, so a
+`RemoteGame` mirror, whose hands are rebuilt from card ids as they change,
+hits the cache too.
+"""
+
+from collections import OrderedDict
+from typing      import Dict, Iterable, List, Tuple
+
+from discord import SelectOption
+
+HAND_LABEL_LIMIT  = 80
+DRAFT_LABEL_LIMIT = 100
+MAX_ENTRIES = 4096   # hands and draft channels kept; least recently used go first
+
+class HandOptionCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._hands: "OrderedDict[Tuple[int, str], Tuple[Tuple[int, ...], List[SelectOption]]]" = OrderedDict()
+        self._drafts: "OrderedDict[int, Dict[int, SelectOption]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._hands) + len(self._drafts)
+
+    def _touch(self, entries: OrderedDict, key) -> None:
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def hand(self, channel_id: int, player_id: str, cards, exclude: Iterable[int] = ()) -> List[SelectOption]:
+        """One option per card, valued by its index in `cards`, leaving out
+        the indices in `exclude`.  The list is new; the options are shared."""
+        key = (channel_id, player_id)
+        ids = tuple(c.card_id for c in cards)
+        entry = self._hands.get(key)
+        if entry is not None and entry[0] == ids:
+            self.hits += 1
+            rendered = entry[1]
+        else:
+            self.misses += 1
+            rendered = [SelectOption(label=c.text[:HAND_LABEL_LIMIT], value=str(i)) for i, c in enumerate(cards)]
+            self._hands[key] = (ids, rendered)
+        self._touch(self._hands, key)
+        if not exclude:
+            return list(rendered)
+        skip = set(exclude)
+        return [opt for i, opt in enumerate(rendered) if i not in skip]
+
+    def draft(self, channel_id: int, cards) -> List[SelectOption]:
+        """One option per card, valued by card id."""
+        rendered = self._drafts.get(channel_id)
+        if rendered is None:
+            rendered = self._drafts[channel_id] = {}
+        self._touch(self._drafts, channel_id)
+        options = []
+        for c in cards:
+            opt = rendered.get(c.card_id)
+            if opt is None:
+                self.misses += 1
+                opt = rendered[c.card_id] = SelectOption(label=c.text[:DRAFT_LABEL_LIMIT], value=str(c.card_id))
+            else:
+                self.hits += 1
+            options.append(opt)
+        return options
+
+    def forget_channel(self, channel_id: int) -> None:
+        self._drafts.pop(channel_id, None)
+        for key in [k for k in self._hands if k[0] == channel_id]:
+            del self._hands[key]
+
+_cache = HandOptionCache()
+
+def get_cache() -> HandOptionCache:
+    return _cache
+
+def hand_options(channel_id: int, player_id: str, cards, exclude: Iterable[int] = ()) -> List[SelectOption]:
+    return _cache.hand(channel_id, player_id, cards, exclude)
+
+def draft_options(channel_id: int, cards) -> List[SelectOption]:
+    return _cache.draft(channel_id, cards)
+
+def forget_channel(channel_id: int) -> None:
+    _cache.forget_channel(channel_id)
@@ -1,15 +1,17 @@
 # judge_button_view.py
 
 import discord
-from discord.ui import View
-from discord_bot.views.judge_view import JudgeView
+from discord.ui import View, Button
+from discord_bot.views.components import custom_id, JUDGE
 
 class JudgeButtonView(View):
-    def __init__(self, game, on_judge_button):
-        super().__init__(timeout=None)
-        self.game = game
-        self.on_judge_button = on_judge_button
+    """The "Judge!" button posted once every submission is revealed;
+    stateless like `PlayButtonView`."""
 
-    @discord.ui.button(label="Judge!", style=discord.ButtonStyle.primary)
-    async def judge_button(self, button, interaction):
-        await self.on_judge_button(interaction, self.game)
\ No newline at end of file
+    def __init__(self, game):
+        super().__init__(timeout=None, store=False)
+        self.add_item(Button(
+            label="Judge!",
+            style=discord.ButtonStyle.primary,
+            custom_id=custom_id(JUDGE, game.channel_id, game.state.round_number)
+        ))
@@ -1,12 +1,16 @@
 import discord
-from discord.ui import View
+from discord.ui import View, Button
+from discord_bot.views.components import custom_id, PLAY
 
 class PlayButtonView(View):
-    def __init__(self, game, on_play_button):
-        super().__init__(timeout=None)
-        self.game = game
-        self.on_play_button = on_play_button
+    """The round's "Select responses!" button.  Stateless: clicks are
+    routed by `component_router` from the custom_id, so the view is not
+    kept in the client's view store."""
 
-    @discord.ui.button(label="Select responses!", style=discord.ButtonStyle.primary)
-    async def play_button(self, button, interaction):
-        await self.on_play_button(interaction, self.game)
\ No newline at end of file
+    def __init__(self, game):
+        super().__init__(timeout=None, store=False)
+        self.add_item(Button(
+            label="Select responses!",
+            style=discord.ButtonStyle.primary,
+            custom_id=custom_id(PLAY, game.channel_id, game.state.round_number)
+        ))
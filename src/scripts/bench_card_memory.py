@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Measure bytes per card for the current slotted Card against the
+original dict-per-card dataclass, built from the same data files."""
+import os
+import re
+import sys
+import time
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from glob import glob
+from typing import Mapping, Optional
+
+# run as a plain script from anywhere; the engine lives next to scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cards_engine.card import Card
+from cards_engine.card_repository import CardRepository, expansion_name
+
+@dataclass(frozen=True)
+class LegacyCard:
+    """The Card layout before interning: one regions dict per card and a
+    regex scan on every blank lookup."""
+    text: str
+    card_type: str
+    pick: int
+    regions: Mapping[str, bool]
+    expansion: Optional[str] = None
+
+    @property
+    def num_blanks(self) -> int:
+        return len(re.findall(r'_{3,}', self.text))
+
+def build(card_cls, raw_files):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cards = [
+        card_cls(
+            text      = raw["text"],
+            card_type = raw["type"],
+            pick      = raw.get("pick", 1),
+            regions   = dict(raw["regions"]),
+            expansion = expansion,
+        )
+        for expansion, raws in raw_files
+        for raw in raws
+    ]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return cards, used
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument('-d', '--data-dir', default=os.path.join(here, "..", "..", "data"))
+    args = p.parse_args()
+
+    files = sorted(glob(os.path.join(args.data_dir, "*.json*")))
+    if not files:
+        sys.exit(f"No data files in {args.data_dir}")
+    # the raw texts are shared by both variants, so only per-card overhead is counted
+    raw_files = [(expansion_name(fn), CardRepository._load_file(fn)) for fn in files]
+
+    print(f"{'VARIANT':8}  {'cards':>7}  {'bytes/card':>10}  {'num_blanks us':>13}")
+    print("-" * 45)
+    for name, cls in [("legacy", LegacyCard), ("slotted", Card)]:
+        cards, used = build(cls, raw_files)
+        started = time.perf_counter()
+        for c in cards:
+            c.num_blanks
+        per_call = (time.perf_counter() - started) / len(cards) * 1e6
+        print(f"{name:8}  {len(cards):>7}  {used / len(cards):>10.1f}  {per_call:>13.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Compare CardRepository startup time and memory for the JSON/zstd data
+files against a precompiled card pack built from the same files.
+
+Each measurement runs in a fresh interpreter so RSS numbers are not
+polluted by earlier runs.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+import time
+from glob import glob
+
+# run as a plain script from anywhere; the engine lives next to scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cards_engine.card_pack import write_pack
+from cards_engine.card_repository import CardRepository, expansion_name
+
+def current_rss_kb() -> int:
+    """Resident set size right now.  `ru_maxrss` is a high-water mark, so
+    differences of it say nothing about what a load left behind."""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+def measure(pattern: str, workers: int) -> dict:
+    """Runs inside the child process."""
+    import contextlib, io
+    rss_before = current_rss_kb()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        repo = CardRepository(pattern, workers=workers)
+    load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    black = repo.filter(card_type="prompt", regions={r: True for r in repo.available_regions()},
+                        min_pick=1, max_pick=3)
+    white = repo.filter(card_type="response", expansions=repo.available_expansions()[:1])
+    filter_s = time.perf_counter() - started
+
+    rss_after = current_rss_kb()
+    return {
+        "cards": len(repo),
+        "load_ms": load_s * 1000,
+        "filter_ms": filter_s * 1000,
+        "filtered": len(black) + len(white),
+        "rss_kb": rss_after - rss_before,
+    }
+
+def run_child(pattern: str, workers: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", pattern, "--workers", str(workers)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    default_data = os.path.join(here, "..", "..", "data")
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument('-d', '--data-dir', default=default_data)
+    p.add_argument('-n', '--runs', type=int, default=5)
+    p.add_argument('--child', help=argparse.SUPPRESS)
+    p.add_argument('--workers', type=int, default=0, help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.workers)))
+        return
+
+    json_pattern = os.path.join(args.data_dir, "*.json*")
+    files = sorted(glob(json_pattern))
+    if not files:
+        sys.exit(f"No data files match {json_pattern}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pack_path = os.path.join(tmp, "cards.cardpack")
+        write_pack(pack_path, [(expansion_name(fn), CardRepository._load_file(fn)) for fn in files])
+
+        variants = [
+            ("json/zstd x1", json_pattern, 1),
+            ("json/zstd", json_pattern, 0),
+            ("cardpack", pack_path, 0),
+        ]
+        print(f"{'VARIANT':12}  {'cards':>7}  {'load ms':>9}  {'filter ms':>9}  {'rss KB':>8}")
+        print("-" * 54)
+        for name, pattern, workers in variants:
+            runs = [run_child(pattern, workers) for _ in range(args.runs)]
+            best = min(runs, key=lambda r: r["load_ms"])
+            rss = sorted(r["rss_kb"] for r in runs)[len(runs) // 2]
+            print(f"{name:12}  {best['cards']:>7}  {best['load_ms']:>9.2f}  "
+                  f"{best['filter_ms']:>9.2f}  {rss:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Microbenchmark Card.format_prompt for 0-, 1-, 2- and 3-blank prompts:
+the original per-call regex implementation, a freshly compiled template,
+and the cached render path used by the bot."""
+import os
+import re
+import sys
+import argparse
+import timeit
+from typing import List
+
+# run as a plain script from anywhere; the engine lives next to scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cards_engine.prompt_template import PromptTemplate, render_prompt, strip_single_terminal_punct
+
+PROMPTS = {
+    0: "What's that smell?",
+    1: "During sex, I like to think about ____.",
+    2: "Step 1: ____. Step 2: ____. Step 3: Profit.",
+    3: "____ + ____ = ____.",
+}
+RESPONSES = ["The Boy Scouts of America.", "A windmill full of corpses.", "Bees?"]
+
+def legacy_format_prompt(text: str, responses: List[str]) -> str:
+    """Card.format_prompt as it was before templates."""
+    n = len(re.findall(r'_{3,}', text))
+    if n > 0:
+        def replacer(match):
+            idx = replacer.idx
+            replacer.idx += 1
+            if idx < len(responses):
+                resp = strip_single_terminal_punct(responses[idx])
+                start = match.start()
+                prev_char = text[start-1] if start > 0 else ""
+                if prev_char not in ".!?" and re.match(r"^(The|A|An)\b", resp):
+                    resp = resp[0].lower() + resp[1:]
+                return f"**{resp}**"
+            return match.group(0)
+        replacer.idx = 0
+        return re.sub(r'_{3,}', replacer, text)
+    resp_text = " ".join(f"**{resp}**" for resp in responses)
+    return f"{text} {resp_text}" if resp_text else text
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument('-n', '--number', type=int, default=20000)
+    args = p.parse_args()
+
+    print(f"{'BLANKS':6}  {'legacy us':>10}  {'compile+render us':>17}  {'render us':>10}  {'cached us':>10}")
+    print("-" * 62)
+    for blanks, text in PROMPTS.items():
+        responses = RESPONSES[:max(blanks, 1)]
+        resp_tuple = tuple(responses)
+        template = PromptTemplate(text)
+        assert template.render(responses) == legacy_format_prompt(text, responses)
+
+        def per_call(fn):
+            return min(timeit.repeat(fn, number=args.number, repeat=3)) / args.number * 1e6
+
+        legacy   = per_call(lambda: legacy_format_prompt(text, responses))
+        compiled = per_call(lambda: PromptTemplate(text).render(responses))
+        render   = per_call(lambda: template.render(responses))
+        cached   = per_call(lambda: render_prompt(text, resp_tuple))
+        print(f"{blanks:6}  {legacy:>10.2f}  {compiled:>17.2f}  {render:>10.2f}  {cached:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Measure what persisting a snapshot on every phase change costs.
+
+Plays simulated games with the bot's SQLite snapshot listener attached
+(writing to a temporary database) and compares the snapshot latency and
+size with the engine actions around it.
+"""
+import os
+import sys
+import random
+import asyncio
+import argparse
+import tempfile
+import time
+
+# run as a plain script from anywhere; the engine lives next to scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cards_engine.card_repository import get_shared_repository
+from cards_engine.simulator import SimulationStats, play_game, random_config
+from cards_engine.snapshot import snapshot_game, dumps
+from discord_bot.services.snapshot_store import SnapshotStore
+
+async def run(games: int, seed: int, store: SnapshotStore) -> tuple:
+    repo = get_shared_repository()
+    # bot decisions come from here; every game's decks get their own seed
+    # from it through random_config, as the bot's games do
+    rng = random.Random(seed)
+    stats = SimulationStats()
+    sizes = []
+
+    def persist(game, old, new):
+        started = time.perf_counter()
+        blob = dumps(snapshot_game(game))
+        stats.record("encode", time.perf_counter() - started)
+        store.save(game.channel_id or 0, blob)
+        stats.record("snapshot", time.perf_counter() - started)
+        sizes.append(len(blob))
+
+    started = time.perf_counter()
+    while stats.games < games:
+        num_players = rng.randint(3, 8)
+        config = random_config(repo, rng, rng.random() < 0.25, num_players)
+        if config is not None:
+            await play_game(repo, config, num_players, rng, stats,
+                            setup=lambda game: game.add_phase_listener(persist))
+    stats.seconds = time.perf_counter() - started
+    return stats, sizes
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument('-n', '--games', type=int, default=200)
+    p.add_argument('--seed', type=int, default=1)
+    p.add_argument('--db', default=None, help="database path, defaults to a temporary file")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SnapshotStore(args.db or os.path.join(tmp, "games.sqlite3"))
+        stats, sizes = asyncio.run(run(args.games, args.seed, store))
+        store.close()
+
+    print(stats.report())
+    per_round = sum(stats.latencies["snapshot"]) / max(stats.rounds, 1)
+    print(f"\nsnapshots: {len(sizes)}  avg size: {sum(sizes) / len(sizes):.0f} B  max size: {max(sizes)} B")
+    print(f"snapshot time per round: {per_round * 1e6:.1f} us")
+
+if __name__ == '__main__':
+    main()
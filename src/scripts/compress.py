@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 import os
+import sys
 import json
 import argparse
 from pathlib import Path
 
 import zstandard as zstd
 
+# run as a plain script from anywhere; the engine lives next to scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cards_engine.card_pack import write_pack
+from cards_engine.card_repository import expansion_name
+
 def process_json_file(src_path: Path, dst_path: Path):
     # read original
     orig_bytes = src_path.read_bytes()
@@ -27,7 +33,7 @@ def process_json_file(src_path: Path, dst_path: Path):
     comp_path = dst_path.with_suffix(dst_path.suffix + '.zst')
     comp_path.write_bytes(comp)
 
-    return orig_size, min_size, comp_size
+    return orig_size, min_size, comp_size, data
 
 def human_fmt(n: int):
     for unit in ['B','KB','MB','GB']:
@@ -42,7 +48,10 @@ def main():
     )
     p.add_argument('-i','--input-dir', default='data_raw')
     p.add_argument('-o','--output-dir', default='data')
+    p.add_argument('-p','--pack', default=None,
+                   help="also compile every card into one memory-mappable pack, e.g. data/cards.cardpack")
     args = p.parse_args()
+    packs = []
 
     total_orig = total_min = total_comp = 0
     print(f"{'FILE':60}  {'orig':>9}  {'min':>9}  {'min%':>6}  {'zst':>9}  {'zst%':>6}")
@@ -55,8 +64,9 @@ def main():
                 rel = src.relative_to(args.input_dir)
                 dst = Path(args.output_dir)/rel
 
-                o,m,c = process_json_file(src, dst)
+                o,m,c,data = process_json_file(src, dst)
                 total_orig+=o; total_min+=m; total_comp+=c
+                packs.append((str(rel), data))
 
                 print(f"{str(rel):60}  {human_fmt(o):>9}  {human_fmt(m):>9}  {(m/o):>5.1%}  {human_fmt(c):>9}  {(c/o):>5.1%}")
 
@@ -65,5 +75,12 @@ def main():
           f"minified = {human_fmt(total_min)} ({total_min/total_orig:.1%}), "
           f"zst = {human_fmt(total_comp)} ({total_comp/total_orig:.1%})")
 
+    if args.pack:
+        # same file order and expansion names as CardRepository's JSON loader
+        packs.sort(key=lambda item: item[0])
+        count = write_pack(args.pack, [(expansion_name(rel), data) for rel, data in packs])
+        size = os.path.getsize(args.pack)
+        print(f"  Card pack = {args.pack}: {count} cards, {human_fmt(size)} ({size/total_orig:.1%})")
+
 if __name__=='__main__':
     main()
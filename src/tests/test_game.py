@@ -1,13 +1,81 @@
+import os
 import pytest
 from cards_engine.game            import Game
 from cards_engine.game_config     import GameConfig
 from cards_engine.card_repository import CardRepository
 from cards_engine.player          import Player
 from cards_engine.game_phases     import Phase
+from cards_engine.deck            import Deck
+
+REGIONS = ("us", "uk", "ca", "au", "intl")
+
+# (file, prompts, responses): zstd packs plus one plain JSON file, the two
+# formats the loader reads
+CARD_FILES = (("base_pack.json.zst", 120, 500), ("fantasy_pack.json.zst", 30, 120),
+              ("tiny_pack.json.zst", 8, 30), ("bubba.json", 20, 60))
+
+@pytest.fixture(scope="session")
+def card_data(tmp_path_factory):
+    """Generated card files for the whole run; returns their glob pattern."""
+    import json
+    import random
+    import zstandard
+    rng = random.Random(0)
+    root = tmp_path_factory.mktemp("cards")
+    for fn, prompts, responses in CARD_FILES:
+        name = fn.split(".")[0]
+        cards = []
+        for i in range(prompts):
+            pick = rng.choice((1, 1, 1, 2, 3))
+            text = f"What is {name} prompt {i}?" if i % 5 == 4 else \
+                   f"Prompt {i}: " + " and ".join(["____"] * pick) + "."
+            cards.append({"text": text, "type": "prompt", "pick": 1 if "?" in text else pick,
+                          "regions": {r: rng.random() < 0.8 for r in REGIONS}})
+        for i in range(responses):
+            article = rng.choice(("A ", "An ", "The ", ""))
+            cards.append({"text": f"{article}response {i} from {name}.", "type": "response",
+                          "regions": {r: rng.random() < 0.8 for r in REGIONS}})
+        blob = json.dumps(cards).encode()
+        if fn.endswith(".zst"):
+            blob = zstandard.ZstdCompressor().compress(blob)
+        (root / fn).write_bytes(blob)
+    return str(root / "*.json*")
+
+@pytest.fixture(autouse=True)
+def default_card_data(monkeypatch, card_data):
+    """Points the default data pattern, and so the process-wide repository
+    the bot uses, at the generated cards instead of data/."""
+    from cards_engine import card_repository
+    monkeypatch.setattr(CardRepository, "_default_path_pattern", lambda self: card_data)
+    monkeypatch.setattr(card_repository, "_shared_repo", None)
+
+@pytest.fixture
+def repo(card_data):
+    return CardRepository(card_data)
+
+@pytest.fixture
+def small(tmp_path):
+    """A one-expansion ("tiny") repository of two prompts and ten responses,
+    barely more than a three-player deal, written to tmp_path/tiny.json."""
+    import json
+    cards = [{"text": f"Prompt {i} ____.", "type": "prompt", "pick": 1, "regions": {"us": True}}
+             for i in range(2)]
+    cards += [{"text": f"Response {i}", "type": "response", "regions": {"us": True}}
+              for i in range(10)]
+    (tmp_path / "tiny.json").write_text(json.dumps(cards))
+    return CardRepository(str(tmp_path / "*.json"))
 
 @pytest.fixture
-def repo():
-    return CardRepository()
+def registry(monkeypatch):
+    """Empty channel registry and no bot for the test; whatever the test
+    registers is dropped again afterwards."""
+    pytest.importorskip("discord")
+    from discord_bot.services import game_manager, state_manager
+    for name in ("_games", "_lobbies", "_shards", "_activity", "_views"):
+        monkeypatch.setattr(state_manager, name, {})
+    monkeypatch.setattr(state_manager, "_evicted", {"games": 0, "lobbies": 0})
+    monkeypatch.setattr(game_manager, "_bot", None)
+    return state_manager
 
 @pytest.fixture
 def players():
@@ -178,6 +246,322 @@ async def test_game_state_reset(repo, players):
     assert all(p.id not in game.state.submissions for p in game.state.players)
     assert game.state.current_prompt is None
 
+@pytest.mark.asyncio
+async def test_player_index_and_outstanding_count(repo, players):
+    """Id lookups and the outstanding-submitter count follow joins, leaves
+    and submissions."""
+    cfg = GameConfig(
+        expansions=repo.available_expansions(),
+        regions={r: True for r in repo.available_regions()},
+        draft_mode=False,
+        hand_size=3
+    )
+    game = Game(players, cfg, repo)
+    await game.start()
+    state = game.state
+    assert state.player_by_id(players[1].id) is players[1]
+    assert state.player_by_id(int(players[1].id)) is players[1]
+    assert state.outstanding_submitters == len(players) - 1
+
+    judge_id = state.current_judge.id
+    submitter = next(p for p in state.players if p.id != judge_id)
+    await game.submit(submitter.id, list(range(state.current_prompt.pick)))
+    assert state.outstanding_submitters == len(players) - 2
+
+    state.remove_player(submitter.id)
+    assert state.player_by_id(submitter.id) is None
+    assert state.current_judge.id == judge_id
+    assert state.outstanding_submitters == len(state.players) - 1
+
+    newcomer = Player(id="99", name="Late")
+    state.add_player(newcomer)
+    assert state.player_by_id("99") is newcomer
+    assert state.outstanding_submitters == len(state.players) - 1
+
+def test_deck_draws_each_card_once():
+    """Lazy shuffling still deals out every id exactly once."""
+    import random
+    cards = [f"card{i}" for i in range(50)]
+    deck = Deck(cards, list(range(50)), rng=random.Random(7))
+    drawn = [deck.pop() for _ in range(50)]
+    assert sorted(drawn) == sorted(cards)
+    assert drawn != cards
+    assert len(deck) == 0
+    with pytest.raises(IndexError):
+        deck.pop()
+
+@pytest.mark.asyncio
+async def test_games_share_deck_ids(repo):
+    """Games with the same setup share one id array instead of copying cards."""
+    cfg = GameConfig(
+        expansions=repo.available_expansions(),
+        regions={r: True for r in repo.available_regions()},
+        hand_size=3
+    )
+    a = Game([Player(id=str(i), name=f"A{i}") for i in range(3)], cfg, repo)
+    b = Game([Player(id=str(i), name=f"B{i}") for i in range(3)], cfg, repo)
+    await a.start()
+    await b.start()
+    assert a.state.white_deck._ids is b.state.white_deck._ids
+    assert len(a.state.white_deck) == len(repo.filter_ids(card_type="response", regions=cfg.regions,
+                                                          expansions=cfg.expansions)) - 9
+
+@pytest.mark.asyncio
+async def test_small_deck_recycles_discards(small):
+    """A deck barely larger than the opening deal keeps a game going by
+    reshuffling played cards back in."""
+    cfg = GameConfig(expansions=["tiny"], regions={"us": True}, hand_size=3, score_limit=100)
+    game = Game([Player(id=str(i), name=f"Bot{i}") for i in range(3)], cfg, small)
+    await game.start()
+    for _ in range(60):
+        judge_id = game.state.current_judge.id
+        for p in game.state.players:
+            if p.id != judge_id:
+                await game.submit(p.id, [0])
+        await game.judge(next(p.id for p in game.state.players if p.id != judge_id))
+        assert game.state.phase == Phase.SUBMISSIONS
+        assert all(len(p.hand) == 3 for p in game.state.players)
+    in_hands = sum(len(p.hand) for p in game.state.players)
+    assert in_hands + len(game.state.white_deck) == 10
+
+@pytest.mark.asyncio
+async def test_snapshot_restores_game(repo, players):
+    """A snapshot taken mid-round restores to the same hands, scores,
+    submissions and remaining draw piles, and play carries on from it."""
+    from cards_engine.snapshot import snapshot_game, restore_game, dumps, loads
+    cfg = GameConfig(expansions=repo.available_expansions(),
+                     regions={r: True for r in repo.available_regions()}, hand_size=4)
+    game = Game(players, cfg, repo, host_id="1", channel_id=3)
+    await game.start()
+    judge_id = game.state.current_judge.id
+    for p in game.state.players:
+        if p.id != judge_id:
+            await game.submit(p.id, list(range(game.state.current_prompt.pick)))
+    await game.judge(next(iter(game.state.submissions)))
+    submitter = next(p for p in game.state.players if p.id != game.state.current_judge.id)
+    await game.submit(submitter.id, list(range(game.state.current_prompt.pick)))
+
+    blob = dumps(snapshot_game(game))
+    assert len(blob) < 4096
+    restored = restore_game(loads(blob), repo)
+    a, b = game.state, restored.state
+    assert [(p.id, p.score, p.hand) for p in a.players] == [(p.id, p.score, p.hand) for p in b.players]
+    assert (a.phase, a.judge_index, a.current_prompt) == (b.phase, b.judge_index, b.current_prompt)
+    assert a.submissions == b.submissions and b.outstanding_submitters == a.outstanding_submitters
+    for deck_a, deck_b in ((a.white_deck, b.white_deck), (a.black_deck, b.black_deck)):
+        assert len(deck_a) == len(deck_b)
+        # the RNG position comes along, so the draw order carries on unchanged
+        assert [deck_a.draw_id() for _ in range(len(deck_a))] == \
+               [deck_b.draw_id() for _ in range(len(deck_b))]
+
+    for p in restored.state.players:
+        if p is not restored.state.current_judge and p.id not in restored.state.submissions:
+            await restored.submit(p.id, list(range(restored.state.current_prompt.pick)))
+    assert restored.state.phase == Phase.JUDGING
+
+@pytest.mark.asyncio
+async def test_snapshot_after_discard_reshuffle(small, tmp_path):
+    """Once a small deck has recycled its discards the snapshot carries the
+    new pool, and a snapshot never restores against other card data."""
+    import json
+    from cards_engine.snapshot import snapshot_game, restore_game, SnapshotError
+    cfg = GameConfig(expansions=["tiny"], regions={"us": True}, hand_size=3, score_limit=100)
+    game = Game([Player(id=str(i), name=f"Bot{i}") for i in range(3)], cfg, small)
+    await game.start()
+    for _ in range(5):
+        judge_id = game.state.current_judge.id
+        for p in game.state.players:
+            if p.id != judge_id:
+                await game.submit(p.id, [0])
+        await game.judge(next(p.id for p in game.state.players if p.id != judge_id))
+
+    data = snapshot_game(game)
+    assert "ids" in data["white_deck"]
+    restored = restore_game(data, small)
+    assert sorted(restored.state.white_deck.draw_id() for _ in range(len(restored.state.white_deck))) == \
+           sorted(game.state.white_deck.draw_id() for _ in range(len(game.state.white_deck)))
+
+    tiny = tmp_path / "tiny.json"
+    tiny.write_text(json.dumps(json.loads(tiny.read_text())[:-1]))
+    small.reload()
+    with pytest.raises(SnapshotError):
+        restore_game(data, small)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("draft_mode", [False, True])
+async def test_event_log_replays_game(repo, draft_mode, tmp_path):
+    """Replaying a game's seed and logged actions rebuilds the same state."""
+    import random
+    from cards_engine.event_log import FileEventLog, read_events
+    from cards_engine.replay import replay
+    from cards_engine.simulator import play_game, random_config, SimulationStats
+    from cards_engine.snapshot import snapshot_game
+
+    rng = random.Random(5)
+    config = None
+    while config is None:
+        config = random_config(repo, rng, draft_mode, 4)
+    path = str(tmp_path / "game.jsonl")
+    games = []
+    def attach(game):
+        game.event_log = FileEventLog(path)
+        games.append(game)
+    await play_game(repo, config, 4, rng, SimulationStats(), skip_chance=0.1, setup=attach)
+    original = games[0]
+    original.event_log.close()
+
+    events = list(read_events(path))
+    assert events[0][0] == "start" and len(events) == len(original.event_log) > 1
+    replayed = await replay(events, repo)
+    expected, actual = snapshot_game(original), snapshot_game(replayed)
+    assert expected.pop("log") == (path, len(events)) and actual.pop("log") is None
+    assert actual == expected
+
+@pytest.mark.asyncio
+async def test_restored_game_resumes_event_log(repo, players, tmp_path):
+    """A game restored from a snapshot keeps logging to its file, and the
+    replay skips what was logged after the snapshot and lost."""
+    from cards_engine.event_log import FileEventLog, read_events
+    from cards_engine.replay import replay
+    from cards_engine.snapshot import snapshot_game, restore_game
+
+    path = str(tmp_path / "game.jsonl")
+    cfg = GameConfig(expansions=repo.available_expansions(), hand_size=4)
+    game = Game(players, cfg, repo, seed=8, event_log=FileEventLog(path))
+    await game.start()
+    async def play_round(g):
+        judge = g.state.current_judge
+        for p in g.state.players:
+            if p is not judge:
+                await g.submit(p.id, list(range(g.state.current_prompt.pick)))
+        await g.judge(next(iter(g.state.submissions)))
+    await play_round(game)
+    saved = snapshot_game(game)
+    await game.skip(game.state.current_judge.id)    # lost in the "crash"
+    game.close()
+
+    restored = restore_game(saved, repo, resume_log=True)
+    # the lost skip and the restore event come after the saved position
+    assert restored.log_position() == (path, saved["log"][1] + 2)
+    await play_round(restored)
+    restored.close()
+
+    events = list(read_events(path))
+    assert events[-1 - len(players)] == ["restore", {"events": saved["log"][1]}]
+    expected, actual = snapshot_game(restored), snapshot_game(await replay(events, repo))
+    expected.pop("log"), actual.pop("log")
+    assert actual == expected
+
+@pytest.mark.asyncio
+async def test_seeded_games_are_reproducible(repo):
+    """The config seed fixes the deal, the prompts and the presentation
+    stream; simulations seeded alike play out identically."""
+    import random
+    from dataclasses import replace
+    from cards_engine.simulator import run_simulation
+
+    cfg = GameConfig(expansions=repo.available_expansions(),
+                     regions={r: True for r in repo.available_regions()}, seed=1234)
+    def deal(config):
+        return Game([Player(id=str(i), name=f"Bot{i}") for i in range(4)], config, repo)
+    a, b, c = deal(cfg), deal(cfg), deal(replace(cfg, seed=4321))
+    for game in (a, b, c):
+        await game.start()
+    assert a.seed == 1234
+    assert [p.hand for p in a.state.players] == [p.hand for p in b.state.players]
+    assert a.state.current_prompt == b.state.current_prompt
+    assert [p.hand for p in a.state.players] != [p.hand for p in c.state.players]
+    assert a.presentation_rng.random() == b.presentation_rng.random()
+
+    runs = [await run_simulation(repo, 5, random.Random(9)) for _ in range(2)]
+    assert (runs[0].rounds, runs[0].skips) == (runs[1].rounds, runs[1].skips)
+
+@pytest.mark.asyncio
+async def test_worker_pool_plays_game_like_local(repo):
+    """A game run in a worker process ends in the same state as the same
+    game run locally, with its phase changes dispatched on this side.  The
+    mirror matches the local game after every action, while replies that
+    change no phase carry only what their action changed."""
+    import random
+    from cards_engine.event_log import EventLog
+    from cards_engine.game_worker import GameWorkerPool, RemoteGame
+    from cards_engine.simulator import play_game, random_config, SimulationStats
+    from cards_engine.snapshot import snapshot_game, state_view
+
+    rng = random.Random(11)
+    config = None
+    while config is None:
+        config = random_config(repo, rng, False, 4)
+    games = []
+    def attach(game):
+        game.event_log = EventLog()
+        games.append(game)
+    await play_game(repo, config, 4, rng, SimulationStats(), skip_chance=0.1, setup=attach)
+    local = games[0]
+    start, *actions = local.event_log.events
+
+    pool = GameWorkerPool(2, repo)
+    try:
+        players = [Player(id=pid, name=name) for pid, name in start[1]["players"]]
+        remote = RemoteGame(pool, players, local.config, repo,
+                            host_id=local.host_id, channel_id=local.channel_id or 7, seed=local.seed)
+        shadow = Game([Player(id=p.id, name=p.name) for p in players], local.config, repo,
+                      host_id=local.host_id, channel_id=remote.channel_id, seed=local.seed)
+        replies = []
+        request = pool.request
+        async def recorded(*args):
+            replies.append(await request(*args))
+            return replies[-1]
+        pool.request = recorded
+
+        phases = []
+        remote.add_phase_listener(lambda g, old, new: phases.append(new))
+        await remote.start()
+        await shadow.start()
+        with pytest.raises(ValueError, match="Invalid phase"):
+            await remote.judge(players[0].id)
+        for kind, *args in actions:
+            await getattr(remote, kind)(*args)
+            await getattr(shadow, kind)(*args)
+            assert state_view(remote.state) == state_view(shadow.state)
+
+        quiet = [r for r in replies[1:] if not r["phases"]]
+        assert quiet and all("resume" not in r and "config" not in r["view"] for r in quiet)
+        assert all("draft" not in r["view"] and "score_limit" not in r["view"] for r in quiet)
+        submits = [r["view"] for r in quiet if "submissions" in r["view"] and "prompt" not in r["view"]]
+        assert submits and all(v.keys() == {"players", "submissions"} and len(v["players"]) == 1
+                               for v in submits)
+
+        assert phases[-1] is Phase.FINISHED and remote.state.phase is Phase.FINISHED
+        ours, theirs = snapshot_game(remote), snapshot_game(local)
+        ours.pop("channel_id"), theirs.pop("channel_id")
+        assert ours == theirs
+    finally:
+        pool.close()
+    assert not os.path.exists(pool._pack_dir)
+
+@pytest.mark.asyncio
+async def test_worker_pool_reports_dead_worker(repo, players):
+    """A request routed to a worker process that has died raises a
+    RuntimeError naming it instead of hanging or leaking a pipe error."""
+    from cards_engine.game_worker import GameWorkerPool, RemoteGame
+
+    cfg = GameConfig(expansions=repo.available_expansions(),
+                     regions={r: True for r in repo.available_regions()})
+    pool = GameWorkerPool(1, repo)
+    try:
+        game = RemoteGame(pool, players, cfg, repo, channel_id=3, seed=5)
+        await game.start()
+        worker = pool._workers[0].process
+        worker.kill()
+        worker.join(5)
+        with pytest.raises(RuntimeError, match="game-worker-0"):
+            await game.submit(players[1].id, [0])
+        with pytest.raises(RuntimeError, match="game-worker-0"):
+            await pool.request(4, "remove")
+    finally:
+        pool.close()
+
 # -------------------------------
 # CARD REPOSITORY EDGE TESTS
 # -------------------------------
@@ -192,6 +576,85 @@ def test_repo_filtering(repo):
         cards_region = repo.filter(regions={regions[0]: True})
         assert all(card.regions[regions[0]] for card in cards_region)
 
+def test_repo_filter_matches_linear_scan(repo):
+    """Indexed filter returns exactly what a full scan of the cards would."""
+    cards = repo.load()
+    expansions = repo.available_expansions()[:2]
+    regions = {r: i % 2 == 0 for i, r in enumerate(repo.available_regions())}
+    expected = [
+        c for c in cards
+        if c.card_type == "prompt"
+        and any(regions.get(r, False) and c.regions.get(r, False) for r in regions)
+        and c.expansion in expansions
+        and 1 <= c.pick <= 2
+    ]
+    got = repo.filter(card_type="prompt", regions=regions, expansions=expansions,
+                      min_pick=1, max_pick=2)
+    assert got == expected
+    assert [cards[i] for i in repo.filter_ids(card_type="prompt", regions=regions,
+                                              expansions=expansions, min_pick=1, max_pick=2)] == expected
+    assert repo.filter(regions={r: False for r in regions}) == []
+
+def test_shared_repository_loads_once():
+    """The process-wide repository is built once and then reused."""
+    from cards_engine.card_repository import get_shared_repository
+    first = get_shared_repository()
+    assert get_shared_repository() is first
+    assert first.load_seconds >= 0.0
+
+def test_card_pack_matches_json(repo, tmp_path):
+    """A compiled card pack loads the same cards and filters the same way."""
+    from glob import glob
+    from cards_engine.card_pack import write_pack
+    from cards_engine.card_repository import expansion_name
+    files = sorted(glob(repo._path_pattern))
+    pack = tmp_path / "cards.cardpack"
+    write_pack(str(pack), [(expansion_name(fn), CardRepository._load_file(fn)) for fn in files])
+
+    packed = CardRepository(str(pack))
+    assert packed.load() == repo.load()
+    assert all(c.card_id == i for i, c in enumerate(packed.load()))
+    assert packed.available_expansions() == repo.available_expansions()
+    regions = {r: True for r in repo.available_regions()}
+    assert packed.filter(card_type="prompt", regions=regions, min_pick=2, max_pick=3) == \
+        repo.filter(card_type="prompt", regions=regions, min_pick=2, max_pick=3)
+
+def test_parallel_load_matches_sequential(repo):
+    """Threaded loading yields the same cards in the same order, with
+    one load record per data file."""
+    sequential = CardRepository(repo._path_pattern, workers=1)
+    assert repo.load() == sequential.load()
+    assert [s.path for s in repo.load_stats] == [s.path for s in sequential.load_stats]
+    assert sum(s.cards for s in repo.load_stats) == len(repo)
+    assert all(c.card_id == i for i, c in enumerate(repo.load()))
+
+def test_streaming_json_array_small_chunks(monkeypatch):
+    """Array elements split across read chunks are still parsed."""
+    import io, json
+    from cards_engine import card_repository
+    monkeypatch.setattr(card_repository, "_CHUNK_SIZE", 7)
+    items = [{"text": f"card {i} ____", "type": "prompt", "regions": {"us": True}} for i in range(20)]
+    stream = io.StringIO(" " + json.dumps(items, indent=2))
+    assert list(card_repository._iter_json_array(stream)) == items
+
+    # whitespace filling whole chunks before the array still parses
+    monkeypatch.setattr(card_repository, "_CHUNK_SIZE", 1)
+    stream = io.StringIO("\n \n" + json.dumps(items[:3]))
+    assert list(card_repository._iter_json_array(stream)) == items[:3]
+    with pytest.raises(ValueError):
+        list(card_repository._iter_json_array(io.StringIO("\n\n")))
+
+def test_card_is_compact(repo):
+    """Cards carry no per-instance dict and share their region mappings."""
+    from cards_engine.card import Card
+    a = Card("A ____ and a ____.", "prompt", 2, {"us": True, "uk": False}, "x")
+    b = Card("Another ____.", "prompt", 1, {"us": True, "uk": False}, "x")
+    assert not hasattr(a, "__dict__")
+    assert a.regions is b.regions
+    assert a.num_blanks == 2 and a.has_blanks
+    assert a.blank_spans == ((2, 6), (13, 17))
+    assert a.region_mask == b.region_mask
+
 def test_format_prompt_blanks(repo):
     """Check that format_prompt replaces blanks and appends responses."""
     card = next((c for c in repo.load() if c.card_type == "prompt" and c.has_blanks), None)
@@ -208,6 +671,23 @@ def test_format_prompt_no_blanks(repo):
     result = card.format_prompt(["hello"])
     assert "**hello**" in result
 
+@pytest.mark.parametrize("text, responses, expected", [
+    ("What's that smell?", ["Bees!"], "What's that smell? **Bees!**"),
+    ("What's that smell?", [], "What's that smell?"),
+    ("I like ____.", ["The Pope."], "I like **the Pope**."),
+    ("____ is great.", ["The Pope."], "**The Pope** is great."),
+    ("Done. ____ next.", ["An owl!"], "Done. **an owl** next."),
+    ("Done.____ next.", ["An owl!"], "Done.**An owl** next."),
+    ("____ + ____ = ____.", ["A cat", "Wait...", "Why?!"], "**A cat** + **Wait...** = **Why?!**."),
+    ("Step 1: ____. Step 2: ____.", ["Theory"], "Step 1: **Theory**. Step 2: ____."),
+])
+def test_format_prompt_template(text, responses, expected):
+    """Compiled templates keep the punctuation and article rules."""
+    from cards_engine.card import Card
+    card = Card(text, "prompt", max(1, text.count("____")), {"us": True})
+    assert card.format_prompt(responses) == expected
+    assert card.format_prompt(responses) == expected  # cached path
+
 # ---------------------
 # OPTIONAL: FUZZ TESTS
 # ---------------------
@@ -257,5 +737,498 @@ async def test_randomized_games(repo, draft_mode):
                     await game.submit(p.id, list(range(pick_n)))
             assert game.state.phase == Phase.JUDGING
 
+@pytest.mark.asyncio
+async def test_simulator_plays_full_games(repo):
+    """The headless simulator finishes classic and draft games and records
+    latencies for every engine action it used."""
+    from cards_engine.simulator import run_simulation
+    stats = await run_simulation(repo, games=6, rng=random.Random(5), draft_ratio=0.5,
+                                 max_players=5)
+    assert stats.games == 6
+    assert stats.rounds > 0
+    assert {"start", "submit", "judge"} <= set(stats.latencies)
+    assert stats.percentiles("judge")["p50"] > 0
+    assert "games/sec" in stats.report()
+
+@pytest.mark.asyncio
+async def test_stress_harness_runs_fake_channels(registry, monkeypatch):
+    """A few channels play complete games through the real handlers and
+    views over the fake Discord transport."""
+    pytest.importorskip("discord")
+    from discord_bot import stress
+    monkeypatch.setattr(stress.game_flow, "_reveal_pace", 1.0)
+    monkeypatch.setattr(stress.outbound, "_scheduler", None)
+    from discord_bot.services import snapshot_store, game_manager
+    monkeypatch.setattr(snapshot_store, "_store", None)
+    monkeypatch.setattr(game_manager, "_event_log_dir", game_manager._event_log_dir)
+    stress.scale_sleeps(0)
+    stats = await stress.run_stress(3, random.Random(2), players=3, score_limit=2, draft_ratio=0.5)
+    assert stats.games == 3
+    assert stats.rounds >= 6
+    assert stats.api_calls > 0
+    assert {"play_pick", "judge_pick", "loop_lag"} <= set(stats.latencies)
+
+@pytest.mark.asyncio
+async def test_reveal_runs_in_background(repo, players, registry, monkeypatch):
+    """Entering judging returns before the reveal; the reveal edits one
+    message rather than sending one per submission."""
+    pytest.importorskip("discord")
+    from discord_bot.fake_discord import FakeBot
+    from discord_bot.services import game_manager
+    from discord_bot.services.game_flow import reveal_submissions
+    from discord_bot.services.reveal_scheduler import pending_reveal
+    from discord_bot.services import outbound
+    from discord_bot.services.outbound import OutboundScheduler, get_outbound
+    from discord_bot.views.judge_button_view import JudgeButtonView
+    monkeypatch.setattr(outbound, "_scheduler", OutboundScheduler(channel_rate=None, global_rate=None))
+
+    bot = FakeBot()
+    channel = bot.add_channel(42)
+    monkeypatch.setattr(game_manager, "_bot", bot)
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()})
+    game = Game(players, config, repo, channel_id=42)
+    await game.start()
+    for p in game.state.players:
+        if p is not game.state.current_judge:
+            await game.submit(p.id, list(range(game.state.current_prompt.pick)))
+    assert game.state.phase is Phase.JUDGING
+
+    await game_manager.on_phase_change(game, Phase.SUBMISSIONS, Phase.JUDGING)
+    task = pending_reveal(42)
+    assert task is not None and not task.done()
+    assert len(game.state.submissions_shuffled) == len(players) - 1
+
+    task.cancel()
+    sends = len(channel.messages)
+    await reveal_submissions(channel, game, game.state.submissions_shuffled, delay=0)
+    await get_outbound().drain()
+    assert isinstance(channel.messages[-1].view, JudgeButtonView)
+    assert len(channel.messages) - sends == 2
+    assert channel.messages[-2].content.count("**#") == len(players) - 1
+
+@pytest.mark.asyncio
+async def test_command_queue_serializes_double_judge(repo, players):
+    """Two judge clicks racing through the channel queue: the first wins,
+    the second sees the new phase instead of scoring twice."""
+    pytest.importorskip("discord")
+    import asyncio
+    from discord_bot.services.command_queue import ChannelQueue
+
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()})
+    game = Game(players, config, repo, channel_id=7)
+    started = []
+    async def slow_listener(game, old, new):
+        started.append(new)
+        await asyncio.sleep(0.01)   # a click would interleave here unqueued
+    game.add_phase_listener(slow_listener)
+    await game.start()
+    for p in game.state.players:
+        if p is not game.state.current_judge:
+            await game.submit(p.id, list(range(game.state.current_prompt.pick)))
+    winner = next(iter(game.state.submissions))
+
+    queue = ChannelQueue(7)
+    results = await asyncio.gather(queue.run(game.judge, winner), queue.run(game.judge, winner),
+                                   return_exceptions=True)
+    assert results[0] is None and isinstance(results[1], ValueError)
+    assert game.state.player_by_id(winner).score == 1
+    assert queue.metrics.completed == 1 and queue.metrics.failed == 1
+    assert queue.metrics.max_depth == 2 and queue.depth == 0
+
+@pytest.mark.asyncio
+async def test_phase_dispatch_modes(repo, players):
+    """A slow concurrent listener is cancelled at its timeout and failing
+    listeners, inline or background, never stop the phase change."""
+    import asyncio
+    import time
+    from cards_engine.phase_dispatch import ListenerMode
+
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()})
+    game = Game(players, config, repo)
+    seen = []
+    async def slow_background(game, old, new):
+        await asyncio.sleep(0.05)
+        seen.append(("background", new))
+    async def hangs(game, old, new):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            seen.append(("cancelled", new))
+            raise
+    async def broken_background(game, old, new):
+        raise RuntimeError("observer bug")
+    def broken(game, old, new):
+        raise RuntimeError("observer bug")
+    def inline(game, old, new):
+        seen.append(("inline", new))
+    game.add_phase_listener(slow_background, mode=ListenerMode.BACKGROUND)
+    game.add_phase_listener(broken_background, mode=ListenerMode.BACKGROUND)
+    game.add_phase_listener(hangs, mode=ListenerMode.CONCURRENT, timeout=0.01)
+    game.add_phase_listener(broken)
+    game.add_phase_listener(inline)
+
+    started = time.perf_counter()
+    await game.start()
+    assert time.perf_counter() - started < 1.0
+    assert game.state.phase is Phase.SUBMISSIONS
+    # the inline listener and the cancelled concurrent one, in either order
+    assert sorted(seen, key=str) == [("cancelled", Phase.SUBMISSIONS), ("inline", Phase.SUBMISSIONS)]
+    await game.skip(game.state.current_judge.id)   # no phase change, no dispatch
+    assert len(seen) == 2
+    await game.phase_events.drain()
+    assert seen[-1] == ("background", Phase.SUBMISSIONS)
+
+    stats = game.listener_stats()
+    assert stats[hangs.__qualname__].timeouts == 1
+    assert stats[broken.__qualname__].errors == 1
+    assert stats[broken_background.__qualname__].errors == 1
+    assert all(s.calls == 1 and sum(s.histogram) == 1 for s in stats.values())
+
+@pytest.mark.asyncio
+async def test_outbound_coalesces_and_prioritizes():
+    """Queued posts to one channel merge, interactive posts jump ahead of
+    them, repeated edits collapse into the latest, and a channel's lane is
+    dropped once it has been idle long enough to refill."""
+    pytest.importorskip("discord")
+    from discord_bot.fake_discord import FakeBot
+    from discord_bot.services.outbound import OutboundScheduler, Priority
+
+    channel = FakeBot().add_channel(5)
+    sched = OutboundScheduler(channel_rate=1000.0, channel_burst=1, global_rate=None)
+    sched.send(channel, "🏆 winner")
+    sched.send(channel, "next round", view="play")   # merged into the one above
+    urgent = sched.send(channel, "skipped!", priority=Priority.INTERACTIVE)
+    await sched.drain()
+
+    assert [m.content for m in channel.messages] == ["skipped!", "🏆 winner\nnext round"]
+    assert channel.messages[-1].view == "play"
+    assert (await urgent) is channel.messages[0]
+    assert sched.metrics.sent == 2 and sched.metrics.coalesced == 1
+
+    first = channel.messages[0]
+    for text in ("a", "ab", "abc"):
+        sched.edit(first, text)
+    await sched.drain()
+    assert first.content == "abc" and sched.metrics.edited <= 2
+
+    # an emptied lane is kept until its bucket refills, then dropped
+    import asyncio
+    paced = OutboundScheduler(channel_rate=50.0, channel_burst=1, global_rate=None)
+    paced.send(channel, "refills in 20ms")
+    await paced.drain()
+    assert len(paced) == 1
+    await asyncio.sleep(0.03)
+    paced.send(FakeBot().add_channel(6), "hello")
+    await paced.drain()
+    assert len(paced) == 1 and paced.pending(5) == 0
+    unlimited = OutboundScheduler(channel_rate=None, global_rate=None)
+    unlimited.send(channel, "gone right away")
+    await unlimited.drain()
+    assert len(unlimited) == 0
+
+@pytest.mark.asyncio
+async def test_restore_games_reposts_round(repo, players, registry, monkeypatch):
+    """Saved games come back after a restart with a fresh play button."""
+    pytest.importorskip("discord")
+    from discord_bot.fake_discord import FakeBot
+    from discord_bot.services import game_manager, outbound, snapshot_store
+    from discord_bot.services.outbound import OutboundScheduler, get_outbound
+    from discord_bot.services.snapshot_store import SnapshotStore, persist_game
+    from discord_bot.services.state_manager import get_game, remove_game
+    from discord_bot.views.play_button_view import PlayButtonView
+    monkeypatch.setattr(outbound, "_scheduler", OutboundScheduler(channel_rate=None, global_rate=None))
+    monkeypatch.setattr(snapshot_store, "_store", SnapshotStore(":memory:"))
+
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()})
+    game = Game(players, config, repo, host_id="1", channel_id=77)
+    game.add_phase_listener(persist_game)
+    await game.start()
+
+    bot = FakeBot()
+    channel = bot.add_channel(77)
+    monkeypatch.setattr(game_manager, "_bot", bot)
+    assert await game_manager.restore_games() == 1
+    await get_outbound().drain()
+    restored = get_game(77)
+    assert restored is not game and restored.state.current_prompt == game.state.current_prompt
+    assert isinstance(channel.messages[-1].view, PlayButtonView)
+    assert await game_manager.restore_games() == 0   # already running
+
+    remove_game(77)
+    assert snapshot_store.get_store().load_all() == []
+
+@pytest.mark.asyncio
+async def test_skip_is_saved(repo, players, registry, monkeypatch):
+    """A skip keeps the phase, so no listener fires; the new prompt is
+    still saved, and a restart does not bring the skipped one back."""
+    pytest.importorskip("discord")
+    from discord_bot.fake_discord import FakeChannel, FakeInteraction, FakeUser
+    from discord_bot.services import outbound, snapshot_store
+    from discord_bot.services.game_flow import handle_skip
+    from discord_bot.services.outbound import OutboundScheduler, get_outbound
+    from discord_bot.services.snapshot_store import SnapshotStore, persist_game
+    from cards_engine.snapshot import loads
+    monkeypatch.setattr(outbound, "_scheduler", OutboundScheduler(channel_rate=None, global_rate=None))
+    monkeypatch.setattr(snapshot_store, "_store", SnapshotStore(":memory:"))
+
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()})
+    game = Game(players, config, repo, host_id="1", channel_id=78)
+    game.add_phase_listener(persist_game)
+    await game.start()
+    skipped = game.state.current_prompt
+    judge = game.state.current_judge
+    await handle_skip(FakeInteraction(FakeUser(int(judge.id), judge.name), FakeChannel(78)), game)
+    await get_outbound().drain()
+
+    assert game.state.phase is Phase.SUBMISSIONS and game.state.current_prompt != skipped
+    (channel_id, blob), = snapshot_store.get_store().load_all()
+    saved = loads(blob)
+    assert channel_id == 78 and saved["round"] == game.state.round_number == 2
+    assert saved["prompt"] == game.state.current_prompt.card_id
+
+@pytest.mark.asyncio
+async def test_components_route_by_custom_id(repo, players, registry, monkeypatch):
+    """Game components are plain custom_ids: a select from a finished round
+    is refused, and one posted before a restart still works after it."""
+    pytest.importorskip("discord")
+    from discord_bot.fake_discord import FakeChannel, FakeInteraction, FakeUser
+    from discord_bot.services import outbound
+    from discord_bot.services.component_router import dispatch_component
+    from discord_bot.services.outbound import OutboundScheduler
+    from discord_bot.services.state_manager import set_game, get_game, remove_game
+    from discord_bot.views.components import parse_custom_id, custom_id, PICK
+    from discord_bot.views.judge_view import JudgeView
+    from discord_bot.views.play_view import PlayView
+    from cards_engine.snapshot import snapshot_game, restore_game
+    monkeypatch.setattr(outbound, "_scheduler", OutboundScheduler(channel_rate=None, global_rate=None))
+
+    assert parse_custom_id(custom_id(PICK, 601, 3, "0.2")) == parse_custom_id("cab:pick:601:3:0.2")
+    assert parse_custom_id("join_game") is None and parse_custom_id("cab:pick:x:1") is None
+
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()})
+    game = Game(players, config, repo, channel_id=601)
+    await game.start()
+    set_game(601, game)
+    channel = FakeChannel(601)
+    users = {p.id: FakeUser(int(p.id), p.name) for p in players}
+    def select_of(view):
+        return view.children[0]
+    async def pick(user, view, value):
+        inter = FakeInteraction(user, channel, {"custom_id": select_of(view).custom_id, "values": [value]})
+        assert await dispatch_component(inter)
+        return inter
+
+    judge = game.state.current_judge
+    player = next(p for p in game.state.players if p is not judge)
+    stale = PlayView(game, player)
+    await game.skip(judge.id)
+    inter = await pick(users[player.id], stale, "0")
+    assert "already over" in inter.replies[-1].content
+
+    for p in list(game.state.players):
+        if p is not game.state.current_judge:
+            view = PlayView(game, p)
+            while True:
+                inter = await pick(users[p.id], view, select_of(view).options[0].value)
+                if not isinstance(inter.last_view, PlayView):
+                    break
+                view = inter.last_view
+    assert game.state.phase is Phase.JUDGING
+    game.state.submissions_shuffled = list(game.state.submissions.items())
+    verdict = JudgeView(game)
+
+    restored = restore_game(snapshot_game(game), repo)   # a restart
+    set_game(601, restored)
+    winner_id = restored.state.submissions_shuffled[1][0]
+    await pick(users[restored.state.current_judge.id], verdict, "1")
+    assert get_game(601) is restored and restored.state.last_round_selected_id == winner_id
+    remove_game(601)
+
+@pytest.mark.asyncio
+async def test_hand_options_are_cached(repo, players):
+    """Each blank of a prompt reuses the hand's options, and a draft pack
+    passed to the next seat reuses the options rendered for the last one."""
+    pytest.importorskip("discord")
+    from discord_bot.views.hand_options import HandOptionCache
+
+    config = GameConfig(expansions=repo.available_expansions(),
+                        regions={r: True for r in repo.available_regions()}, draft_mode=True)
+    game = Game(players, config, repo, channel_id=701)
+    await game.start()
+    cache = HandOptionCache()
+    a, b = game.state.players[:2]
+
+    pack = game.state.draft_queues[a.id]
+    first = cache.draft(701, pack)
+    assert [o.value for o in first] == [str(c.card_id) for c in pack]
+    await game.draft_pick(a.id, 0)
+    for p in game.state.players[1:]:
+        await game.draft_pick(p.id, 0)
+    passed = game.state.draft_queues[b.id]        # a's pack, one card lighter
+    assert [id(o) for o in cache.draft(701, passed)] == [id(o) for o in first[1:]]
+
+    hand = [c for q in game.state.draft_queues.values() for c in q][:5]
+    full = cache.hand(701, b.id, hand)
+    misses = cache.misses
+    later = cache.hand(701, b.id, list(hand), exclude=[0, 3])
+    assert cache.misses == misses and [o.value for o in later] == ["1", "2", "4"]
+    assert later[0] is full[1] and len(full) == 5
+    cache.forget_channel(701)
+    assert len(cache) == 0
+
+def test_shard_health_counts_games_per_shard(registry):
+    """Games and lobbies are grouped under the shard serving their guild."""
+    import math
+    from types import SimpleNamespace
+    from discord_bot.services.shards import shard_for_guild, shard_health, owns_all_shards, format_health
+    from discord_bot.services.state_manager import set_game, set_lobby, remove_game, remove_lobby, get_shard
+
+    guild_id = (12345 << 22) | 99
+    assert shard_for_guild(guild_id, 4) == 12345 % 4
+    assert shard_for_guild(None, 4) == shard_for_guild(guild_id, 1) == 0
+
+    def link(latency, closed=False):
+        return SimpleNamespace(latency=latency, is_closed=lambda: closed)
+    bot = SimpleNamespace(
+        shards={0: link(0.042), 1: link(float("inf"), closed=True)},
+        guilds=[SimpleNamespace(shard_id=0), SimpleNamespace(shard_id=1), SimpleNamespace(shard_id=1)],
+        shard_ids=[0, 1], shard_count=4)
+    set_game(901, SimpleNamespace(close=lambda: None), shard_id=1)
+    set_lobby(902, object(), shard_id=1)
+    set_lobby(903, object(), shard_id=0)
+    try:
+        report = shard_health(bot)
+        assert [(s.shard_id, s.connected, s.guilds, s.games, s.lobbies) for s in report] == \
+               [(0, True, 1, 0, 1), (1, False, 2, 1, 1)]
+        assert round(report[0].latency_ms) == 42 and math.isnan(report[1].latency_ms)
+        assert "Shard 1: —" in format_health(report)
+        assert not owns_all_shards(bot)
+    finally:
+        remove_game(901)
+        remove_lobby(902)
+        remove_lobby(903)
+    assert get_shard(901) == 0 and shard_health(bot)[1].lobbies == 0
+
+@pytest.mark.asyncio
+async def test_idle_sweeper_evicts_and_stops_views(repo, players, registry, monkeypatch):
+    """Idle lobbies and games are closed, their views stopped, and the
+    registry refuses new lobbies once it is full."""
+    import time
+    from discord_bot.services import game_manager, state_manager
+    from discord_bot.services.state_manager import (
+        attach_view, set_game, set_lobby, get_game, get_lobby, registry_metrics, RegistryFullError)
+
+    class View:
+        stopped = False
+        def stop(self):
+            self.stopped = True
+
+    game = Game(players, GameConfig(expansions=repo.available_expansions()), repo, channel_id=501)
+    set_game(501, game)
+    set_lobby(502, object())
+    views = [attach_view(501, View()), attach_view(502, View())]
+    before = registry_metrics()
+
+    now = time.monotonic()
+    assert await game_manager.sweep_idle(game_ttl=60, lobby_ttl=60, now=now + 30) == (0, 0)
+    assert await game_manager.sweep_idle(game_ttl=3600, lobby_ttl=60, now=now + 120) == (0, 1)
+    assert get_lobby(502) is None and views[1].stopped and not views[0].stopped
+    get_game(501)   # activity resets the clock
+    assert await game_manager.sweep_idle(game_ttl=60, lobby_ttl=60, now=time.monotonic() + 120) == (1, 0)
+    assert get_game(501) is None and views[0].stopped
+
+    after = registry_metrics()
+    assert after["views"] == before["views"] - 2 and after["evicted_games"] == before["evicted_games"] + 1
+    monkeypatch.setattr(state_manager, "MAX_ACTIVE_CHANNELS", after["games"] + after["lobbies"])
+    with pytest.raises(RegistryFullError):
+        set_lobby(503, object())
+
+@pytest.mark.asyncio
+async def test_players_leave_mid_round(repo):
+    """Leaving keeps the round playable, voids it when the judge goes, ends
+    the game with one player left, and replays from the event log."""
+    from cards_engine.event_log import EventLog
+    from cards_engine.replay import replay
+    from cards_engine.snapshot import snapshot_game
+    log = EventLog()
+    seats = [Player(id=str(i), name=f"Bot{i}") for i in range(1, 6)]
+    game = Game(seats, GameConfig(expansions=repo.available_expansions(), hand_size=5),
+                repo, seed=11, event_log=log)
+    await game.start()
+    state = game.state
+
+    judge = state.current_judge
+    others = [p for p in state.players if p is not judge]
+    for p in others[:-1]:
+        await game.submit(p.id, list(range(state.current_prompt.pick)))
+    await game.leave(others[-1].id)          # the one still owing cards
+    assert state.phase is Phase.JUDGING and len(state.submissions) == len(others) - 1
+
+    round_before = state.round_number
+    await game.leave(judge.id)
+    assert state.phase is Phase.SUBMISSIONS and state.round_number == round_before + 1
+    assert not state.submissions and all(len(p.hand) == 5 for p in state.players)
+
+    await game.leave(state.players[0].id)
+    await game.leave(state.players[0].id)
+    assert state.phase is Phase.FINISHED and state.last_round_selected_id is None
+
+    replayed = await replay(log.events, repo)
+    assert snapshot_game(replayed) == snapshot_game(game)
+
+@pytest.mark.asyncio
+async def test_tournament_standings_and_rebalancing(repo):
+    """Standings kept incrementally match a full re-sort, and drops close
+    short tables and shrink the next round's seating."""
+    import random
+    from cards_engine.tournament import Tournament
+    rng = random.Random(5)
+    entrants = [Player(id=str(i), name=f"Bot{i}") for i in range(40)]
+    cfg = GameConfig(expansions=repo.available_expansions(), hand_size=5, score_limit=2)
+    t = Tournament(entrants, cfg, channel_ids=range(100, 108), repository=repo,
+                   rounds=3, max_table=6, seed=3)
+
+    async def run_table(table):
+        state = table.game.state
+        while state.phase is Phase.SUBMISSIONS:
+            judge = state.current_judge
+            for p in list(state.players):
+                if p is not judge and state.phase is Phase.SUBMISSIONS:
+                    await table.game.submit(p.id, rng.sample(range(len(p.hand)), state.current_prompt.pick))
+            await table.game.judge(rng.choice(list(state.submissions)))
+
+    sizes = []
+    while not t.finished:
+        tables = await t.start_round()
+        sizes.append(sorted(len(tb.seats) for tb in tables))
+        if t.round == 2:
+            # leave one table with two players: it is closed and scored as is
+            short = tables[0]
+            for pid in short.seats[:len(short.seats) - 2]:
+                assert await t.drop(pid) is short
+            assert short.done and short.game.state.phase is Phase.FINISHED
+        for table in tables:
+            if not table.done:
+                await run_table(table)
+        await t.wait_round()
+
+    # 40 players fit 7 tables of at most 6; 4 drops leave 36 for 6 tables
+    assert sizes[0] == sizes[1] == [5, 5, 6, 6, 6, 6, 6]
+    assert sizes[2] == [6] * 6
+    assert all(e.tables == 3 for e in t.entrants.values() if not e.dropped)
+    expected = sorted(t.entrants.values(), key=lambda e: (-e.points, -e.rounds_won, e.id))
+    assert [e for _, e in t.standings.top()] == expected
+    for rank, e in t.standings.top():
+        ahead = sum((o.points, o.rounds_won) > (e.points, e.rounds_won) for o in expected)
+        assert rank == ahead + 1 == t.standings.rank(e)
+    with pytest.raises(RuntimeError):
+        await t.start_round()
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file